@@ -13,6 +13,13 @@ Review Board Installer. They're largely used for packaging purposes.
 VERSION = (1, 2, 1, 0, 'final', 0, True)
 
 
+#: Whether this is a released version of the installer.
+#:
+#: Version Added:
+#:     1.3
+_IS_RELEASE: bool = VERSION[-1]
+
+
 def get_version_string() -> str:
     """Return the version as a human-readable string.
 
@@ -20,7 +27,47 @@ def get_version_string() -> str:
         str:
         The installer version.
     """
-    major, minor, micro, patch, tag, relnum, is_release = VERSION
+    return _VERSION_STRING
+
+
+def get_package_version() -> str:
+    """Return the version as a Python package version string.
+
+    Returns:
+        str:
+        The version number as used in a Python package.
+    """
+    return __version__
+
+
+def is_release() -> bool:
+    """Return whether this is a released version.
+
+    Returns:
+        bool:
+        ``True`` if this is a released version of the package.
+        ``False`` if it is a development version.
+    """
+    return _IS_RELEASE
+
+
+def _format_version_string(
+    version_info: tuple,
+) -> str:
+    """Return a human-readable version string for version information.
+
+    Version Added:
+        1.3
+
+    Args:
+        version_info (tuple):
+            The version information, in the format of :py:data:`VERSION`.
+
+    Returns:
+        str:
+        The human-readable version string.
+    """
+    major, minor, micro, patch, tag, relnum, is_release = version_info
 
     version = f'{major}.{minor}'
 
@@ -42,14 +89,24 @@ def get_version_string() -> str:
     return version
 
 
-def get_package_version() -> str:
-    """Return the version as a Python package version string.
+def _format_package_version(
+    version_info: tuple,
+) -> str:
+    """Return a Python package version string for version information.
+
+    Version Added:
+        1.3
+
+    Args:
+        version_info (tuple):
+            The version information, in the format of
+            :py:data:`__version_info__`.
 
     Returns:
         str:
         The version number as used in a Python package.
     """
-    major, minor, micro, patch, tag, relnum = __version_info__
+    major, minor, micro, patch, tag, relnum = version_info
 
     version = f'{major}.{minor}'
 
@@ -69,16 +126,11 @@ def get_package_version() -> str:
     return version
 
 
-def is_release() -> bool:
-    """Return whether this is a released version.
-
-    Returns:
-        bool:
-        ``True`` if this is a released version of the package.
-        ``False`` if it is a development version.
-    """
-    return VERSION[-1]
-
-
 __version_info__ = VERSION[:-1]
-__version__ = get_package_version()
+__version__ = _format_package_version(__version_info__)
+
+#: The human-readable version string.
+#:
+#: Version Added:
+#:     1.3
+_VERSION_STRING: str = _format_version_string(VERSION)
@@ -8,12 +8,20 @@ Version Added:
 from __future__ import annotations
 
 import operator
-from typing import Dict, List, Set
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import (AbstractSet, Any, Callable, Dict, FrozenSet, List,
+                    Mapping, NamedTuple, Optional, Sequence, Set,
+                    TYPE_CHECKING, Tuple)
 
 from typing_extensions import NotRequired, TypeAlias, TypedDict
 
 from rbinstall.install_methods import InstallMethodType
-from rbinstall.versioning import VersionMatchFunc, match_version
+from rbinstall.versioning import match_version
+
+if TYPE_CHECKING:
+    from rbinstall.versioning import VersionMatchFunc
 
 
 class _PackageCandidateMatch(TypedDict):
@@ -24,25 +32,25 @@ class _PackageCandidateMatch(TypedDict):
     """
 
     #: Any architectures that must be matched.
-    archs: NotRequired[Set[str]]
+    archs: NotRequired[AbstractSet[str]]
 
     #: Any Linux distribution families that must be matched.
-    distro_families: NotRequired[Set[str]]
+    distro_families: NotRequired[AbstractSet[str]]
 
     #: Any Linux distribution IDs that must be matched.
-    distro_ids: NotRequired[Set[str]]
+    distro_ids: NotRequired[AbstractSet[str]]
 
     #: A callable for determining if a Linux distribution version matches.
     distro_version: NotRequired[VersionMatchFunc]
 
     #: A set of flags that must be set from previous matched packages.
-    has_flags: NotRequired[Dict[str, bool]]
+    has_flags: NotRequired[Mapping[str, bool]]
 
     #: A callable for determining if a Review Board version matches.
     rb_version: NotRequired[VersionMatchFunc]
 
     #: Any operating systems that must be matched.
-    systems: NotRequired[Set[str]]
+    systems: NotRequired[AbstractSet[str]]
 
 
 class _PackageCandidate(TypedDict):
@@ -73,7 +81,7 @@ class _PackageCandidate(TypedDict):
     packages: NotRequired[List[str]]
 
     #: Flags to set for future package matches.
-    set_flags: NotRequired[Dict[str, bool]]
+    set_flags: NotRequired[Mapping[str, bool]]
 
     #: A list of packages to skip from prior matched candidates.
     #:
@@ -88,9 +96,143 @@ _PackageTypeDict: TypeAlias = List[_PackageCandidate]
 _PackageBundleDict: TypeAlias = Dict[str, _PackageTypeDict]
 _Packages: TypeAlias = Dict[str, _PackageBundleDict]
 
+class _PackageCandidateRecord(NamedTuple):
+    """A flattened, precomputed record of a package candidate.
+
+    This contains everything needed to match and apply a candidate, without
+    looking up keys in the candidate's dictionaries.
+
+    Match conditions that aren't restricted are ``None``, rather than
+    defaulting to values for the target system, so that nothing needs to be
+    built per candidate when matching.
+
+    Version Added:
+        1.3
+    """
+
+    #: Whether this installation step is allowed to fail.
+    allow_fail: bool
+
+    #: Any architectures that must be matched, or ``None``.
+    archs: Optional[AbstractSet[str]]
+
+    #: A list of external commands that would be run.
+    commands: List[List[str]]
+
+    #: Any Linux distribution families that must be matched, or ``None``.
+    distro_families: Optional[AbstractSet[str]]
+
+    #: Any Linux distribution IDs that must be matched, or ``None``.
+    distro_ids: Optional[AbstractSet[str]]
+
+    #: A callable for determining if a distribution version matches.
+    distro_version: Optional[VersionMatchFunc]
+
+    #: A bitmask of the flags checked for a match.
+    #:
+    #: The candidate matches if the current flags, masked by this value,
+    #: equal :py:attr:`has_flags_value`. This checks all required set and
+    #: unset flags at once.
+    has_flags_mask: int
+
+    #: A bitmask of the values the checked flags must have.
+    has_flags_value: int
+
+    #: The installation method used for installing the packages.
+    install_method: InstallMethodType
+
+    #: A list of packages that would be installed.
+    packages: List[str]
+
+    #: A callable for determining if a Review Board version matches.
+    rb_version: Optional[VersionMatchFunc]
+
+    #: A bitmask of the flags set for future matches.
+    set_flags_mask: int
+
+    #: A bitmask of the values to set for the flags.
+    set_flags_value: int
+
+    #: A list of packages to skip from prior matched candidates.
+    skip_packages: List[str]
+
+
+_PackageIndex: TypeAlias = Dict[
+    Tuple[str, str, Optional[str], Optional[str]],
+    Tuple[_PackageCandidateRecord, ...]
+]
+
+
+def _make_rhel_bootstrap_candidate(
+    *,
+    arch: str,
+    version: int,
+    op: Callable[[Any, Any], bool],
+) -> _PackageCandidate:
+    """Return a candidate for bootstrapping packages on RHEL.
+
+    This will enable the CodeReady Builder repository and install EPEL for
+    the given architecture and major version of RHEL.
+
+    Version Added:
+        1.3
+
+    Args:
+        arch (str):
+            The architecture to match.
+
+        version (int):
+            The major version of RHEL.
+
+        op (callable):
+            The operator used to match the distro version against
+            ``version``.
+
+    Returns:
+        _PackageCandidate:
+        The resulting package candidate.
+    """
+    return {
+        'match': {
+            'archs': {arch},
+            'systems': {'Linux'},
+            'distro_ids': {'rhel'},
+            'distro_version': match_version(version, op=op),
+        },
+        'commands': [
+            [
+                'subscription-manager', 'repos', '--enable',
+                f'codeready-builder-for-rhel-{version}-{arch}-rpms',
+            ],
+            [
+                'dnf', 'install', '-y',
+                (f'https://dl.fedoraproject.org/pub/epel/'
+                 f'epel-release-latest-{version}.noarch.rpm'),
+            ],
+        ],
+    }
+
+
+#: Flags indicating that xmlsec is available.
+#:
+#: This is shared by all candidates that set or check for the flag, and is
+#: read-only so that it can't be modified for any one candidate.
+#:
+#: Version Added:
+#:     1.3
+_HAS_XMLSEC_FLAGS: Mapping[str, bool] = MappingProxyType({
+    'has_xmlsec': True,
+})
+
 
 #: All packages available for installation across all supported systems.
 #:
+#: pip arguments may include options. Options that take a value should be
+#: given as a single ``--option=value`` argument. An argument directly
+#: following an option without ``=`` is treated as that option's value,
+#: and is always passed to pip rather than being skipped as an already
+#: installed requirement.
+#:
 #: Version Added:
 #:     1.0
 PACKAGES: _Packages = {
@@ -154,89 +296,15 @@ PACKAGES: _Packages = {
                 ],
             },
 
-            # Red Hat Enterprise Linux 8 (x86)
-            {
-                'match': {
-                    'archs': {'x86_64'},
-                    'systems': {'Linux'},
-                    'distro_ids': {'rhel'},
-                    'distro_version': match_version(8),
-                },
-                'commands': [
-                    [
-                        'subscription-manager', 'repos', '--enable',
-                        'codeready-builder-for-rhel-8-x86_64-rpms',
-                    ],
-                    [
-                        'dnf', 'install', '-y',
-                        ('https://dl.fedoraproject.org/pub/epel/'
-                         'epel-release-latest-8.noarch.rpm'),
-                    ],
-                ],
-            },
-
-            # Red Hat Enterprise Linux 8 (ARM)
-            {
-                'match': {
-                    'archs': {'aarch64'},
-                    'systems': {'Linux'},
-                    'distro_ids': {'rhel'},
-                    'distro_version': match_version(8),
-                },
-                'commands': [
-                    [
-                        'subscription-manager', 'repos', '--enable',
-                        'codeready-builder-for-rhel-8-aarch64-rpms',
-                    ],
-                    [
-                        'dnf', 'install', '-y',
-                        ('https://dl.fedoraproject.org/pub/epel/'
-                         'epel-release-latest-8.noarch.rpm'),
-                    ],
-                ],
-            },
-
-            # Red Hat Enterprise Linux 9 (x86)
-            {
-                'match': {
-                    'archs': {'x86_64'},
-                    'systems': {'Linux'},
-                    'distro_ids': {'rhel'},
-                    'distro_version': match_version(9, op=operator.ge),
-                },
-                'commands': [
-                    [
-                        'subscription-manager', 'repos', '--enable',
-                        'codeready-builder-for-rhel-9-x86_64-rpms',
-                    ],
-                    [
-                        'dnf', 'install', '-y',
-                        ('https://dl.fedoraproject.org/pub/epel/'
-                         'epel-release-latest-9.noarch.rpm'),
-                    ],
-                ],
-            },
-
-            # Red Hat Enterprise Linux 9 (ARM)
-            {
-                'match': {
-                    'archs': {'aarch64'},
-                    'systems': {'Linux'},
-                    'distro_ids': {'rhel'},
-                    'distro_version': match_version(9, op=operator.ge),
-                },
-                'commands': [
-                    [
-                        'subscription-manager', 'repos', '--enable',
-                        'codeready-builder-for-rhel-9-aarch64-rpms',
-                    ],
-                    [
-                        'dnf', 'install', '-y',
-                        ('https://dl.fedoraproject.org/pub/epel/'
-                         'epel-release-latest-9.noarch.rpm'),
-                    ],
-                ],
-            },
+            # Red Hat Enterprise Linux 8 and 9+ (x86 and ARM)
+            *(
+                _make_rhel_bootstrap_candidate(arch=arch,
+                                               version=version,
+                                               op=op)
+                for version, op in ((8, operator.eq),
+                                    (9, operator.ge))
+                for arch in ('x86_64', 'aarch64')
+            ),
 
             # Rocky Linux 8
             {
@@ -295,9 +363,7 @@ PACKAGES: _Packages = {
                     'perl',
                     'xmlsec',
                 ],
-                'set_flags': {
-                    'has_xmlsec': True,
-                },
+                'set_flags': _HAS_XMLSEC_FLAGS,
             },
 
             # Amazon Linux/CentOS/Fedora/RHEL/Rocky Linux
@@ -334,7 +400,7 @@ PACKAGES: _Packages = {
             # CentOS 9+
             {
                 'match': {
-                    'systems': {'linux'},
+                    'systems': {'Linux'},
                     'distro_ids': {'centos'},
                     'distro_version': match_version(9, op=operator.ge),
                 },
@@ -342,30 +408,26 @@ PACKAGES: _Packages = {
                     'xmlsec1-devel',
                     'xmlsec1-openssl-devel',
                 ],
-                'set_flags': {
-                    'has_xmlsec': True,
-                },
+                'set_flags': _HAS_XMLSEC_FLAGS,
             },
 
             # Fedora
             {
                 'match': {
-                    'systems': {'linux'},
+                    'systems': {'Linux'},
                     'distro_ids': {'fedora'},
                 },
                 'packages': [
                     'xmlsec1-devel',
                     'xmlsec1-openssl-devel',
                 ],
-                'set_flags': {
-                    'has_xmlsec': True,
-                },
+                'set_flags': _HAS_XMLSEC_FLAGS,
             },
 
             # Red Hat Enterprise Linux 9+
             {
                 'match': {
-                    'systems': {'linux'},
+                    'systems': {'Linux'},
                     'distro_ids': {'rhel'},
                     'distro_version': match_version(9, op=operator.ge),
                 },
@@ -373,15 +435,13 @@ PACKAGES: _Packages = {
                     'xmlsec1-devel',
                     'xmlsec1-openssl-devel',
                 ],
-                'set_flags': {
-                    'has_xmlsec': True,
-                },
+                'set_flags': _HAS_XMLSEC_FLAGS,
             },
 
             # Rocky Linux 9+
             {
                 'match': {
-                    'systems': {'linux'},
+                    'systems': {'Linux'},
                     'distro_ids': {'rocky'},
                     'distro_version': match_version(9, op=operator.ge),
                 },
@@ -389,9 +449,7 @@ PACKAGES: _Packages = {
                     'xmlsec1-devel',
                     'xmlsec1-openssl-devel',
                 ],
-                'set_flags': {
-                    'has_xmlsec': True,
-                },
+                'set_flags': _HAS_XMLSEC_FLAGS,
             },
 
             # Debian/Ubuntu
@@ -418,9 +476,7 @@ PACKAGES: _Packages = {
                     'python3-dev',
                     'python3-pip',
                 ],
-                'set_flags': {
-                    'has_xmlsec': True,
-                },
+                'set_flags': _HAS_XMLSEC_FLAGS,
             },
 
             # openSUSE
@@ -442,9 +498,7 @@ PACKAGES: _Packages = {
                     'xmlsec1-devel',
                     'xmlsec1-openssl-devel',
                 ],
-                'set_flags': {
-                    'has_xmlsec': True,
-                },
+                'set_flags': _HAS_XMLSEC_FLAGS,
             },
         ],
 
@@ -459,8 +513,10 @@ PACKAGES: _Packages = {
                     # This is required for building against local
                     # xmlsec/libxml2, which avoids crashes and other
                     # errors at runtime.
-                    '--no-binary',
-                    'lxml',
+                    #
+                    # The option is passed as a single argument, since
+                    # packages are de-duplicated when building steps.
+                    '--no-binary=lxml',
                     'lxml',
                 ],
             },
@@ -719,9 +775,7 @@ PACKAGES: _Packages = {
         'service-integrations': [
             {
                 'match': {
-                    'has_flags': {
-                        'has_xmlsec': True,
-                    },
+                    'has_flags': _HAS_XMLSEC_FLAGS,
                     'rb_version': match_version(6, 0, op=operator.ge),
                 },
                 'install_method': InstallMethodType.REVIEWBOARD_EXTRA,
@@ -827,3 +881,242 @@ PACKAGES: _Packages = {
         ],
     },
 }
+
+
+#: The match keys containing sets of values to compare against.
+#:
+#: Version Added:
+#:     1.3
+_MATCH_SET_KEYS: Tuple[str, ...] = (
+    'archs',
+    'distro_families',
+    'distro_ids',
+    'systems',
+)
+
+
+def _build_package_index(
+    packages: _Packages,
+) -> _PackageIndex:
+    """Normalize package candidates and build an index for lookups.
+
+    This interns all package names and command line arguments, converts
+    all match sets to lowercase :py:class:`frozenset` (so that matching is
+    case-insensitive), shares identical match sets between candidates, and
+    then groups candidates by category, package type, (lowercase) system,
+    and (lowercase) distribution ID.
+
+    The normalized values are stored in the index. The provided packages
+    are left unchanged.
+
+    Candidates without a system restriction are placed in every system's
+    group, along with a fallback group (keyed by a system of ``None``) for
+    unknown systems.
+
+    Within each system, candidates are grouped by each distribution ID they
+    match. Candidates without a distribution ID restriction are placed in
+    every distribution ID's group, along with a fallback group (keyed by a
+    distribution ID of ``None``) for unknown distributions. A group keyed
+    by an empty distribution ID contains every candidate for the system,
+    for when the distribution isn't known at all.
+
+    Each candidate is stored as a :py:class:`_PackageCandidateRecord`, so
+    that matching doesn't need to look up conditions and defaults for every
+    candidate. Flags are assigned a bit each, and converted to bitmasks.
+    Candidates retain their original order within each group.
+
+    Version Added:
+        1.3
+
+    Args:
+        packages (dict):
+            The packages to index.
+
+    Returns:
+        dict:
+        The resulting index.
+    """
+    index: Dict[Tuple[str, str, Optional[str], Optional[str]],
+                List[_PackageCandidateRecord]] = {}
+    all_distro_ids: Set[str] = set()
+    all_systems: Set[str] = set()
+    flag_bits: Dict[str, int] = {}
+    match_sets: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+    # Match sets are normalized for every candidate before any records are
+    # built, since every system, distribution ID, and flag must be known
+    # first.
+    normalized_candidates: List[Tuple[str, str, _PackageCandidate,
+                                      Dict[str, FrozenSet[str]]]] = []
+
+    for category, bundle in packages.items():
+        for package_type, candidates in bundle.items():
+            for candidate in candidates:
+                match_info = candidate.get('match', {})
+                candidate_match_sets: Dict[str, FrozenSet[str]] = {}
+
+                for key in _MATCH_SET_KEYS:
+                    if key in match_info:
+                        match_set = frozenset(
+                            value.lower()
+                            for value in match_info[key]  # type: ignore
+                        )
+                        candidate_match_sets[key] = \
+                            match_sets.setdefault(match_set, match_set)
+
+                all_distro_ids.update(
+                    candidate_match_sets.get('distro_ids', ()))
+                all_systems.update(candidate_match_sets.get('systems', ()))
+
+                for flag_name in match_info.get('has_flags', {}):
+                    flag_bits.setdefault(flag_name, 1 << len(flag_bits))
+
+                for flag_name in candidate.get('set_flags', {}):
+                    flag_bits.setdefault(flag_name, 1 << len(flag_bits))
+
+                normalized_candidates.append(
+                    (category, package_type, candidate,
+                     candidate_match_sets))
+
+    def _get_flag_masks(
+        flags: Mapping[str, bool],
+    ) -> Tuple[int, int]:
+        mask = 0
+        value = 0
+
+        for flag_name, flag_value in flags.items():
+            bit = flag_bits[flag_name]
+            mask |= bit
+
+            if flag_value:
+                value |= bit
+
+        return mask, value
+
+    for (category, package_type, candidate,
+         candidate_match_sets) in normalized_candidates:
+        match_info = candidate.get('match', {})
+        has_flags_mask, has_flags_value = \
+            _get_flag_masks(match_info.get('has_flags', {}))
+        set_flags_mask, set_flags_value = \
+            _get_flag_masks(candidate.get('set_flags', {}))
+
+        # Intern the names, since the same package names are shared across
+        # many candidates and are compared when skipping packages.
+        record = _PackageCandidateRecord(
+            allow_fail=candidate.get('allow_fail', False),
+            archs=candidate_match_sets.get('archs'),
+            commands=[
+                [sys.intern(part) for part in command]
+                for command in candidate.get('commands', [])
+            ],
+            distro_families=candidate_match_sets.get('distro_families'),
+            distro_ids=candidate_match_sets.get('distro_ids'),
+            distro_version=match_info.get('distro_version'),
+            has_flags_mask=has_flags_mask,
+            has_flags_value=has_flags_value,
+            install_method=candidate.get('install_method',
+                                         InstallMethodType.SYSTEM_DEFAULT),
+            packages=[
+                sys.intern(name)
+                for name in candidate.get('packages', [])
+            ],
+            rb_version=match_info.get('rb_version'),
+            set_flags_mask=set_flags_mask,
+            set_flags_value=set_flags_value,
+            skip_packages=[
+                sys.intern(name)
+                for name in candidate.get('skip_packages', [])
+            ])
+        systems: AbstractSet[Optional[str]] = \
+            candidate_match_sets.get('systems') or {None, *all_systems}
+        distro_ids: AbstractSet[Optional[str]] = {
+            '',
+            *(candidate_match_sets.get('distro_ids') or
+              {None, *all_distro_ids}),
+        }
+
+        for system in systems:
+            for distro_id in distro_ids:
+                index.setdefault(
+                    (category, package_type, system, distro_id),
+                    []).append(record)
+
+    return {
+        key: tuple(records)
+        for key, records in index.items()
+    }
+
+
+def get_package_candidates(
+    *,
+    category: str,
+    package_type: str,
+    system: str,
+    distro_id: str = '',
+) -> Sequence[_PackageCandidateRecord]:
+    """Return the package candidates that may apply to a system.
+
+    This only filters candidates by system and distribution ID. Callers are
+    still responsible for checking the remaining match conditions on each
+    returned record.
+
+    All match sets in the returned records are lowercase, and must be
+    compared against lowercase values.
+
+    Version Added:
+        1.3
+
+    Args:
+        category (str):
+            The top-level package category.
+
+        package_type (str):
+            The package type nested within the category.
+
+        system (str):
+            The name of the target system.
+
+        distro_id (str, optional):
+            The ID of the target Linux distribution.
+
+            If empty, candidates will not be filtered by distribution ID.
+
+    Returns:
+        list of _PackageCandidateRecord:
+        The package candidate records, in the order they were defined.
+    """
+    package_index = _get_package_index()
+    system_key: Optional[str] = system.lower()
+    distro_id = distro_id.lower()
+
+    # Unknown systems and distribution IDs fall back to the candidates that
+    # aren't restricted to any.
+    if (category, package_type, system_key, '') not in package_index:
+        system_key = None
+
+    try:
+        return package_index[(category, package_type, system_key,
+                              distro_id)]
+    except KeyError:
+        return package_index.get(
+            (category, package_type, system_key, None),
+            ())
+
+
+@lru_cache(maxsize=None)
+def _get_package_index() -> _PackageIndex:
+    """Return the index of package candidates.
+
+    The index is built from :py:data:`PACKAGES` the first time it's needed,
+    so that code paths that never look up packages don't pay the cost of
+    building it.
+
+    Version Added:
+        1.3
+
+    Returns:
+        dict:
+        The package index.
+    """
+    return _build_package_index(PACKAGES)
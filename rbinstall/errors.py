@@ -14,6 +14,28 @@ if TYPE_CHECKING:
     from rbinstall.state import InstallState
 
 
+def _join_command(
+    command: List[str],
+) -> str:
+    """Return a command line for display in an error message.
+
+    Version Added:
+        1.3
+
+    Args:
+        command (list of str):
+            The command line to join.
+
+    Returns:
+        str:
+        The joined command line, quoted the same way as displayed commands.
+    """
+    # rbinstall.process imports this module, so this must be imported here.
+    from rbinstall.process import join_cmdline
+
+    return join_cmdline(command)
+
+
 class InstallerError(Exception):
     """A common error for the installation process.
 
@@ -57,10 +79,38 @@ class RunCommandError(InstallerError):
         self.command = command
         self.exit_code = exit_code
 
-        command_str = ' '.join(command)
+        # The message is built by __str__(), but the details are kept in
+        # args for any code that inspects or logs them.
+        super().__init__(command, exit_code)
 
-        super().__init__(
-            f'Error executing `{command_str}`: exit code {exit_code}'
+    def __str__(self) -> str:
+        """Return a string representation of the error.
+
+        The message is only built when needed, since failures for optional
+        packages are often caught and discarded.
+
+        Returns:
+            str:
+            The error message.
+        """
+        return (
+            f'Error executing `{_join_command(self.command)}`: '
+            f'exit code {self.exit_code}'
+        )
+
+    def __repr__(self) -> str:
+        """Return a debug representation of the error.
+
+        Version Added:
+            1.3
+
+        Returns:
+            str:
+            The debug representation.
+        """
+        return (
+            f'{type(self).__name__}(command={self.command!r}, '
+            f'exit_code={self.exit_code!r})'
         )
 
 
@@ -111,7 +161,7 @@ class InstallPackageError(InstallerError):
                 '(%(packages)s). The command that failed was: `%(command)s`. '
                 'The error was: %(detail)s'
             )) % {
-                'command': ' '.join(error.command),
+                'command': _join_command(error.command),
                 'detail': str(error),
                 'packages': ' '.join(packages),
             }
@@ -8,6 +8,7 @@ Version Added:
 from __future__ import annotations
 
 import os
+import shutil
 import tempfile
 import urllib.request
 from enum import Enum
@@ -76,6 +77,28 @@ class InstallMethodType(str, Enum):
     SYSTEM_DEFAULT = 'system-default'
 
 
+#: Extra arguments passed to :command:`apt-get` commands.
+#:
+#: This avoids setting up a pseudo-terminal for dpkg, since output is
+#: captured and streamed by the installer.
+#:
+#: Version Added:
+#:     1.3
+_APT_ARGS: List[str] = ['-o', 'Dpkg::Use-Pty=0']
+
+
+#: Extra environment variables for :command:`apt-get` commands.
+#:
+#: This prevents packages from prompting for configuration during
+#: installation.
+#:
+#: Version Added:
+#:     1.3
+_APT_ENV: Dict[str, str] = {
+    'DEBIAN_FRONTEND': 'noninteractive',
+}
+
+
 def _run_apt_install(
     install_state: InstallState,
     packages: List[str],
@@ -99,7 +122,8 @@ def _run_apt_install(
             The package failed to install.
     """
     try:
-        run(['apt-get', 'install', '-y'] + packages,
+        run(['apt-get', 'install', '-y', *_APT_ARGS, *packages],
+            env=_APT_ENV,
             **run_kwargs)
     except RunCommandError as e:
         raise InstallPackageError(install_state=install_state,
@@ -131,7 +155,8 @@ def _run_apt_build_dep(
             The package failed to install.
     """
     try:
-        run(['apt-get', 'build-dep', '-y'] + packages,
+        run(['apt-get', 'build-dep', '-y', *_APT_ARGS, *packages],
+            env=_APT_ENV,
             **run_kwargs)
     except RunCommandError as e:
         raise InstallPackageError(
@@ -222,6 +247,10 @@ def _run_pip_install(
 
     This will run the version in the target virtual environment.
 
+    Each call runs :command:`pip` as its own process. pip doesn't support
+    being driven in-process through its internal API, and it must run with
+    the virtual environment's own Python.
+
     Version Added:
         1.0
 
@@ -244,10 +273,18 @@ def _run_pip_install(
             [
                 install_state['venv_pip_exe'],
                 'install',
+
+                # Skip checks that would otherwise make network requests or
+                # show warnings on every run.
+                '--disable-pip-version-check',
+                '--no-python-version-warning',
                 *extra_args,
                 *packages,
             ],
             env={
+                # Never stop to prompt for input (such as credentials).
+                'PIP_NO_INPUT': '1',
+
                 'CFLAGS': (
                     # Avoid warnings that can come up on some systems during
                     # compilation, depending on Python and system library
@@ -305,13 +342,22 @@ def _run_remote_pyscript(
     if run_kwargs.get('dry_run'):
         run(displayed_command, **run_kwargs)
     else:
-        fd, script_file = tempfile.mkstemp(suffix='.py')
+        # The script is run from a file rather than piped to the Python
+        # interpreter's stdin. This keeps stdin available to the script,
+        # gives it a __file__, and lets run() handle execution and output
+        # like any other command.
+        #
+        # The file must be closed before running it, so it can't be deleted
+        # on close. We'll remove it ourselves.
+        script_fp = tempfile.NamedTemporaryFile(suffix='.py', delete=False)
+        script_file = script_fp.name
 
         try:
-            with urllib.request.urlopen(script_url) as fp:
-                os.write(fd, fp.read())
-
-            os.close(fd)
+            # Stream the script to the file, rather than reading it all
+            # into memory first.
+            with script_fp:
+                with urllib.request.urlopen(script_url) as fp:
+                    shutil.copyfileobj(fp, script_fp)
 
             try:
                 run([python_exe, script_file],
@@ -335,9 +381,16 @@ def _run_reviewboard_extra(
 ) -> None:
     """Install a Review Board extras package.
 
+    All extras are combined into a single ``ReviewBoard[...]`` requirement,
+    so that pip only needs to resolve Review Board once.
+
     Version Added:
         1.0
 
+    Version Changed:
+        1.3:
+        Extras are now installed through a single combined requirement.
+
     Args:
         install_state (rbinstall.state.InstallState):
             The state for the installation.
@@ -349,13 +402,12 @@ def _run_reviewboard_extra(
         rbinstall.errors.InstallPackageError:
             The package failed to install.
     """
+    extras = ','.join(dict.fromkeys(packages))
+
     try:
         _run_pip_install(
             install_state,
-            [
-                f'ReviewBoard[{extra}]'
-                for extra in packages
-            ],
+            [f'ReviewBoard[{extras}]'],
             run_kwargs=run_kwargs)
     except InstallPackageError as e:
         e.install_method = InstallMethodType.REVIEWBOARD_EXTRA
@@ -503,9 +555,13 @@ def run_install_method(
 
 #: A mapping of all install methods to handlers.
 #:
+#: This is used as the dispatch table for :py:func:`run_install_method`.
+#: :py:attr:`InstallMethodType.SYSTEM_DEFAULT` has no handler, as it must be
+#: resolved to a concrete install method when building install steps.
+#:
 #: Version Added:
 #:     1.0
-INSTALL_METHODS: Dict[str, _InstallMethod] = {
+INSTALL_METHODS: Dict[InstallMethodType, _InstallMethod] = {
     InstallMethodType.APT: _run_apt_install,
     InstallMethodType.APT_BUILD_DEP: _run_apt_build_dep,
     InstallMethodType.BREW: _run_brew_install,
@@ -9,17 +9,19 @@ from __future__ import annotations
 
 from gettext import gettext as _
 from itertools import chain
-from typing import Dict, Generic, List, Set, TYPE_CHECKING, TypeVar, Tuple
+from typing import (Dict, Generic, List, Optional, Set, TYPE_CHECKING,
+                    TypeVar, Tuple)
 
-from typing_extensions import NotRequired, TypeAlias, TypedDict
+from typing_extensions import Literal, NotRequired, TypeAlias, TypedDict
 
-from rbinstall.distro_info import PACKAGES
+from rbinstall.distro_info import get_package_candidates
 from rbinstall.install_methods import (COMMON_INSTALL_METHODS,
                                        InstallMethodType)
 from rbinstall.versioning import parse_version
 
 if TYPE_CHECKING:
     from rbinstall.state import InstallState
+    from rbinstall.versioning import ParsedVersion
 
 
 _T = TypeVar('_T')
@@ -51,12 +53,33 @@ class _InstallStep(Generic[_T], TypedDict):
 InstallSteps: TypeAlias = List[_InstallStep]
 
 
+#: Installation methods whose steps can be merged across install phases.
+#:
+#: These take a plain list of package names. :py:attr:`InstallMethodType.PIP`
+#: is excluded, as its steps may contain options and must run in order
+#: (for instance, upgrading packaging tools before installing packages).
+#:
+#: Version Added:
+#:     1.3
+_MERGEABLE_INSTALL_METHODS: Set[InstallMethodType] = {
+    InstallMethodType.APT,
+    InstallMethodType.APT_BUILD_DEP,
+    InstallMethodType.BREW,
+    InstallMethodType.PACMAN,
+    InstallMethodType.REVIEWBOARD_EXTRA,
+    InstallMethodType.YUM,
+    InstallMethodType.ZYPPER,
+}
+
+
 def get_install_package_steps(
     install_state: InstallState,
     *,
     categories: List[str],
     package_type: str,
     description: str = '',
+    rb_version_info: Optional[ParsedVersion] = None,
+    distro_version_info: Optional[ParsedVersion] = None,
 ) -> InstallSteps:
     """Return steps for installing some packages for the target system.
 
@@ -64,6 +87,12 @@ def get_install_package_steps(
     installation steps for any entries that match the criteria for the target
     system.
 
+    Packages from all matching candidates that share an installation method
+    are batched into a single step, so that the package manager only runs
+    once for them. Candidates that are allowed to fail are given their own
+    steps, so that a failure doesn't prevent other packages from being
+    installed. Setup commands are kept as individual steps, in order.
+
     Version Added:
         1.0
 
@@ -80,106 +109,119 @@ def get_install_package_steps(
         description (str, optional):
             An optional description for the steps.
 
+        rb_version_info (tuple, optional):
+            The parsed version of Review Board being installed.
+
+            If not provided, this will be parsed from ``install_state``.
+
+            Version Added:
+                1.3
+
+        distro_version_info (tuple, optional):
+            The parsed version of the target system or distribution.
+
+            If not provided, this will be parsed from ``install_state``.
+
+            Version Added:
+                1.3
+
     Returns:
         list of _InstallStep:
         The resulting list of steps.
     """
-    packages: Dict[Tuple[InstallMethodType, int], List[str]] = {}
-    packages_set: Dict[Tuple[InstallMethodType, int], Set[str]] = {}
+    packages: Dict[Tuple[InstallMethodType, int], Dict[str, None]] = {}
     allow_fail_map: Dict[Tuple[InstallMethodType, int], bool] = {}
     setup_commands: List[List[str]] = []
-    flags: Set[str] = set()
+    flags: int = 0
 
+    # Match rules are normalized to lowercase, so normalize the system
+    # information to compare against. These are bound once here, so that
+    # the candidate loop below never needs to look in the install state.
     system_info = install_state['system_info']
-    arch = system_info['arch']
-    distro_families = system_info.get('distro_families')
-    distro_id = system_info.get('distro_id')
+    arch = system_info['arch'].lower()
+    distro_families = {
+        family.lower()
+        for family in system_info.get('distro_families') or ()
+    }
+    distro_id = (system_info.get('distro_id') or '').lower()
     system = system_info['system']
     system_install_method = system_info['system_install_method']
 
     supported_install_methods = \
         COMMON_INSTALL_METHODS | {system_install_method}
 
+    # Looking up a member on an Enum class is comparatively slow, so look
+    # this up once for the loop below.
+    system_default_install_method = InstallMethodType.SYSTEM_DEFAULT
+
     # Normalize the Review Board version to install.
-    rb_version_info = parse_version(
-        install_state['reviewboard_version_info']['version'])
+    if rb_version_info is None:
+        rb_version_info = parse_version(
+            install_state['reviewboard_version_info']['version'])
 
     # Normalize the distro version in use.
-    distro_version_info = parse_version(system_info['version'])
+    if distro_version_info is None:
+        distro_version_info = parse_version(system_info['version'])
 
+    # Candidates are pre-filtered by system and distro ID.
     package_candidates = chain.from_iterable(
-        PACKAGES[category].get(package_type, [])
+        get_package_candidates(category=category,
+                               package_type=package_type,
+                               system=system,
+                               distro_id=distro_id)
         for category in categories
     )
 
+    # Each candidate is a precomputed record, with normalized match sets,
+    # version functions, and flag bitmasks. The checks below only compare
+    # against those, and don't need to look up or build anything per
+    # candidate.
     for i, candidate in enumerate(package_candidates):
-        match_info = candidate.get('match', {})
-
-        # Check for a system match.
-        if system not in match_info.get('systems', {system}):
-            continue
-
         # Check for an architecture match.
-        if arch not in match_info.get('archs', {arch}):
+        match_archs = candidate.archs
+
+        if match_archs is not None and arch not in match_archs:
             continue
 
         # Check that the install method is compatible.
-        install_method = candidate.get('install_method',
-                                       InstallMethodType.SYSTEM_DEFAULT)
+        install_method = candidate.install_method
 
-        if install_method == InstallMethodType.SYSTEM_DEFAULT:
+        if install_method is system_default_install_method:
             install_method = system_install_method
 
         if install_method not in supported_install_methods:
             continue
 
         # Check that at least one of the distro families match.
-        match_distro_families = match_info.get('distro_families', set())
+        match_distro_families = candidate.distro_families
 
         if (distro_families and
             match_distro_families and
-            not (match_distro_families & distro_families)):
-            continue
-
-        # Check for a distro ID match.
-        if (distro_id and
-            distro_id not in match_info.get('distro_ids', {distro_id})):
+            match_distro_families.isdisjoint(distro_families)):
             continue
 
         # Check for a distro version match.
-        version_func = match_info.get('distro_version')
+        version_func = candidate.distro_version
 
         if version_func is not None and not version_func(distro_version_info):
             continue
 
         # Check for a Review Board version match.
-        version_func = match_info.get('rb_version')
+        version_func = candidate.rb_version
 
         if version_func is not None and not version_func(rb_version_info):
             continue
 
-        # Check for any flags that must be set.
-        has_flags = match_info.get('has_flags', {})
-
-        if has_flags:
-            flags_match = True
-
-            for flag_name, flag_value in has_flags.items():
-                if ((flag_value and flag_name not in flags) or
-                    (not flag_value and flag_name in flags)):
-                    flags_match = False
-                    break
-
-            if not flags_match:
-                continue
+        # Check for any flags that must be set (or unset).
+        if flags & candidate.has_flags_mask != candidate.has_flags_value:
+            continue
 
         # This is a match. Add any packages.
-        setup_commands += candidate.get('commands', [])
+        setup_commands += candidate.commands
 
-        added_packages = candidate.get('packages', [])
-        skipped_packages = candidate.get('skip_packages', [])
-        allow_fail = candidate.get('allow_fail', False)
-        set_flags = candidate.get('set_flags', {})
+        added_packages = candidate.packages
+        skipped_packages = candidate.skip_packages
+        allow_fail = candidate.allow_fail
 
         if allow_fail:
             block_i = i
@@ -187,30 +229,28 @@ def get_install_package_steps(
             block_i = -1
 
         key = (install_method, block_i)
-        packages_for_type = packages.setdefault(key, [])
-        packages_set_for_type = packages_set.setdefault(key, set())
+        packages_for_type = packages.setdefault(key, {})
         allow_fail_map[key] = allow_fail
 
-        for flag_name, flag_value in set_flags.items():
-            if flag_value:
-                flags.add(flag_name)
-            else:
-                flags.discard(flag_name)
+        flags = ((flags & ~candidate.set_flags_mask) |
+                 candidate.set_flags_value)
 
         if added_packages:
-            # We have packages to add to the final list.
-            packages_for_type += added_packages
-            packages_set_for_type.update(added_packages)
+            # We have packages to add to the final list. This is used as an
+            # ordered set.
+            packages_for_type.update(dict.fromkeys(added_packages))
 
         if skipped_packages:
             # We have packages to skip from the final list. These are ones
             # that were added in a previous candidate but no longer apply in
             # a more specific one.
             for package in skipped_packages:
-                if package in packages_set_for_type:
-                    packages_for_type.remove(package)
-                    packages_set_for_type.remove(package)
+                packages_for_type.pop(package, None)
 
+    # Setup commands must run sequentially, in the order they were matched.
+    # They depend on each other (for instance, "dnf config-manager" requires
+    # "dnf-plugins-core"), and package managers hold exclusive locks on their
+    # databases while running.
     install_steps: InstallSteps = [
         {
             'install_method': InstallMethodType.SHELL,
@@ -227,12 +267,101 @@ def get_install_package_steps(
             'allow_fail': allow_fail_map[key],
             'install_method': install_method,
             'name': description or _('Installing packages'),
-            'state': method_packages,
+            'state': list(method_packages),
         })
 
     return install_steps
 
 
+def _merge_install_steps(
+    install_steps: InstallSteps,
+) -> InstallSteps:
+    """Merge package installation steps across install phases.
+
+    Steps using a mergeable installation method are merged into an earlier
+    step using the same method, so that the package manager only runs once
+    for them. Duplicate packages are removed. The merged step keeps the
+    name of the earlier step, and the names of any steps merged into it
+    are discarded.
+
+    Steps are never merged across a shell step, since those may set up
+    support needed by later packages (such as enabling package
+    repositories or creating the virtual environment). Steps that are
+    allowed to fail are kept separate.
+
+    pip steps are never merged, but any requirements already installed by
+    an earlier pip step are removed from later ones. Options are always
+    kept. So is any argument following an option that isn't in
+    ``--option=value`` form, since it may be the option's value. See
+    :py:data:`rbinstall.distro_info.PACKAGES`.
+
+    Version Added:
+        1.3
+
+    Args:
+        install_steps (list of _InstallStep):
+            The steps to merge.
+
+    Returns:
+        list of _InstallStep:
+        The resulting list of steps.
+    """
+    merged_steps: InstallSteps = []
+    merge_targets: Dict[InstallMethodType, _InstallStep] = {}
+    pip_requirements: Set[str] = set()
+
+    for install_step in install_steps:
+        install_method = install_step['install_method']
+
+        if install_method == InstallMethodType.SHELL:
+            merge_targets.clear()
+        elif install_method == InstallMethodType.PIP:
+            pip_args = install_step.get('state', [])
+            new_pip_args: List[str] = []
+            requirements: List[str] = []
+            prev_pip_arg = ''
+
+            for pip_arg in pip_args:
+                if (pip_arg.startswith('-') or
+                    (prev_pip_arg.startswith('-') and
+                     '=' not in prev_pip_arg)):
+                    # This is an option, or may be the value for the
+                    # previous option (as in "--index-url URL").
+                    new_pip_args.append(pip_arg)
+                elif pip_arg not in pip_requirements:
+                    new_pip_args.append(pip_arg)
+                    requirements.append(pip_arg)
+
+                prev_pip_arg = pip_arg
+
+            if len(new_pip_args) != len(pip_args):
+                if not requirements:
+                    # Everything in this step is already installed.
+                    continue
+
+                install_step = dict(install_step)  # type: ignore
+                install_step['state'] = new_pip_args
+
+            if not install_step.get('allow_fail'):
+                pip_requirements.update(requirements)
+        elif (install_method in _MERGEABLE_INSTALL_METHODS and
+              not install_step.get('allow_fail')):
+            merge_target = merge_targets.get(install_method)
+
+            if merge_target is not None:
+                merge_target['state'] = list(dict.fromkeys(chain(
+                    merge_target.get('state', []),
+                    install_step.get('state', []))))
+                continue
+
+            install_step = dict(install_step)  # type: ignore
+            merge_targets[install_method] = install_step
+
+        merged_steps.append(install_step)
+
+    return merged_steps
+
+
 def get_setup_virtualenv_steps(
     install_state: InstallState,
 ) -> InstallSteps:
@@ -270,6 +399,24 @@ def get_setup_virtualenv_steps(
     ]
 
 
+#: Review Board packages and their version keys in the install state.
+#:
+#: Version Added:
+#:     1.3
+_RB_PACKAGE_VERSION_KEYS: Tuple[
+    Tuple[str, Literal['powerpack_version_info',
+                       'reviewboard_version_info',
+                       'reviewbot_extension_version_info',
+                       'reviewbot_worker_version_info']],
+    ...
+] = (
+    ('ReviewBoard', 'reviewboard_version_info'),
+    ('ReviewBoardPowerPack', 'powerpack_version_info'),
+    ('reviewbot-extension', 'reviewbot_extension_version_info'),
+    ('reviewbot-worker', 'reviewbot_worker_version_info'),
+)
+
+
 def get_install_rb_packages_steps(
     install_state: InstallState,
 ) -> InstallSteps:
@@ -288,15 +435,8 @@ def get_install_rb_packages_steps(
     """
     packages: List[str] = []
 
-    for package_name, version_key in (('ReviewBoard',
-                                       'reviewboard_version_info'),
-                                      ('ReviewBoardPowerPack',
-                                       'powerpack_version_info'),
-                                      ('reviewbot-extension',
-                                       'reviewbot_extension_version_info'),
-                                      ('reviewbot-worker',
-                                       'reviewbot_worker_version_info')):
-        version_info = install_state[version_key]  # type: ignore
+    for package_name, version_key in _RB_PACKAGE_VERSION_KEYS:
+        version_info = install_state[version_key]
 
         if version_info:
             version = version_info['version']
@@ -317,6 +457,10 @@ def get_install_steps(
 ) -> InstallSteps:
     """Return all steps for installing Review Board.
 
+    Package installation steps using the same installation method are
+    merged across install phases where possible. See
+    :py:func:`_merge_install_steps` for details.
+
     Version Added:
         1.0
 
@@ -328,6 +472,12 @@ def get_install_steps(
         list of _InstallStep:
         The resulting list of steps.
     """
+    # These are shared across all the package installation phases.
+    rb_version_info = parse_version(
+        install_state['reviewboard_version_info']['version'])
+    distro_version_info = parse_version(
+        install_state['system_info']['version'])
+
     categories: List[str] = [
         'common',
         'cvs',
@@ -342,27 +492,35 @@ def get_install_steps(
         'saml',
     ]
 
-    return [
+    return _merge_install_steps([
         *get_install_package_steps(
             install_state,
             categories=categories,
+            rb_version_info=rb_version_info,
+            distro_version_info=distro_version_info,
             description=_('Installing system packages'),
             package_type='system'),
         *get_setup_virtualenv_steps(install_state),
         *get_install_package_steps(
             install_state,
             categories=categories,
+            rb_version_info=rb_version_info,
+            distro_version_info=distro_version_info,
             description=_('Installing Python packaging support'),
             package_type='virtualenv'),
         *get_install_rb_packages_steps(install_state),
         *get_install_package_steps(
             install_state,
             categories=categories,
+            rb_version_info=rb_version_info,
+            distro_version_info=distro_version_info,
             description=_('Installing extra Review Board integrations'),
             package_type='rb-extras'),
         *get_install_package_steps(
             install_state,
             categories=categories,
+            rb_version_info=rb_version_info,
+            distro_version_info=distro_version_info,
             description=_('Installing service integrations'),
             package_type='service-integrations'),
-    ]
+    ])
@@ -10,16 +10,15 @@ from __future__ import annotations
 import argparse
 import os
 import sys
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from gettext import gettext as _
-from typing import Dict, List, Optional, TYPE_CHECKING, Tuple
+from typing import (Any, Dict, List, Mapping, Optional, TYPE_CHECKING,
+                    Tuple)
 
 from rbinstall import get_version_string
 from rbinstall.errors import InstallerError
 from rbinstall.process import debug
-from rbinstall.pypi import get_package_version_info
-from rbinstall.state import get_system_info
 from rbinstall.ui import get_console, init_console
-from rbinstall.wizard import start_wizard
 
 if TYPE_CHECKING:
     from rbinstall.state import InstallState, SystemInfo
@@ -90,7 +89,7 @@ def parse_options(
     parser.add_argument(
         '--install-path',
         metavar='PATH',
-        default=os.path.join('/', 'opt', 'reviewboard'),
+        default='/opt/reviewboard',
         help=_('The location for the Review Board install.'))
     parser.add_argument(
         '--create-sitedir',
@@ -111,7 +110,7 @@ def parse_options(
     parser.add_argument(
         '--sitedir-path',
         metavar='PATH',
-        default=os.path.join('/', 'var', 'www', 'reviewboard'),
+        default='/var/www/reviewboard',
         help=_(
             'The location for a Review Board site directory, if creating one.'
         ))
@@ -161,10 +160,92 @@ def parse_options(
     return parser.parse_args(argv)
 
 
+#: The maximum number of PyPI lookups to run at once.
+#:
+#: This stays well within PyPI's fair use limits. Rate-limited requests are
+#: retried by :py:func:`rbinstall.pypi.fetch_package_info`.
+#:
+#: Version Added:
+#:     1.3
+_MAX_PYPI_LOOKUPS = 4
+
+
+def _get_package_candidates(
+    options: argparse.Namespace,
+) -> List[Tuple[str, bool, str]]:
+    """Return the packages that may be installed.
+
+    Version Added:
+        1.3
+
+    Args:
+        options (argparse.Namespace):
+            The parsed command line arguments.
+
+    Returns:
+        list of tuple:
+        A list of 3-tuples of the package name, whether it will be
+        installed, and the target version.
+    """
+    return [
+        ('ReviewBoard',
+         True,
+         options.reviewboard_version),
+        ('ReviewBoardPowerPack',
+         options.install_powerpack,
+         options.powerpack_version),
+        ('reviewbot-extension',
+         options.install_reviewbot_extension,
+         options.reviewbot_extension_version),
+        ('reviewbot-worker',
+         options.install_reviewbot_worker,
+         options.reviewbot_worker_version),
+    ]
+
+
+def fetch_package_infos(
+    *,
+    executor: Executor,
+    options: argparse.Namespace,
+) -> Dict[str, Future[Optional[Dict[str, Any]]]]:
+    """Start fetching information on the packages to install from PyPI.
+
+    Each lookup is a separate request to PyPI, so they're run concurrently
+    on the provided executor. The results can be passed to
+    :py:func:`get_package_versions` once they're needed.
+
+    Version Added:
+        1.3
+
+    Args:
+        executor (concurrent.futures.Executor):
+            The executor used to fetch the package information.
+
+        options (argparse.Namespace):
+            The parsed command line arguments.
+
+    Returns:
+        dict:
+        A mapping of package names to futures for their package information.
+    """
+    from rbinstall.pypi import fetch_package_info
+
+    return {
+        package_name: executor.submit(fetch_package_info,
+                                      package_name=package_name)
+        for package_name, install, target_version
+        in _get_package_candidates(options)
+        if install
+    }
+
+
 def get_package_versions(
     *,
     system_info: SystemInfo,
     options: argparse.Namespace,
+    package_infos: Optional[
+        Mapping[str, Future[Optional[Dict[str, Any]]]]
+    ] = None,
 ) -> Dict[str, Optional[PackageVersionInfo]]:
     """Return the versions to use for each Review Board package.
 
@@ -175,6 +256,10 @@ def get_package_versions(
     Version Added:
         1.0
 
+    Version Changed:
+        1.3:
+        Added the ``package_infos`` argument.
+
     Args:
         system_info (rbinstall.state.SystemInfo):
             Information on the target system.
@@ -182,47 +267,80 @@ def get_package_versions(
         options (argparse.Namespace):
             The parsed commadn line arguments.
 
+        package_infos (dict, optional):
+            Package information already being fetched by
+            :py:func:`fetch_package_infos`. If not provided, it will be
+            fetched here.
+
+    Returns:
+        dict:
+        A mapping of package names to version information.
+
     Raises:
         rbinstall.errors.InstallerError:
-            There was an issue fetching package version information.
+            There was an issue fetching package version information. If
+            several packages had problems, they will all be listed.
     """
-    package_candidates: List[Tuple[str, bool, str]] = [
-        ('ReviewBoard',
-         True,
-         options.reviewboard_version),
-        ('ReviewBoardPowerPack',
-         options.install_powerpack,
-         options.powerpack_version),
-        ('reviewbot-extension',
-         options.install_reviewbot_extension,
-         options.reviewbot_extension_version),
-        ('reviewbot-worker',
-         options.install_reviewbot_worker,
-         options.reviewbot_worker_version),
-    ]
+    if package_infos is None:
+        with ThreadPoolExecutor(max_workers=_MAX_PYPI_LOOKUPS) as executor:
+            return get_package_versions(
+                system_info=system_info,
+                options=options,
+                package_infos=fetch_package_infos(executor=executor,
+                                                  options=options))
+
+    from rbinstall.pypi import find_package_version_info
 
     package_versions: Dict[str, Optional[PackageVersionInfo]] = {}
 
-    for package_name, install, target_version in package_candidates:
+    # Check every package before failing, so that all problems can be
+    # reported at once instead of one per run. Results are processed in
+    # order, so that errors are reported consistently.
+    errors: List[str] = []
+
+    for package_name, install, target_version in \
+            _get_package_candidates(options):
+        version_info: Optional[PackageVersionInfo] = None
+
         if install:
-            version_info = get_package_version_info(
-                system_info=system_info,
-                package_name=package_name,
-                target_version=target_version)
+            try:
+                package_info = package_infos[package_name].result()
+
+                if package_info is not None:
+                    version_info = find_package_version_info(
+                        package_info=package_info,
+                        system_info=system_info,
+                        package_name=package_name,
+                        target_version=target_version)
+            except InstallerError as e:
+                errors.append(str(e))
+                continue
 
             if version_info is None:
-                raise InstallerError(
+                errors.append(
                     _('No compatible version of %(package_name)s could '
                       'be found on this system. You may need to install '
                       'on a newer system with a newer version of Python.')
                     % {
                         'package_name': package_name,
                     })
-        else:
-            version_info = None
+                continue
 
         package_versions[package_name] = version_info
 
+    if len(errors) == 1:
+        raise InstallerError(errors[0])
+    elif errors:
+        raise InstallerError(
+            _('There were problems finding the packages to install:\n\n'
+              '%(errors)s')
+            % {
+                'errors': '\n\n'.join(
+                    f'* {error}'
+                    for error in errors
+                ),
+            })
+
     debug('All package information has been fetched.')
 
     return package_versions
@@ -246,6 +364,11 @@ def main(
     options = parse_options(argv[1:])
     console = get_console()
 
+    # These pull in the install step tables and system detection, which
+    # aren't needed for --help or --version.
+    from rbinstall.state import get_system_info
+    from rbinstall.wizard import start_wizard
+
     try:
         debug('Setting up the installer console support.')
 
@@ -260,10 +383,32 @@ def main(
             ))
 
         with console.status(_('Gathering system and package information...')):
-            system_info = get_system_info()
-            package_versions = get_package_versions(system_info=system_info,
+            with ThreadPoolExecutor(max_workers=_MAX_PYPI_LOOKUPS) as executor:
+                # Package information is downloaded from PyPI while
+                # information on the system is gathered, since neither
+                # depends on the other.
+                package_infos = fetch_package_infos(executor=executor,
                                                     options=options)
 
+                try:
+                    system_info = get_system_info()
+                except BaseException:
+                    # The packages won't be needed on a system that can't
+                    # be installed on. Only the downloads already in
+                    # progress are waited on before the error is reported.
+                    #
+                    # NOTE: Executor.shutdown(cancel_futures=True) requires
+                    #       Python 3.9+.
+                    for future in package_infos.values():
+                        future.cancel()
+
+                    raise
+
+                package_versions = get_package_versions(
+                    system_info=system_info,
+                    options=options,
+                    package_infos=package_infos)
+
         rb_version_info = package_versions['ReviewBoard']
         assert rb_version_info is not None
 
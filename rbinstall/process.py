@@ -7,9 +7,11 @@ Version Added:
 # NOTE: This file must be syntactically compatible with Python 3.7+.
 from __future__ import annotations
 
+import codecs
 import os
 import subprocess
 import shlex
+import string
 import sys
 from typing import List, Mapping, NoReturn, Optional, Sequence
 
@@ -20,9 +22,30 @@ from rbinstall.errors import RunCommandError
 from rbinstall.ui import get_console
 
 
+#: Whether debug output is enabled.
+#:
+#: This is set from :envvar:`RBINSTALL_DEBUG` when first imported.
 DEBUG = (os.environ.get('RBINSTALL_DEBUG') == '1')
 
 
+#: The maximum number of bytes to read from a command's output at a time.
+#:
+#: Version Added:
+#:     1.3
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+#: Characters that never need quoting in a command line.
+#:
+#: This matches the characters :py:func:`shlex.quote` leaves as-is, letting
+#: most arguments skip quoting entirely.
+#:
+#: Version Added:
+#:     1.3
+_SAFE_CMDLINE_CHARS = frozenset(
+    string.ascii_letters + string.digits + '@%_-+=:,./')
+
+
 class RunKwargs(TypedDict):
     """Keyword arguments supported by the :py:func:`run` method.
 
@@ -54,28 +77,58 @@ def die(
     sys.exit(1)
 
 
-def debug(
-    msg: str,
-    *,
-    show_prefix: bool = True,
-) -> None:
-    """Output debug information.
+# The debug() implementation is chosen once at import, since DEBUG never
+# changes. With debugging off, calls skip straight to a no-op.
+if DEBUG:
+    def debug(
+        msg: str,
+        *,
+        show_prefix: bool = True,
+    ) -> None:
+        """Output debug information.
 
-    This will only be shown if the :envvar:`RBINSTALL_DEBUG` environment
-    variable is set to ``1``.
+        This will only be shown if the :envvar:`RBINSTALL_DEBUG` environment
+        variable is set to ``1``.
 
-    Version Added:
-        1.0
+        Version Added:
+            1.0
 
-    Args:
-        msg (str, optional):
-            The message to display.
-    """
-    if DEBUG:
+        Version Changed:
+            1.3:
+            This is now a no-op if debugging is disabled. Callers building
+            expensive messages can check :py:data:`DEBUG` first.
+
+        Args:
+            msg (str, optional):
+                The message to display.
+
+            show_prefix (bool, optional):
+                Whether to prefix the message with ``[DEBUG]``.
+        """
         if show_prefix:
             print(f'[DEBUG] {msg}')
         else:
             print(msg)
+else:
+    def debug(
+        msg: str,
+        *,
+        show_prefix: bool = True,
+    ) -> None:
+        """Discard debug information.
+
+        This is used when :envvar:`RBINSTALL_DEBUG` is not set.
+
+        Version Added:
+            1.3
+
+        Args:
+            msg (str, optional):
+                The message to discard.
+
+            show_prefix (bool, optional):
+                Unused.
+        """
 
 
 def run(
@@ -85,12 +138,16 @@ def run(
     displayed_command: Optional[List[str]] = None,
     dry_run: bool = False,
     raw: bool = False,
-    env: Mapping[str, str] = None,
+    env: Optional[Mapping[str, str]] = None,
 ) -> None:
     """Run an external command.
 
     Output will be streamed.
 
+    The command is executed directly, without a shell. A bare executable
+    name is looked up in :envvar:`PATH` when the command is run, and is
+    shown as-is in the displayed command.
+
     Version Added:
         1.0
 
@@ -134,10 +191,12 @@ def run(
     else:
         capture_command.append(displayed_command)
 
+    # Only build a new environment if there are variables to add. Otherwise,
+    # the command inherits this process's environment as-is.
     if env:
         env = dict(os.environ, **env)
     else:
-        env = os.environ
+        env = None
 
     if not dry_run:
         if raw:
@@ -155,24 +214,41 @@ def run(
                                   env=env) as p:
                 assert p.stdout is not None
 
-                while p.poll() is None:
-                    console.out(p.stdout.read1().decode('utf-8', 'ignore'),
+                # Read straight from the pipe in large chunks, blocking
+                # until output is available. The incremental decoder holds
+                # onto any multi-byte character split across reads instead
+                # of dropping it.
+                fd = p.stdout.fileno()
+                decoder = codecs.getincrementaldecoder('utf-8')('ignore')
+
+                while True:
+                    data = os.read(fd, _READ_CHUNK_SIZE)
+
+                    if not data:
+                        break
+
+                    text = decoder.decode(data)
+
+                    if text:
+                        console.out(text,
+                                    style='dim',
+                                    highlight=False,
+                                    end='')
+
+                # Flush anything the decoder is still holding at EOF.
+                text = decoder.decode(b'', final=True)
+
+                if text:
+                    console.out(text,
                                 style='dim',
                                 highlight=False,
                                 end='')
 
-                # Write anything remaining in the buffer.
-                console.out(p.stdout.read().decode('utf-8', 'ignore'),
-                            style='dim',
-                            highlight=False,
-                            end='')
-
-                exit_code = p.poll()
+                exit_code = p.wait()
 
                 debug(f'exit code = {exit_code}')
 
                 if exit_code != 0:
-                    assert exit_code is not None
                     raise RunCommandError(command=command,
                                           exit_code=exit_code)
 
@@ -197,12 +273,9 @@ def join_cmdline(
         str:
         The resulting command line string.
     """
-    parts: List[str] = []
-
-    for part in cmdline:
-        if part != '|':
-            part = shlex.quote(part)
-
-        parts.append(part)
-
-    return ' '.join(parts)
+    return ' '.join(
+        part
+        if part == '|' or (part and _SAFE_CMDLINE_CHARS.issuperset(part))
+        else shlex.quote(part)
+        for part in cmdline
+    )
@@ -6,14 +6,16 @@ Version Added:
 
 from __future__ import annotations
 
+import hashlib
 import json
-from typing import Optional, TYPE_CHECKING
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, TYPE_CHECKING, Tuple
 from urllib.error import HTTPError
 from urllib.parse import urljoin
 from urllib.request import Request, urlopen
 
-from packaging.specifiers import SpecifierSet
-from packaging.version import parse as parse_version
 from typing_extensions import TypedDict
 
 from rbinstall import get_package_version
@@ -21,12 +23,38 @@ from rbinstall.errors import InstallerError
 from rbinstall.process import debug
 
 if TYPE_CHECKING:
+    from packaging.version import Version
+
     from rbinstall.state import SystemInfo
 
 
 USER_AGENT = f'rbinstall/{get_package_version()}'
 
 
+#: How long a cached response without validators is considered fresh.
+#:
+#: Responses that include an ``ETag`` or ``Last-Modified`` header are always
+#: revalidated with the server instead.
+#:
+#: Version Added:
+#:     1.3
+CACHE_TTL_SECS = 300
+
+
+#: The maximum number of attempts to make when fetching from PyPI.
+#:
+#: Version Added:
+#:     1.3
+_MAX_FETCH_ATTEMPTS = 3
+
+
+#: HTTP status codes indicating a temporary failure that may be retried.
+#:
+#: Version Added:
+#:     1.3
+_RETRY_HTTP_CODES = {429, 500, 502, 503, 504}
+
+
 class PackageVersionInfo(TypedDict):
     """Information on a Python package to install.
 
@@ -56,20 +84,364 @@ class PackageVersionInfo(TypedDict):
     version: str
 
 
-def get_package_version_info(
+def _get_cache_dir() -> Optional[str]:
+    """Return the directory used to cache PyPI responses.
+
+    This honors :envvar:`XDG_CACHE_HOME`, falling back to
+    :file:`~/.cache`.
+
+    Caching is disabled if that directory (or the home directory) belongs
+    to another user. This happens when running through :command:`sudo`
+    with the user's environment preserved, and files written there as
+    root couldn't be updated or removed by the user later.
+
+    Version Added:
+        1.3
+
+    Returns:
+        str:
+        The cache directory, or ``None`` if a home directory could not be
+        determined or belongs to another user.
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+
+    if cache_home:
+        owner_dir = cache_home
+    else:
+        home = os.path.expanduser('~')
+
+        if home == '~':
+            return None
+
+        owner_dir = home
+        cache_home = os.path.join(home, '.cache')
+
+    try:
+        owner_uid = os.stat(owner_dir).st_uid
+    except OSError:
+        # The directory will be created by this user, if it can be.
+        pass
+    else:
+        if owner_uid != os.geteuid():
+            debug(f'Not caching PyPI responses, since {owner_dir} belongs '
+                  f'to another user.')
+            return None
+
+    return os.path.join(cache_home, 'rbinstall', 'pypi')
+
+
+def _get_cache_path(
+    url: str,
+) -> Optional[str]:
+    """Return the path to the cache file for a URL.
+
+    Version Added:
+        1.3
+
+    Args:
+        url (str):
+            The URL being fetched.
+
+    Returns:
+        str:
+        The path to the cache file, or ``None`` if caching is unavailable.
+    """
+    cache_dir = _get_cache_dir()
+
+    if not cache_dir:
+        return None
+
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    return os.path.join(cache_dir, f'{key}.json')
+
+
+def _read_cache(
+    cache_path: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    """Return a cached PyPI response.
+
+    Errors reading the cache are ignored, as are entries without a
+    response body, so that the response is fetched in full again.
+
+    Version Added:
+        1.3
+
+    Args:
+        cache_path (str):
+            The path to the cache file.
+
+    Returns:
+        dict:
+        The cache entry, or ``None`` if there isn't a usable one.
+    """
+    if not cache_path:
+        return None
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as fp:
+            entry = json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(entry, dict) or not isinstance(entry.get('body'), dict):
+        return None
+
+    return entry
+
+
+def _write_cache(
+    cache_path: Optional[str],
+    entry: Dict[str, Any],
+) -> None:
+    """Store a PyPI response in the cache.
+
+    The file is written atomically, so concurrent lookups never see a
+    partial entry. Errors writing the cache are ignored.
+
+    Version Added:
+        1.3
+
+    Args:
+        cache_path (str):
+            The path to the cache file.
+
+        entry (dict):
+            The cache entry to write.
+    """
+    if not cache_path:
+        return
+
+    cache_dir = os.path.dirname(cache_path)
+    temp_path: Optional[str] = None
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile('w',
+                                         encoding='utf-8',
+                                         dir=cache_dir,
+                                         suffix='.tmp',
+                                         delete=False) as fp:
+            temp_path = fp.name
+            json.dump(entry, fp)
+
+        os.replace(temp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        debug(f'Unable to write PyPI cache file {cache_path}: {e}')
+
+        # Don't leave a partial entry behind in the cache directory.
+        if temp_path:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+
+def _wait_for_retry(
+    attempt: int,
+) -> None:
+    """Wait before retrying a failed request.
+
+    This backs off exponentially, starting at 1 second.
+
+    Version Added:
+        1.3
+
+    Args:
+        attempt (int):
+            The 1-based number of the attempt that failed.
+    """
+    time.sleep(2 ** (attempt - 1))
+
+
+def _urlopen_with_retries(
+    request: Request,
+) -> Any:
+    """Open a URL, retrying on temporary HTTP errors.
+
+    Rate limiting (HTTP 429) and server errors are retried up to
+    :py:data:`_MAX_FETCH_ATTEMPTS` times in total. Any other error is raised
+    immediately.
+
+    Version Added:
+        1.3
+
+    Args:
+        request (urllib.request.Request):
+            The request to open.
+
+    Returns:
+        object:
+        The response from :py:func:`urllib.request.urlopen`.
+
+    Raises:
+        urllib.error.HTTPError:
+            The request failed, or kept failing after all retries.
+    """
+    attempt = 1
+
+    while True:
+        try:
+            return urlopen(request)
+        except HTTPError as e:
+            if (e.code not in _RETRY_HTTP_CODES or
+                attempt >= _MAX_FETCH_ATTEMPTS):
+                raise
+
+            debug(f'Received HTTP error {e.code} for {request.full_url} '
+                  f'(attempt {attempt} of {_MAX_FETCH_ATTEMPTS}). '
+                  f'Retrying...')
+
+        _wait_for_retry(attempt)
+        attempt += 1
+
+
+def _get_package_url(
+    *,
+    package_name: str,
+    pypi_url: str,
+) -> str:
+    """Return the URL for a package's information on PyPI.
+
+    Version Added:
+        1.3
+
+    Args:
+        package_name (str):
+            The name of the package.
+
+        pypi_url (str):
+            The URL to the PyPI server.
+
+    Returns:
+        str:
+        The URL to the package's JSON information.
+    """
+    return urljoin(pypi_url, f'pypi/{package_name}/json')
+
+
+def fetch_package_info(
+    *,
+    package_name: str,
+    pypi_url: str = 'https://pypi.org',
+) -> Optional[Dict[str, Any]]:
+    """Return the raw information on a package from PyPI.
+
+    This doesn't depend on the target system, so it can be fetched while
+    system information is still being gathered. The result can then be
+    passed to :py:func:`find_package_version_info`.
+
+    Responses are cached in :file:`~/.cache/rbinstall/pypi/` and revalidated
+    using ``ETag`` and ``Last-Modified`` on later runs.
+
+    Version Added:
+        1.3
+
+    Args:
+        package_name (str):
+            The name of the package.
+
+        pypi_url (str, optional):
+            The optional URL to the PyPI server.
+
+    Returns:
+        dict:
+        The decoded package information, or ``None`` if the package was not
+        found.
+
+    Raises:
+        rbinstall.errors.InstallerError:
+            The package information could not be fetched.
+    """
+    url = _get_package_url(package_name=package_name,
+                           pypi_url=pypi_url)
+
+    request = Request(url)
+    request.add_header('Accept', 'application/json')
+    request.add_header('User-Agent', USER_AGENT)
+
+    cache_path = _get_cache_path(url)
+    cache_entry = _read_cache(cache_path)
+    rsp: Any = None
+
+    if cache_entry:
+        etag = cache_entry.get('etag')
+        last_modified = cache_entry.get('last_modified')
+
+        if etag:
+            request.add_header('If-None-Match', etag)
+
+        if last_modified:
+            request.add_header('If-Modified-Since', last_modified)
+
+        if (not etag and
+            not last_modified and
+            time.time() - cache_entry.get('fetched', 0) < CACHE_TTL_SECS):
+            # There's nothing to revalidate with, but this was fetched
+            # recently enough to trust.
+            debug(f'Using cached package information for "{package_name}".')
+            rsp = cache_entry['body']
+
+    if rsp is None:
+        debug(f'Fetching package information for "{package_name}" from '
+              f'{url}...')
+
+        # Each lookup uses its own connection. Lookups run concurrently, and
+        # urlopen() handles the http_proxy/https_proxy environment variables
+        # that installs often depend on.
+        try:
+            try:
+                with _urlopen_with_retries(request) as fp:
+                    rsp = json.loads(fp.read())
+
+                    _write_cache(cache_path, {
+                        'body': rsp,
+                        'etag': fp.headers.get('ETag'),
+                        'fetched': time.time(),
+                        'last_modified': fp.headers.get('Last-Modified'),
+                    })
+            except HTTPError as e:
+                if e.code == 304 and cache_entry:
+                    debug(f'Cached package information for "{package_name}" '
+                          f'is up-to-date.')
+                    rsp = cache_entry['body']
+                else:
+                    error_data = e.read()
+                    debug(f'Received HTTP error {e.code}: {error_data!r}')
+
+                    if e.code == 404:
+                        return None
+
+                    raise
+        except Exception as e:
+            raise InstallerError(
+                f'Could not fetch information on the {package_name} '
+                f'packages (at {url}). Check your network and HTTP(S) proxy '
+                f'environment variables (`http_proxy` and `https_proxy`). '
+                f'The error was: {e}'
+            )
+
+    return rsp
+
+
+def find_package_version_info(
     *,
+    package_info: Dict[str, Any],
     system_info: SystemInfo,
     package_name: str,
     target_version: str = 'latest',
     pypi_url: str = 'https://pypi.org',
 ) -> Optional[PackageVersionInfo]:
-    """Return information on a version of a package.
+    """Return the nearest compatible version from fetched package information.
 
-    This will return some basic information that can be used to verify that
-    the version of Review Board is available and can be installed on the
-    target system.
+    Version Added:
+        1.3
 
     Args:
+        package_info (dict):
+            The package information returned by :py:func:`fetch_package_info`.
+
         system_info (rbinstall.state.SystemInfo):
             Information on the target system.
 
@@ -83,44 +455,28 @@ def get_package_version_info(
             compatible with the current system.
 
         pypi_url (str, optional):
-            The optional URL to the PyPI server.
+            The optional URL to the PyPI server, used for error messages.
 
     Returns:
         PackageVersionInfo:
         Information on the nearest compatible version of Review Board.
-    """
-    url = urljoin(pypi_url, f'pypi/{package_name}/json')
-
-    request = Request(url)
-    request.add_header('Accept', 'application/json')
-    request.add_header('User-Agent', USER_AGENT)
-
-    debug(f'Fetching package information for "{package_name}" from {url}...')
-
-    try:
-        try:
-            with urlopen(request) as fp:
-                rsp = json.load(fp)
-        except HTTPError as e:
-            error_data = e.read()
-            debug(f'Received HTTP error {e.code}: {error_data!r}')
-
-            if e.code == 404:
-                return None
-
-            raise
-    except Exception as e:
-        raise InstallerError(
-            f'Could not fetch information on the {package_name} packages '
-            f'(at {url}). Check your network and HTTP(S) proxy environment '
-            f'variables (`http_proxy` and `https_proxy`). The error was: '
-            f'{e}'
-        )
 
+    Raises:
+        rbinstall.errors.InstallerError:
+            The package information could not be parsed.
+    """
+    # These are only needed once there's a response to check, and are
+    # imported here to keep them off the import path of modules that only
+    # need PackageVersionInfo.
+    from packaging.specifiers import SpecifierSet
+    from packaging.version import InvalidVersion, parse as parse_version
+
+    url = _get_package_url(package_name=package_name,
+                           pypi_url=pypi_url)
     python_version = '%s.%s.%s' % system_info['system_python_version'][:3]
 
     try:
-        rsp_info = rsp['info']
+        rsp_info = package_info['info']
         latest_version = rsp_info['version']
         parsed_latest_version = parse_version(latest_version)
 
@@ -129,46 +485,93 @@ def get_package_version_info(
 
         parsed_target_version = parse_version(target_version)
 
-        # Find the nearest compatible version of Review Board.
-        rsp_releases = sorted(
-            rsp['releases'].items(),
-            key=lambda pair: parse_version(pair[0]),
-            reverse=True)
+        rsp_releases = package_info['releases']
 
         debug(f'Found {len(rsp_releases)} possible releases for '
               f'"{package_name}".')
 
-        for rsp_version, rsp_release in rsp_releases:
-            if not rsp_release:
-                continue
-
-            parsed_rsp_version = parse_version(rsp_version)
+        python_compat: Dict[str, bool] = {}
 
-            if parsed_rsp_version > parsed_target_version:
-                continue
+        def _get_release_requires_python(
+            rsp_release: Optional[List[Dict[str, Any]]],
+        ) -> Optional[str]:
+            # Return the release's Python requirement if it can be installed,
+            # or None if it's empty, yanked, or incompatible.
+            if not rsp_release:
+                return None
 
             rsp_dist = rsp_release[0]
 
             if rsp_dist.get('yanked'):
-                continue
-
-            requires_python = rsp_dist.get('requires_python', '')
-
-            if (not requires_python or
-                python_version in SpecifierSet(requires_python)):
-                # This is a compatible version. Return it.
-                debug(f'Found compatible release for "{package_name}": '
-                      f'{parsed_rsp_version}')
-
-                return {
-                    'is_latest': parsed_rsp_version == parsed_latest_version,
-                    'is_requested':
-                        parsed_rsp_version == parsed_target_version,
-                    'latest_version': latest_version,
-                    'package_name': rsp_info['name'],
-                    'requires_python': requires_python,
-                    'version': rsp_version,
-                }
+                return None
+
+            # PyPI reports releases without a Python requirement as null.
+            requires_python = rsp_dist.get('requires_python') or ''
+
+            if requires_python:
+                # Most releases share the same Python requirements, so each
+                # specifier is only checked once.
+                try:
+                    is_compatible = python_compat[requires_python]
+                except KeyError:
+                    is_compatible = (python_version in
+                                     SpecifierSet(requires_python))
+                    python_compat[requires_python] = is_compatible
+
+                if not is_compatible:
+                    return None
+
+            return requires_python
+
+        best: Optional[Tuple[Version, str, str]] = None
+
+        # The requested version (or the latest) usually exists and is
+        # compatible, in which case there's no need to look at the rest.
+        requires_python = _get_release_requires_python(
+            rsp_releases.get(target_version))
+
+        if requires_python is not None:
+            best = (parsed_target_version, target_version, requires_python)
+        else:
+            # Find the nearest compatible version of Review Board.
+            #
+            # This is a single pass over the releases, keeping the highest
+            # compatible version found so far.
+            for rsp_version, rsp_release in rsp_releases.items():
+                # Empty releases are skipped before parsing, and any legacy
+                # version strings that can't be parsed are ignored.
+                if not rsp_release:
+                    continue
+
+                try:
+                    parsed_rsp_version = parse_version(rsp_version)
+                except InvalidVersion:
+                    continue
+
+                if (parsed_rsp_version > parsed_target_version or
+                    (best is not None and parsed_rsp_version <= best[0])):
+                    continue
+
+                requires_python = _get_release_requires_python(rsp_release)
+
+                if requires_python is not None:
+                    best = (parsed_rsp_version, rsp_version, requires_python)
+
+        if best is not None:
+            parsed_rsp_version, rsp_version, requires_python = best
+
+            # This is a compatible version. Return it.
+            debug(f'Found compatible release for "{package_name}": '
+                  f'{parsed_rsp_version}')
+
+            return {
+                'is_latest': parsed_rsp_version == parsed_latest_version,
+                'is_requested': parsed_rsp_version == parsed_target_version,
+                'latest_version': latest_version,
+                'package_name': rsp_info['name'],
+                'requires_python': requires_python,
+                'version': rsp_version,
+            }
 
         debug(f'Could not find compatible release for "{package_name}".')
 
@@ -180,3 +583,56 @@ def get_package_version_info(
             f'https://pypi.org/ or an issue with the requested version of '
             f'Review Board. The error was: {e}'
         )
+
+
+def get_package_version_info(
+    *,
+    system_info: SystemInfo,
+    package_name: str,
+    target_version: str = 'latest',
+    pypi_url: str = 'https://pypi.org',
+) -> Optional[PackageVersionInfo]:
+    """Return information on a version of a package.
+
+    This will return some basic information that can be used to verify that
+    the version of Review Board is available and can be installed on the
+    target system.
+
+    This is a convenience wrapper around :py:func:`fetch_package_info` and
+    :py:func:`find_package_version_info`.
+
+    Version Changed:
+        1.3:
+        Added caching of PyPI responses.
+
+    Args:
+        system_info (rbinstall.state.SystemInfo):
+            Information on the target system.
+
+        package_name (str):
+            The name of the package.
+
+        target_version (str, optional):
+            The target version of Review Board requested.
+
+            An older version may be returned, if the target version is not
+            compatible with the current system.
+
+        pypi_url (str, optional):
+            The optional URL to the PyPI server.
+
+    Returns:
+        PackageVersionInfo:
+        Information on the nearest compatible version of Review Board.
+    """
+    package_info = fetch_package_info(package_name=package_name,
+                                      pypi_url=pypi_url)
+
+    if package_info is None:
+        return None
+
+    return find_package_version_info(package_info=package_info,
+                                     system_info=system_info,
+                                     package_name=package_name,
+                                     target_version=target_version,
+                                     pypi_url=pypi_url)
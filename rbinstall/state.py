@@ -8,18 +8,18 @@ Version Added:
 from __future__ import annotations
 
 import os
-import platform
 import re
-import subprocess
+import shutil
 import sys
 import sysconfig
-from typing import Dict, List, Optional, Set, TYPE_CHECKING, Tuple
+from typing import (Dict, FrozenSet, List, Optional, Set, TYPE_CHECKING,
+                    Tuple)
 
 from typing_extensions import NotRequired, TypedDict
 
 from rbinstall.errors import InstallerError
 from rbinstall.install_methods import InstallMethodType
-from rbinstall.process import debug
+from rbinstall.process import DEBUG, debug
 
 if TYPE_CHECKING:
     from rbinstall.install_steps import InstallSteps
@@ -30,9 +30,92 @@ DOCS_URL = 'https://www.reviewboard.org/docs/manual/latest/'
 INSTALLATION_DOCS_URL = f'{DOCS_URL}admin/installation/'
 
 
+#: A mapping of :py:data:`sys.platform` values to system names.
+#:
+#: These match the names returned by :py:func:`platform.system`.
+#:
+#: Version Added:
+#:     1.3
+_SYSTEM_NAMES: Dict[str, str] = {
+    'darwin': 'Darwin',
+    'linux': 'Linux',
+}
+
+
+#: A regex matching a variable assignment line in an :file:`os-release` file.
+#:
+#: The value is captured in group 2 if double-quoted, group 3 if
+#: single-quoted, or group 4 if unquoted. Only one of these will match, and
+#: it will always be the last group in the match.
+#:
+#: Version Added:
+#:     1.3
+_OS_RELEASE_LINE_RE = re.compile(
+    r'''^([A-Za-z0-9_]+)=(?:"(.*)"|'(.*)'|(.*))$''',
+    re.MULTILINE)
+
+
+#: A regex matching escaped characters in an :file:`os-release` value.
+#:
+#: Version Added:
+#:     1.3
+_OS_RELEASE_UNESCAPE_RE = re.compile(r'\\([\\\$\"\'`])')
+
+
+#: Escape sequences in an :file:`os-release` value, other than ``\\``.
+#:
+#: If a value doesn't contain an escaped backslash, these can be replaced
+#: one at a time without affecting each other. Otherwise,
+#: :py:data:`_OS_RELEASE_UNESCAPE_RE` is used.
+#:
+#: Version Added:
+#:     1.3
+_OS_RELEASE_SIMPLE_ESCAPES: Tuple[str, ...] = (
+    '\\$',
+    '\\"',
+    "\\'",
+    '\\`',
+)
+
+
+#: Default install methods for groups of Linux distribution families.
+#:
+#: These are checked in order, and the first group sharing a family with
+#: the distribution determines its install method.
+#:
+#: Version Added:
+#:     1.3
+_LINUX_FAMILY_INSTALL_METHODS: Tuple[
+    Tuple[FrozenSet[str], InstallMethodType],
+    ...
+] = (
+    (frozenset({'debian'}), InstallMethodType.APT),
+    (frozenset({'fedora', 'rhel'}), InstallMethodType.YUM),
+    (frozenset({'arch'}), InstallMethodType.PACMAN),
+    (frozenset({'opensuse'}), InstallMethodType.ZYPPER),
+)
+
+
+#: Standard Homebrew installation prefixes.
+#:
+#: These are the defaults for Apple Silicon and Intel Macs, respectively.
+#:
+#: Version Added:
+#:     1.3
+_BREW_PREFIXES: Tuple[str, ...] = (
+    '/opt/homebrew',
+    '/usr/local',
+)
+
+
 class SystemInfo(TypedDict):
     """Information on the current system.
 
+    This is built once per run by :py:func:`get_system_info` and is only
+    read after that. Like the rest of the installer state, it's a plain
+    dictionary, so it can be logged, compared in tests, and stored in
+    :py:class:`InstallState` as-is.
+
     Version Added:
         1.0
     """
@@ -167,6 +250,11 @@ def get_system_info() -> SystemInfo:
         The path to the :file:`os-release` file for the system, when the
         system is "Linux".
 
+    This reads files and may run :command:`brew`, and the result depends on
+    the environment at the time of the call. It's not cached. Callers should
+    call it once and pass the result along, as the installer does through
+    :py:class:`InstallState`.
+
     Version Added:
         1.0
 
@@ -180,11 +268,16 @@ def get_system_info() -> SystemInfo:
     """
     debug('Fetching information on the current system...')
 
-    system_info: SystemInfo
     system_install_method: Optional[InstallMethodType]
+    distro_info: Optional[Dict[str, str]] = None
 
-    system = os.environ.get('RBINSTALL_FORCE_SYSTEM') or platform.system()
-    arch = os.environ.get('RBINSTALL_FORCE_ARCH') or platform.machine()
+    # sys.platform and os.uname() are used instead of the platform module.
+    # They provide the same information for supported systems without any
+    # extra probing.
+    system = (os.environ.get('RBINSTALL_FORCE_SYSTEM') or
+              _SYSTEM_NAMES.get(sys.platform, sys.platform))
+    arch = (os.environ.get('RBINSTALL_FORCE_ARCH') or
+            (os.uname().machine if hasattr(os, 'uname') else ''))
 
     paths: Dict[str, str] = {}
 
@@ -192,10 +285,10 @@ def get_system_info() -> SystemInfo:
     system_python_exe = (
         os.environ.get('RBINSTALL_FORCE_SYSTEM_PYTHON_EXE') or
         getattr(sys, '_base_executable', None) or
-        os.path.join(sysconfig.get_config_var('BINDIR'), 'python')
+        os.path.join(sysconfig.get_config_var('BINDIR') or '', 'python')
     )
     system_python_version: Tuple[int, int, int, str, int] = \
-        tuple(sys.version_info)  # type: ignore
+        sys.version_info[:5]
 
     if system == 'Linux':
         # This is a Linux system.
@@ -230,9 +323,10 @@ def get_system_info() -> SystemInfo:
         if id_like:
             families.update(id_like.split())
 
-        families_str = ', '.join(sorted(families))
-
-        debug(f'Linux families = {families_str}')
+        # The sorted list of families is only needed for display, so it's
+        # only built if it will be shown.
+        if DEBUG:
+            debug('Linux families = %s' % ', '.join(sorted(families)))
 
         # Determine the install methods enabled for this distro.
         debug('Determining the default install method...')
@@ -241,6 +335,8 @@ def get_system_info() -> SystemInfo:
         debug(f'Install method = {system_install_method!r}')
 
         if not system_install_method:
+            families_str = ', '.join(sorted(families))
+
             raise InstallerError(
                 f"The Review Board installer doesn't support installing on "
                 f"this family of Linux ({families_str}). Please contact "
@@ -249,30 +345,17 @@ def get_system_info() -> SystemInfo:
                 f"{INSTALLATION_DOCS_URL} for instructions."
             )
 
-        distro_name = distro_info.get('NAME')
-
-        # Build the system information.
-        system_info = {
-            'arch': arch,
-            'bootstrap_python_exe': bootstrap_python_exe,
-            'distro_families': families,
-            'distro_full_name': distro_info.get('PRETTY_NAME') or distro_name,
-            'distro_id': distro_id,
-            'distro_name': distro_name,
-            'paths': paths,
-            'system': system,
-            'system_install_method': system_install_method,
-            'system_python_exe': system_python_exe,
-            'system_python_version': system_python_version,
-            'version': distro_info.get('VERSION_ID') or '',
-        }
+        version = distro_info.get('VERSION_ID') or ''
     elif system == 'Darwin':
         # This is a macOS system.
         #
         # On macOS, we can use brew to install dependencies.
         debug('Found macOS. Please note, Brew is required.')
 
-        mac_ver = platform.mac_ver()
+        # This is only needed on macOS.
+        from platform import mac_ver as get_mac_ver
+
+        mac_ver = get_mac_ver()
 
         if not mac_ver[0]:
             raise InstallerError(
@@ -283,17 +366,9 @@ def get_system_info() -> SystemInfo:
             )
 
         # Determine if brew is available.
-        try:
-            brew_prefix = (
-                subprocess.check_output(['brew', '--prefix'])
-                .strip()
-                .decode('utf-8')
-            )
-            system_install_method = InstallMethodType.BREW
+        brew_prefix = _get_brew_prefix()
 
-            debug(f'Brew is available at {brew_prefix}')
-            paths['brew'] = brew_prefix
-        except (FileNotFoundError, subprocess.CalledProcessError):
+        if not brew_prefix:
             debug('Brew is not installed.')
 
             raise InstallerError(
@@ -303,16 +378,12 @@ def get_system_info() -> SystemInfo:
                 f"instructions."
             )
 
-        system_info = {
-            'arch': arch,
-            'bootstrap_python_exe': bootstrap_python_exe,
-            'paths': paths,
-            'system': system,
-            'system_install_method': system_install_method,
-            'system_python_exe': system_python_exe,
-            'system_python_version': system_python_version,
-            'version': mac_ver[0],
-        }
+        system_install_method = InstallMethodType.BREW
+
+        debug(f'Brew is available at {brew_prefix}')
+        paths['brew'] = brew_prefix
+
+        version = mac_ver[0]
     else:
         # This is an incompatible system.
         raise InstallerError(
@@ -321,14 +392,87 @@ def get_system_info() -> SystemInfo:
             f'method. See {INSTALLATION_DOCS_URL} for instructions.'
         )
 
+    # Build the system information shared by all systems, and then add
+    # anything specific to the Linux distribution.
+    system_info: SystemInfo = {
+        'arch': arch,
+        'bootstrap_python_exe': bootstrap_python_exe,
+        'paths': paths,
+        'system': system,
+        'system_install_method': system_install_method,
+        'system_python_exe': system_python_exe,
+        'system_python_version': system_python_version,
+        'version': version,
+    }
+
+    if distro_info is not None:
+        distro_name = distro_info.get('NAME')
+
+        system_info.update({
+            'distro_families': families,
+            'distro_full_name': distro_info.get('PRETTY_NAME') or distro_name,
+            'distro_id': distro_id,
+            'distro_name': distro_name,
+        })
+
     debug('System info: %r' % (system_info,))
 
     return system_info
 
 
+def _get_brew_prefix() -> Optional[str]:
+    """Return the installation prefix for Homebrew.
+
+    This avoids running :command:`brew` where possible. It checks, in order:
+
+    1. :envvar:`HOMEBREW_PREFIX`, which is set by ``brew shellenv``.
+    2. The standard prefixes for Apple Silicon and Intel Macs.
+    3. The output of :command:`brew --prefix`, for custom installs found
+       in :envvar:`PATH`.
+
+    Version Added:
+        1.3
+
+    Returns:
+        str:
+        The Homebrew prefix, or ``None`` if Homebrew isn't installed.
+    """
+    brew_prefixes = list(_BREW_PREFIXES)
+    env_brew_prefix = os.environ.get('HOMEBREW_PREFIX')
+
+    if env_brew_prefix:
+        brew_prefixes.insert(0, env_brew_prefix)
+
+    for brew_prefix in brew_prefixes:
+        if os.path.isfile(os.path.join(brew_prefix, 'bin', 'brew')):
+            return brew_prefix
+
+    # Only run brew if it's actually in the path. This avoids spawning a
+    # process just to find out it's not installed.
+    brew_path = shutil.which('brew')
+
+    if not brew_path:
+        return None
+
+    import subprocess
+
+    try:
+        return (
+            subprocess.check_output([brew_path, '--prefix'])
+            .strip()
+            .decode('utf-8')
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
 def get_linux_distro_info() -> Dict[str, str]:
     """Return information on the Linux distribution.
 
+    This reads and parses the :file:`os-release` file on every call. It's
+    called once by :py:func:`get_system_info`, and the results are passed
+    along in the :py:class:`SystemInfo` used for package matching.
+
     Version Added:
         1.0
 
@@ -341,17 +485,8 @@ def get_linux_distro_info() -> Dict[str, str]:
     #       logic.
     distro_info: Dict[str, str] = {}
 
-    # As per the freedesktop.org standard, and the Python logic for parsing
-    # this, we need to handle values with optional single or double quotes,
-    # and we need to manage special escaping rules.
     os_release_paths: List[str]
 
-    line_re = re.compile(
-        '^(?P<name>[a-zA-Z0-9_]+)=(?P<quote>[\"\']?)'
-        '(?P<value>.*)(?P=quote)$'
-    )
-    unescape_re = re.compile(r'\\([\\\$\"\'`])')
-
     # NOTE: This is primarily for debugging and testing.
     custom_os_release_file = os.environ.get('RBINSTALL_OS_RELEASE_FILE')
 
@@ -367,19 +502,37 @@ def get_linux_distro_info() -> Dict[str, str]:
           f'{os_release_paths!r})')
 
     for path in os_release_paths:
-        if os.path.exists(path):
-            debug(f'Parsing {path}...')
+        try:
+            fp = open(path, 'r')
+        except FileNotFoundError:
+            continue
+
+        debug(f'Parsing {path}...')
+
+        with fp:
+            data = fp.read()
+
+        # As per the freedesktop.org standard, and the Python logic for
+        # parsing this, values may have optional single or double quotes,
+        # and we need to manage special escaping rules. All assignments are
+        # found in a single pass over the file, and values are only
+        # unescaped if there's something to unescape.
+        for m in _OS_RELEASE_LINE_RE.finditer(data):
+            assert m.lastindex is not None
+            value = m[m.lastindex]
 
-            with open(path, 'r') as fp:
-                for line in fp.readlines():
-                    m = line_re.match(line)
+            if '\\' in value:
+                if '\\\\' in value:
+                    value = _OS_RELEASE_UNESCAPE_RE.sub(r'\1', value)
+                else:
+                    for escape in _OS_RELEASE_SIMPLE_ESCAPES:
+                        if escape in value:
+                            value = value.replace(escape, escape[1])
 
-                    if m:
-                        distro_info[m.group('name')] = \
-                            unescape_re.sub(r'\1', m.group('value'))
+            distro_info[m[1]] = value
 
-            # We found a file, so bail. We don't want to read more.
-            break
+        # We found a file, so bail. We don't want to read more.
+        break
 
     return distro_info
 
@@ -401,13 +554,8 @@ def get_default_linux_install_method(
         rbinstall.install_methods.InstallMethodType:
         The default install method, or ``None`` if not found.
     """
-    if 'debian' in families:
-        return InstallMethodType.APT
-    elif 'rhel' in families or 'fedora' in families:
-        return InstallMethodType.YUM
-    elif 'arch' in families:
-        return InstallMethodType.PACMAN
-    elif 'opensuse' in families:
-        return InstallMethodType.ZYPPER
+    for group_families, install_method in _LINUX_FAMILY_INSTALL_METHODS:
+        if not families.isdisjoint(group_families):
+            return install_method
 
     return None
@@ -0,0 +1,149 @@
+"""Unit tests for rbinstall.distro_info.
+
+Version Added:
+    1.3
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import TYPE_CHECKING
+from unittest import TestCase
+
+from rbinstall.distro_info import _build_package_index, get_package_candidates
+from rbinstall.install_methods import InstallMethodType
+
+if TYPE_CHECKING:
+    from rbinstall.distro_info import _Packages
+
+
+class BuildPackageIndexTests(TestCase):
+    """Unit tests for _build_package_index().
+
+    Version Added:
+        1.3
+    """
+
+    def test_leaves_packages_unchanged(self) -> None:
+        """Testing _build_package_index leaves the packages unchanged"""
+        packages: _Packages = {
+            'test': {
+                'system': [
+                    {
+                        'match': {
+                            'distro_ids': {'RHEL'},
+                            'systems': {'Linux'},
+                        },
+                        'install_method': InstallMethodType.YUM,
+                        'packages': ['package1'],
+                        'skip_packages': ['package2'],
+                    },
+                    {
+                        'install_method': InstallMethodType.SHELL,
+                        'commands': [
+                            ['yum', 'install', '-y', 'epel-release'],
+                        ],
+                    },
+                ],
+            },
+        }
+        expected_packages = copy.deepcopy(packages)
+        candidate = packages['test']['system'][0]
+        match_info = candidate['match']
+        distro_ids = match_info['distro_ids']
+        package_names = candidate['packages']
+
+        index = _build_package_index(packages)
+
+        self.assertEqual(packages, expected_packages)
+        self.assertIs(packages['test']['system'][0], candidate)
+        self.assertIs(candidate['match'], match_info)
+        self.assertIs(match_info['distro_ids'], distro_ids)
+        self.assertIs(candidate['packages'], package_names)
+
+        # The index has its own normalized copies.
+        records = index[('test', 'system', 'linux', 'rhel')]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0].distro_ids, frozenset({'rhel'}))
+        self.assertEqual(records[0].packages, ['package1'])
+        self.assertIsNot(records[0].packages, package_names)
+        self.assertEqual(records[1].commands,
+                         [['yum', 'install', '-y', 'epel-release']])
+
+
+class GetPackageCandidatesTests(TestCase):
+    """Unit tests for get_package_candidates().
+
+    Version Added:
+        1.3
+    """
+
+    def test_with_system(self) -> None:
+        """Testing get_package_candidates with system"""
+        candidates = get_package_candidates(category='memcached',
+                                            package_type='system',
+                                            system='Linux')
+
+        self.assertEqual(len(candidates), 1)
+        self.assertEqual(candidates[0].packages, ['memcached'])
+
+    def test_with_system_case_insensitive(self) -> None:
+        """Testing get_package_candidates with system is case-insensitive"""
+        self.assertEqual(
+            get_package_candidates(category='memcached',
+                                   package_type='system',
+                                   system='LINUX'),
+            get_package_candidates(category='memcached',
+                                   package_type='system',
+                                   system='Linux'))
+
+    def test_with_unknown_system(self) -> None:
+        """Testing get_package_candidates with unknown system"""
+        self.assertEqual(
+            get_package_candidates(category='memcached',
+                                   package_type='system',
+                                   system='Windows'),
+            ())
+
+        # Unrestricted candidates still apply.
+        candidates = get_package_candidates(category='git',
+                                            package_type='system',
+                                            system='Windows')
+
+        self.assertEqual(len(candidates), 1)
+        self.assertEqual(candidates[0].packages, ['git'])
+
+    def test_with_distro_id(self) -> None:
+        """Testing get_package_candidates with distro_id"""
+        candidates = get_package_candidates(category='cvs',
+                                            package_type='system',
+                                            system='Linux',
+                                            distro_id='rhel')
+
+        self.assertEqual(len(candidates), 1)
+        self.assertEqual(candidates[0].distro_ids, {'rhel'})
+
+    def test_with_unknown_distro_id(self) -> None:
+        """Testing get_package_candidates with unknown distro_id"""
+        self.assertEqual(
+            get_package_candidates(category='cvs',
+                                   package_type='system',
+                                   system='Linux',
+                                   distro_id='unknown'),
+            ())
+
+    def test_without_distro_id(self) -> None:
+        """Testing get_package_candidates without distro_id"""
+        candidates = get_package_candidates(category='cvs',
+                                            package_type='system',
+                                            system='Linux')
+
+        self.assertEqual(len(candidates), 2)
+
+    def test_with_unknown_category(self) -> None:
+        """Testing get_package_candidates with unknown category"""
+        self.assertEqual(
+            get_package_candidates(category='unknown',
+                                   package_type='system',
+                                   system='Linux'),
+            ())
@@ -0,0 +1,45 @@
+"""Unit tests for rbinstall.errors.
+
+Version Added:
+    1.3
+"""
+
+from __future__ import annotations
+
+from unittest import TestCase
+
+from rbinstall.errors import RunCommandError
+
+
+class RunCommandErrorTests(TestCase):
+    """Unit tests for RunCommandError.
+
+    Version Added:
+        1.3
+    """
+
+    def test_args(self) -> None:
+        """Testing RunCommandError.args"""
+        e = RunCommandError(command=['pip', 'install', 'ReviewBoard[s3]'],
+                            exit_code=1)
+
+        self.assertEqual(e.args, (['pip', 'install', 'ReviewBoard[s3]'], 1))
+
+    def test_str(self) -> None:
+        """Testing RunCommandError.__str__"""
+        e = RunCommandError(command=['pip', 'install', 'ReviewBoard[s3]'],
+                            exit_code=1)
+
+        self.assertEqual(
+            str(e),
+            "Error executing `pip install 'ReviewBoard[s3]'`: exit code 1")
+
+    def test_repr(self) -> None:
+        """Testing RunCommandError.__repr__"""
+        e = RunCommandError(command=['pip', 'install', 'ReviewBoard[s3]'],
+                            exit_code=1)
+
+        self.assertEqual(
+            repr(e),
+            "RunCommandError(command=['pip', 'install', 'ReviewBoard[s3]'], "
+            "exit_code=1)")
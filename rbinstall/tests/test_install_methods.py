@@ -6,8 +6,8 @@ Version Added:
 
 from __future__ import annotations
 
-import re
 from io import BytesIO
+from typing import List
 from unittest import TestCase
 from urllib.request import urlopen
 
@@ -19,6 +19,71 @@ from rbinstall.process import run
 from rbinstall.state import InstallState
 
 
+#: The install state used for all tests.
+_INSTALL_STATE: InstallState = {
+    'create_sitedir': False,
+    'dry_run': False,
+    'install_reviewbot_extension': True,
+    'install_reviewbot_worker': True,
+    'install_powerpack': True,
+    'powerpack_version_info': {
+        'is_latest': True,
+        'is_requested': True,
+        'latest_version': '5.2.2',
+        'package_name': 'ReviewBoardPowerPack',
+        'requires_python': '>=3.7',
+        'version': '5.2.2',
+    },
+    'reviewboard_version_info': {
+        'is_latest': True,
+        'is_requested': True,
+        'latest_version': '6.0',
+        'package_name': 'ReviewBoard',
+        'requires_python': '>=3.8',
+        'version': '6.0',
+    },
+    'reviewbot_extension_version_info': {
+        'is_latest': True,
+        'is_requested': True,
+        'latest_version': '4.0',
+        'package_name': 'reviewbot-extension',
+        'requires_python': '>=3.8',
+        'version': '4.0',
+    },
+    'reviewbot_worker_version_info': {
+        'is_latest': True,
+        'is_requested': True,
+        'latest_version': '4.0',
+        'package_name': 'reviewbot-worker',
+        'requires_python': '>=3.8',
+        'version': '4.0',
+    },
+    'sitedir_path': '/var/www/reviewboard',
+    'steps': [],
+    'system_info': {
+        'arch': 'amd64',
+        'bootstrap_python_exe': '/path/to/bootstrap/python',
+        'paths': {},
+        'system_install_method': InstallMethodType.APT,
+        'system': 'Linux',
+        'system_python_exe': '/usr/bin/python',
+        'system_python_version': (3, 11, 0, '', 0),
+        'version': '1.2.3',
+    },
+    'unattended_install': False,
+    'venv_path': '/path/to/venv',
+    'venv_pip_exe': '/path/to/venv/bin/pip',
+    'venv_python_exe': '/path/to/venv/bin/python',
+}
+
+
+#: The script returned when faking a remote Python script download.
+_REMOTE_PYSCRIPT = (
+    b'import sys\n'
+    b'sys.exit(0)\n'
+)
+
+
 class RunInstallMethodTests(kgb.SpyAgency, TestCase):
     """Unit tests for run_install_method().
 
@@ -26,217 +91,123 @@ class RunInstallMethodTests(kgb.SpyAgency, TestCase):
         1.0
     """
 
-    INSTALL_STATE: InstallState = {
-        'create_sitedir': False,
-        'dry_run': False,
-        'install_reviewbot_extension': True,
-        'install_reviewbot_worker': True,
-        'install_powerpack': True,
-        'powerpack_version_info': {
-            'is_latest': True,
-            'is_requested': True,
-            'latest_version': '5.2.2',
-            'package_name': 'ReviewBoardPowerPack',
-            'requires_python': '>=3.7',
-            'version': '5.2.2',
-        },
-        'reviewboard_version_info': {
-            'is_latest': True,
-            'is_requested': True,
-            'latest_version': '6.0',
-            'package_name': 'ReviewBoard',
-            'requires_python': '>=3.8',
-            'version': '6.0',
-        },
-        'reviewbot_extension_version_info': {
-            'is_latest': True,
-            'is_requested': True,
-            'latest_version': '4.0',
-            'package_name': 'reviewbot-extension',
-            'requires_python': '>=3.8',
-            'version': '4.0',
-        },
-        'reviewbot_worker_version_info': {
-            'is_latest': True,
-            'is_requested': True,
-            'latest_version': '4.0',
-            'package_name': 'reviewbot-worker',
-            'requires_python': '>=3.8',
-            'version': '4.0',
-        },
-        'sitedir_path': '/var/www/reviewboard',
-        'steps': [],
-        'system_info': {
-            'arch': 'amd64',
-            'bootstrap_python_exe': '/path/to/bootstrap/python',
-            'paths': {},
-            'system_install_method': InstallMethodType.APT,
-            'system': 'Linux',
-            'system_python_exe': '/usr/bin/python',
-            'system_python_version': (3, 11, 0, '', 0),
-            'version': '1.2.3',
-        },
-        'unattended_install': False,
-        'venv_path': '/path/to/venv',
-        'venv_pip_exe': '/path/to/venv/bin/pip',
-        'venv_python_exe': '/path/to/venv/bin/python',
-    }
-
-    def test_with_apt(self) -> None:
-        """Testing run_install_method with APT"""
-        self.spy_on(run, call_original=False)
-
-        run_install_method(install_state=self.INSTALL_STATE,
-                           install_method=InstallMethodType.APT,
-                           args=['package1', 'package2'])
+    def setUp(self) -> None:
+        super().setUp()
 
-        self.assertSpyCalledWith(
-            run,
-            ['apt-get', 'install', '-y', 'package1', 'package2'])
+        # Commands are never actually run. Tests covering errors set
+        # this to make every command fail.
+        self.run_fails = False
 
-    def test_with_apt_and_error(self) -> None:
-        """Testing run_install_method with APT and error"""
         @self.spy_for(run)
         def _run(command, **kwargs):
-            raise RunCommandError(command=command,
-                                  exit_code=1)
-
-        message = re.escape(
-            'There was an error installing one or more packages (package1 '
-            'package2). The command that failed was: `apt-get install -y '
-            'package1 package2`. The error was: Error executing `apt-get '
-            'install -y package1 package2`: exit code 1'
-        )
+            if self.run_fails:
+                raise RunCommandError(command=command,
+                                      exit_code=1)
 
-        with self.assertRaisesRegex(InstallPackageError, message) as ctx:
-            run_install_method(install_state=self.INSTALL_STATE,
-                               install_method=InstallMethodType.APT,
-                               args=['package1', 'package2'])
+    def test_with_apt(self) -> None:
+        """Testing run_install_method with APT"""
+        self._check_install_method(
+            install_method=InstallMethodType.APT,
+            args=['package1', 'package2'],
+            expected_command=[
+                'apt-get', 'install', '-y', '-o', 'Dpkg::Use-Pty=0',
+                'package1', 'package2',
+            ],
+            env={
+                'DEBIAN_FRONTEND': 'noninteractive',
+            })
 
-        e = ctx.exception
-        self.assertEqual(e.install_method, InstallMethodType.APT)
-        self.assertEqual(e.install_state, self.INSTALL_STATE)
-        self.assertEqual(e.packages, ['package1', 'package2'])
+    def test_with_apt_and_error(self) -> None:
+        """Testing run_install_method with APT and error"""
+        self._check_install_method_error(
+            install_method=InstallMethodType.APT,
+            args=['package1', 'package2'],
+            expected_message=(
+                'There was an error installing one or more packages '
+                '(package1 package2). The command that failed was: '
+                '`apt-get install -y -o Dpkg::Use-Pty=0 package1 package2`. '
+                'The error was: Error executing `apt-get install -y -o '
+                'Dpkg::Use-Pty=0 package1 package2`: exit code 1'
+            ),
+            expected_packages=['package1', 'package2'])
 
     def test_with_apt_build_dep(self) -> None:
         """Testing run_install_method with APT_BUILD_DEP"""
-        self.spy_on(run, call_original=False)
-
-        run_install_method(install_state=self.INSTALL_STATE,
-                           install_method=InstallMethodType.APT_BUILD_DEP,
-                           args=['package1', 'package2'])
-
-        self.assertSpyCalledWith(
-            run,
-            ['apt-get', 'build-dep', '-y', 'package1', 'package2'])
+        self._check_install_method(
+            install_method=InstallMethodType.APT_BUILD_DEP,
+            args=['package1', 'package2'],
+            expected_command=[
+                'apt-get', 'build-dep', '-y', '-o', 'Dpkg::Use-Pty=0',
+                'package1', 'package2',
+            ],
+            env={
+                'DEBIAN_FRONTEND': 'noninteractive',
+            })
 
     def test_with_apt_build_dep_and_error(self) -> None:
         """Testing run_install_method with APT_BUILD_DEP and error"""
-        @self.spy_for(run)
-        def _run(command, **kwargs):
-            raise RunCommandError(command=command,
-                                  exit_code=1)
-
-        message = re.escape(
-            'There was an error installing one or more packages (package1 '
-            'package2). The command that failed was: `apt-get build-dep -y '
-            'package1 package2`. The error was: Error executing `apt-get '
-            'build-dep -y package1 package2`: exit code 1'
-        )
-
-        with self.assertRaisesRegex(InstallPackageError, message) as ctx:
-            run_install_method(install_state=self.INSTALL_STATE,
-                               install_method=InstallMethodType.APT_BUILD_DEP,
-                               args=['package1', 'package2'])
-
-        e = ctx.exception
-        self.assertEqual(e.install_method, InstallMethodType.APT_BUILD_DEP)
-        self.assertEqual(e.install_state, self.INSTALL_STATE)
-        self.assertEqual(e.packages, ['package1', 'package2'])
+        self._check_install_method_error(
+            install_method=InstallMethodType.APT_BUILD_DEP,
+            args=['package1', 'package2'],
+            expected_message=(
+                'There was an error installing one or more packages '
+                '(package1 package2). The command that failed was: '
+                '`apt-get build-dep -y -o Dpkg::Use-Pty=0 package1 '
+                'package2`. The error was: Error executing `apt-get '
+                'build-dep -y -o Dpkg::Use-Pty=0 package1 package2`: exit '
+                'code 1'
+            ),
+            expected_packages=['package1', 'package2'])
 
     def test_with_brew(self) -> None:
         """Testing run_install_method with BREW"""
-        self.spy_on(run, call_original=False)
-
-        run_install_method(install_state=self.INSTALL_STATE,
-                           install_method=InstallMethodType.BREW,
-                           args=['package1', 'package2'])
-
-        self.assertSpyCalledWith(
-            run,
-            ['brew', 'install', 'package1', 'package2'])
+        self._check_install_method(
+            install_method=InstallMethodType.BREW,
+            args=['package1', 'package2'],
+            expected_command=['brew', 'install', 'package1', 'package2'])
 
     def test_with_brew_and_error(self) -> None:
         """Testing run_install_method with BREW and error"""
-        @self.spy_for(run)
-        def _run(command, **kwargs):
-            raise RunCommandError(command=command,
-                                  exit_code=1)
-
-        message = re.escape(
-            'There was an error installing one or more packages (package1 '
-            'package2). The command that failed was: `brew install package1 '
-            'package2`. The error was: Error executing `brew install '
-            'package1 package2`: exit code 1'
-        )
-
-        with self.assertRaisesRegex(InstallPackageError, message) as ctx:
-            run_install_method(install_state=self.INSTALL_STATE,
-                               install_method=InstallMethodType.BREW,
-                               args=['package1', 'package2'])
-
-        e = ctx.exception
-        self.assertEqual(e.install_method, InstallMethodType.BREW)
-        self.assertEqual(e.install_state, self.INSTALL_STATE)
-        self.assertEqual(e.packages, ['package1', 'package2'])
+        self._check_install_method_error(
+            install_method=InstallMethodType.BREW,
+            args=['package1', 'package2'],
+            expected_message=(
+                'There was an error installing one or more packages '
+                '(package1 package2). The command that failed was: `brew '
+                'install package1 package2`. The error was: Error executing '
+                '`brew install package1 package2`: exit code 1'
+            ),
+            expected_packages=['package1', 'package2'])
 
     def test_with_pacman(self) -> None:
         """Testing run_install_method with PACMAN"""
-        self.spy_on(run, call_original=False)
-
-        run_install_method(install_state=self.INSTALL_STATE,
-                           install_method=InstallMethodType.PACMAN,
-                           args=['package1', 'package2'])
-
-        self.assertSpyCalledWith(
-            run,
-            ['pacman', '-S', '--noconfirm', 'package1', 'package2'])
+        self._check_install_method(
+            install_method=InstallMethodType.PACMAN,
+            args=['package1', 'package2'],
+            expected_command=[
+                'pacman', '-S', '--noconfirm', 'package1', 'package2',
+            ])
 
     def test_with_pacman_and_error(self) -> None:
         """Testing run_install_method with PACMAN and error"""
-        @self.spy_for(run)
-        def _run(command, **kwargs):
-            raise RunCommandError(command=command,
-                                  exit_code=1)
-
-        message = re.escape(
-            'There was an error installing one or more packages (package1 '
-            'package2). The command that failed was: `pacman -S --noconfirm '
-            'package1 package2`. The error was: Error executing `pacman -S '
-            '--noconfirm package1 package2`: exit code 1'
-        )
-
-        with self.assertRaisesRegex(InstallPackageError, message) as ctx:
-            run_install_method(install_state=self.INSTALL_STATE,
-                               install_method=InstallMethodType.PACMAN,
-                               args=['package1', 'package2'])
-
-        e = ctx.exception
-        self.assertEqual(e.install_method, InstallMethodType.PACMAN)
-        self.assertEqual(e.install_state, self.INSTALL_STATE)
-        self.assertEqual(e.packages, ['package1', 'package2'])
+        self._check_install_method_error(
+            install_method=InstallMethodType.PACMAN,
+            args=['package1', 'package2'],
+            expected_message=(
+                'There was an error installing one or more packages '
+                '(package1 package2). The command that failed was: `pacman '
+                '-S --noconfirm package1 package2`. The error was: Error '
+                'executing `pacman -S --noconfirm package1 package2`: exit '
+                'code 1'
+            ),
+            expected_packages=['package1', 'package2'])
 
     def test_with_pip(self) -> None:
         """Testing run_install_method with PIP"""
-        self.spy_on(run, call_original=False)
-
-        run_install_method(install_state=self.INSTALL_STATE,
-                           install_method=InstallMethodType.PIP,
-                           args=['package1', 'package2'])
-
-        self.assertSpyCalledWith(
-            run,
-            [
+        self._check_install_method(
+            install_method=InstallMethodType.PIP,
+            args=['package1', 'package2'],
+            expected_command=[
                 '/path/to/venv/bin/pip', 'install',
                 '--disable-pip-version-check',
                 '--no-python-version-warning',
@@ -245,60 +216,42 @@ class RunInstallMethodTests(kgb.SpyAgency, TestCase):
 
     def test_with_pip_and_error(self) -> None:
         """Testing run_install_method with PIP and error"""
-        @self.spy_for(run)
-        def _run(command, **kwargs):
-            raise RunCommandError(command=command,
-                                  exit_code=1)
-
-        message = re.escape(
-            'There was an error installing one or more packages (package1 '
-            'package2). The command that failed was: `/path/to/venv/bin/pip '
-            'install --disable-pip-version-check --no-python-version-warning '
-            'package1 package2`. The error was: Error executing '
-            '`/path/to/venv/bin/pip install --disable-pip-version-check '
-            '--no-python-version-warning package1 package2`: exit code 1'
-        )
-
-        with self.assertRaisesRegex(InstallPackageError, message) as ctx:
-            run_install_method(install_state=self.INSTALL_STATE,
-                               install_method=InstallMethodType.PIP,
-                               args=['package1', 'package2'])
-
-        e = ctx.exception
-        self.assertEqual(e.install_method, InstallMethodType.PIP)
-        self.assertEqual(e.install_state, self.INSTALL_STATE)
-        self.assertEqual(e.packages, ['package1', 'package2'])
+        self._check_install_method_error(
+            install_method=InstallMethodType.PIP,
+            args=['package1', 'package2'],
+            expected_message=(
+                'There was an error installing one or more packages '
+                '(package1 package2). The command that failed was: '
+                '`/path/to/venv/bin/pip install --disable-pip-version-check '
+                '--no-python-version-warning package1 package2`. The error '
+                'was: Error executing `/path/to/venv/bin/pip install '
+                '--disable-pip-version-check --no-python-version-warning '
+                'package1 package2`: exit code 1'
+            ),
+            expected_packages=['package1', 'package2'])
 
     def test_with_remote_pyscript(self) -> None:
         """Testing run_install_method with REMOTE_PYSCRIPT"""
-        self.spy_on(run, call_original=False)
-        self.spy_on(
-            urlopen,
-            op=kgb.SpyOpReturn(BytesIO(
-                b'import sys\n'
-                b'sys.exit(0)\n'
-            )))
-
-        run_install_method(install_state=self.INSTALL_STATE,
+        self.spy_on(urlopen,
+                    op=kgb.SpyOpReturn(BytesIO(_REMOTE_PYSCRIPT)))
+
+        run_install_method(install_state=_INSTALL_STATE,
                            install_method=InstallMethodType.REMOTE_PYSCRIPT,
                            args=['https://install.example.com'])
 
-        self.assertSpyCalled(urlopen)
-        self.assertSpyCalled(run)
+        self.assertSpyCalledWith(urlopen, 'https://install.example.com')
+        self.assertSpyCalledWith(
+            run,
+            displayed_command=[
+                'curl', 'https://install.example.com', '|',
+                '/path/to/venv/bin/python',
+            ])
 
     def test_with_remote_pyscript_and_error(self) -> None:
         """Testing run_install_method with REMOTE_PYSCRIPT and error"""
-        @self.spy_for(run)
-        def _run(command, **kwargs):
-            raise RunCommandError(command=command,
-                                  exit_code=1)
-
-        self.spy_on(
-            urlopen,
-            op=kgb.SpyOpReturn(BytesIO(
-                b'import sys\n'
-                b'sys.exit(1)\n'
-            )))
+        self.run_fails = True
+        self.spy_on(urlopen,
+                    op=kgb.SpyOpReturn(BytesIO(_REMOTE_PYSCRIPT)))
 
         message = (
             r'There was an error installing one or more packages '
@@ -309,7 +262,7 @@ class RunInstallMethodTests(kgb.SpyAgency, TestCase):
 
         with self.assertRaisesRegex(InstallPackageError, message) as ctx:
             run_install_method(
-                install_state=self.INSTALL_STATE,
+                install_state=_INSTALL_STATE,
                 install_method=InstallMethodType.REMOTE_PYSCRIPT,
                 args=['https://install.example.com'])
 
@@ -318,164 +271,177 @@ class RunInstallMethodTests(kgb.SpyAgency, TestCase):
 
         e = ctx.exception
         self.assertEqual(e.install_method, InstallMethodType.REMOTE_PYSCRIPT)
-        self.assertEqual(e.install_state, self.INSTALL_STATE)
+        self.assertIs(e.install_state, _INSTALL_STATE)
         self.assertEqual(e.packages, ['https://install.example.com'])
 
     def test_with_reviewboard_extra(self) -> None:
         """Testing run_install_method with REVIEWBOARD_EXTRA"""
-        self.spy_on(run, call_original=False)
-
-        run_install_method(install_state=self.INSTALL_STATE,
-                           install_method=InstallMethodType.REVIEWBOARD_EXTRA,
-                           args=['package1', 'package2'])
-
-        self.assertSpyCalledWith(
-            run,
-            [
+        self._check_install_method(
+            install_method=InstallMethodType.REVIEWBOARD_EXTRA,
+            args=['package1', 'package2'],
+            expected_command=[
                 '/path/to/venv/bin/pip', 'install',
                 '--disable-pip-version-check',
                 '--no-python-version-warning',
-                'ReviewBoard[package1]', 'ReviewBoard[package2]',
+                'ReviewBoard[package1,package2]',
             ])
 
     def test_with_reviewboard_extra_and_error(self) -> None:
         """Testing run_install_method with REVIEWBOARD_EXTRA and error"""
-        @self.spy_for(run)
-        def _run(command, **kwargs):
-            raise RunCommandError(command=command,
-                                  exit_code=1)
-
-        message = re.escape(
-            'There was an error installing one or more packages '
-            '(ReviewBoard[package1] ReviewBoard[package2]). The command that '
-            'failed was: `/path/to/venv/bin/pip install '
-            '--disable-pip-version-check --no-python-version-warning '
-            'ReviewBoard[package1] ReviewBoard[package2]`. The error was: '
-            'Error executing `/path/to/venv/bin/pip install '
-            '--disable-pip-version-check --no-python-version-warning '
-            'ReviewBoard[package1] ReviewBoard[package2]`: exit code 1'
-        )
-
-        with self.assertRaisesRegex(InstallPackageError, message) as ctx:
-            run_install_method(
-                install_state=self.INSTALL_STATE,
-                install_method=InstallMethodType.REVIEWBOARD_EXTRA,
-                args=['package1', 'package2'])
-
-        e = ctx.exception
-        self.assertEqual(e.install_method, InstallMethodType.REVIEWBOARD_EXTRA)
-        self.assertEqual(e.install_state, self.INSTALL_STATE)
-        self.assertEqual(e.packages,
-                         ['ReviewBoard[package1]', 'ReviewBoard[package2]'])
+        self._check_install_method_error(
+            install_method=InstallMethodType.REVIEWBOARD_EXTRA,
+            args=['package1', 'package2'],
+            expected_message=(
+                'There was an error installing one or more packages '
+                '(ReviewBoard[package1,package2]). The command that failed '
+                'was: `/path/to/venv/bin/pip install '
+                '--disable-pip-version-check --no-python-version-warning '
+                "'ReviewBoard[package1,package2]'`. The error was: Error "
+                'executing `/path/to/venv/bin/pip install '
+                '--disable-pip-version-check --no-python-version-warning '
+                "'ReviewBoard[package1,package2]'`: exit code 1"
+            ),
+            expected_packages=['ReviewBoard[package1,package2]'])
 
     def test_with_shell(self) -> None:
         """Testing run_install_method with SHELL"""
-        self.spy_on(run, call_original=False)
-
-        run_install_method(install_state=self.INSTALL_STATE,
-                           install_method=InstallMethodType.SHELL,
-                           args=['some-command', '--arg1', '--arg2'])
-
-        self.assertSpyCalledWith(
-            run,
-            [
-                'some-command',
-                '--arg1',
-                '--arg2',
-            ])
+        self._check_install_method(
+            install_method=InstallMethodType.SHELL,
+            args=['some-command', '--arg1', '--arg2'],
+            expected_command=['some-command', '--arg1', '--arg2'])
 
     def test_with_shell_and_error(self) -> None:
         """Testing run_install_method with SHELL and error"""
-        @self.spy_for(run)
-        def _run(command, **kwargs):
-            raise RunCommandError(command=command,
-                                  exit_code=1)
-
-        message = re.escape(
-            'There was an error executing the command `some-command --arg1 '
-            '--arg2`. The error was: Error executing `some-command --arg1 '
-            '--arg2`: exit code 1'
-        )
-
-        with self.assertRaisesRegex(InstallPackageError, message) as ctx:
-            run_install_method(
-                install_state=self.INSTALL_STATE,
-                install_method=InstallMethodType.SHELL,
-                args=['some-command', '--arg1', '--arg2'])
-
-        e = ctx.exception
-        self.assertEqual(e.install_method, InstallMethodType.SHELL)
-        self.assertEqual(e.install_state, self.INSTALL_STATE)
-        self.assertEqual(e.packages, [])
+        self._check_install_method_error(
+            install_method=InstallMethodType.SHELL,
+            args=['some-command', '--arg1', '--arg2'],
+            expected_message=(
+                'There was an error executing the command `some-command '
+                '--arg1 --arg2`. The error was: Error executing '
+                '`some-command --arg1 --arg2`: exit code 1'
+            ),
+            expected_packages=[])
 
     def test_with_yum(self) -> None:
         """Testing run_install_method with YUM"""
-        self.spy_on(run, call_original=False)
-
-        run_install_method(install_state=self.INSTALL_STATE,
-                           install_method=InstallMethodType.YUM,
-                           args=['package1', 'package2'])
-
-        self.assertSpyCalledWith(
-            run,
-            ['yum', 'install', '-y', 'package1', 'package2'])
+        self._check_install_method(
+            install_method=InstallMethodType.YUM,
+            args=['package1', 'package2'],
+            expected_command=['yum', 'install', '-y', 'package1', 'package2'])
 
     def test_with_yum_and_error(self) -> None:
         """Testing run_install_method with YUM and error"""
-        @self.spy_for(run)
-        def _run(command, **kwargs):
-            raise RunCommandError(command=command,
-                                  exit_code=1)
-
-        message = re.escape(
-            'There was an error installing one or more packages (package1 '
-            'package2). The command that failed was: `yum install -y '
-            'package1 package2`. The error was: Error executing '
-            '`yum install -y package1 package2`: exit code 1'
-        )
-
-        with self.assertRaisesRegex(InstallPackageError, message) as ctx:
-            run_install_method(install_state=self.INSTALL_STATE,
-                               install_method=InstallMethodType.YUM,
-                               args=['package1', 'package2'])
-
-        e = ctx.exception
-        self.assertEqual(e.install_method, InstallMethodType.YUM)
-        self.assertEqual(e.install_state, self.INSTALL_STATE)
-        self.assertEqual(e.packages, ['package1', 'package2'])
+        self._check_install_method_error(
+            install_method=InstallMethodType.YUM,
+            args=['package1', 'package2'],
+            expected_message=(
+                'There was an error installing one or more packages '
+                '(package1 package2). The command that failed was: `yum '
+                'install -y package1 package2`. The error was: Error '
+                'executing `yum install -y package1 package2`: exit code 1'
+            ),
+            expected_packages=['package1', 'package2'])
 
     def test_with_zypper(self) -> None:
         """Testing run_install_method with ZYPPER"""
-        self.spy_on(run, call_original=False)
-
-        run_install_method(install_state=self.INSTALL_STATE,
-                           install_method=InstallMethodType.ZYPPER,
-                           args=['package1', 'package2'])
-
-        self.assertSpyCalledWith(
-            run,
-            ['zypper', 'install', '-y', 'package1', 'package2'])
+        self._check_install_method(
+            install_method=InstallMethodType.ZYPPER,
+            args=['package1', 'package2'],
+            expected_command=[
+                'zypper', 'install', '-y', 'package1', 'package2',
+            ])
 
     def test_with_zypper_and_error(self) -> None:
         """Testing run_install_method with ZYPPER and error"""
-        @self.spy_for(run)
-        def _run(command, **kwargs):
-            raise RunCommandError(command=command,
-                                  exit_code=1)
-
-        message = re.escape(
-            'There was an error installing one or more packages (package1 '
-            'package2). The command that failed was: `zypper install -y '
-            'package1 package2`. The error was: Error executing '
-            '`zypper install -y package1 package2`: exit code 1'
-        )
-
-        with self.assertRaisesRegex(InstallPackageError, message) as ctx:
-            run_install_method(install_state=self.INSTALL_STATE,
-                               install_method=InstallMethodType.ZYPPER,
-                               args=['package1', 'package2'])
+        self._check_install_method_error(
+            install_method=InstallMethodType.ZYPPER,
+            args=['package1', 'package2'],
+            expected_message=(
+                'There was an error installing one or more packages '
+                '(package1 package2). The command that failed was: `zypper '
+                'install -y package1 package2`. The error was: Error '
+                'executing `zypper install -y package1 package2`: exit code 1'
+            ),
+            expected_packages=['package1', 'package2'])
+
+    def _check_install_method(
+        self,
+        *,
+        install_method: InstallMethodType,
+        args: List[str],
+        expected_command: List[str],
+        **expected_run_kwargs,
+    ) -> None:
+        """Check that an install method runs the expected command.
+
+        Version Added:
+            1.3
+
+        Args:
+            install_method (rbinstall.install_methods.InstallMethodType):
+                The install method to run.
+
+            args (list of str):
+                The arguments to pass to the install method.
+
+            expected_command (list of str):
+                The command expected to be passed to
+                :py:func:`~rbinstall.process.run`.
+
+            **expected_run_kwargs (dict):
+                Additional keyword arguments expected to be passed to
+                :py:func:`~rbinstall.process.run`.
+
+        Raises:
+            AssertionError:
+                The command was not run as expected.
+        """
+        run_install_method(install_state=_INSTALL_STATE,
+                           install_method=install_method,
+                           args=args)
+
+        self.assertSpyCalledWith(run, expected_command,
+                                 **expected_run_kwargs)
+
+    def _check_install_method_error(
+        self,
+        *,
+        install_method: InstallMethodType,
+        args: List[str],
+        expected_message: str,
+        expected_packages: List[str],
+    ) -> None:
+        """Check that an install method reports a failed command.
+
+        Version Added:
+            1.3
+
+        Args:
+            install_method (rbinstall.install_methods.InstallMethodType):
+                The install method to run.
+
+            args (list of str):
+                The arguments to pass to the install method.
+
+            expected_message (str):
+                The expected error message.
+
+            expected_packages (list of str):
+                The packages expected to be listed in the error.
+
+        Raises:
+            AssertionError:
+                The error was not raised as expected.
+        """
+        self.run_fails = True
+
+        with self.assertRaises(InstallPackageError) as ctx:
+            run_install_method(install_state=_INSTALL_STATE,
+                               install_method=install_method,
+                               args=args)
 
         e = ctx.exception
-        self.assertEqual(e.install_method, InstallMethodType.ZYPPER)
-        self.assertEqual(e.install_state, self.INSTALL_STATE)
-        self.assertEqual(e.packages, ['package1', 'package2'])
+        self.assertEqual(str(e), expected_message)
+        self.assertEqual(e.install_method, install_method)
+        self.assertIs(e.install_state, _INSTALL_STATE)
+        self.assertEqual(e.packages, expected_packages)
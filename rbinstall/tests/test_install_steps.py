@@ -6,17 +6,132 @@ Version Added:
 
 from __future__ import annotations
 
-from typing import Optional, Set, TYPE_CHECKING
+import copy
+from typing import AbstractSet, Optional, Sequence, TYPE_CHECKING
 from unittest import TestCase
 
+from rbinstall import distro_info
 from rbinstall.install_methods import InstallMethodType
-from rbinstall.install_steps import get_install_steps
+from rbinstall.install_steps import (_merge_install_steps,
+                                     get_install_package_steps,
+                                     get_install_steps)
 from rbinstall.state import get_default_linux_install_method
 
 if TYPE_CHECKING:
+    from rbinstall.distro_info import _Packages
+    from rbinstall.install_steps import InstallSteps
     from rbinstall.state import InstallState
 
 
+def _create_install_state(
+    *,
+    arch: str = 'x86_64',
+    system: str = 'Linux',
+    version: str = '',
+    distro_id: str = '',
+    distro_families: AbstractSet[str] = frozenset(),
+    install_method: Optional[InstallMethodType] = None,
+) -> InstallState:
+    """Return an install state for a target system.
+
+    Version Added:
+        1.3
+
+    Args:
+        arch (str, optional):
+            The architecture of the system.
+
+        system (str, optional):
+            The name of the system.
+
+        version (str, optional):
+            The version of the system or distribution.
+
+        distro_id (str, optional):
+            The ID of the Linux distribution.
+
+        distro_families (set of str, optional):
+            The Linux distribution families.
+
+        install_method (rbinstall.install_methods.InstallMethodType,
+                        optional):
+            The system's install method.
+
+            If not provided, the default for the Linux distribution
+            families will be used.
+
+    Returns:
+        rbinstall.state.InstallState:
+        The resulting install state.
+    """
+    # Each install state gets its own mutable copy of the families.
+    distro_families = set(distro_families)
+
+    if install_method is None:
+        install_method = get_default_linux_install_method(
+            families=distro_families)
+        assert install_method
+
+    return {
+        'create_sitedir': False,
+        'dry_run': False,
+        'install_reviewbot_extension': True,
+        'install_reviewbot_worker': True,
+        'install_powerpack': True,
+        'powerpack_version_info': {
+            'is_latest': True,
+            'is_requested': True,
+            'latest_version': '5.2.2',
+            'package_name': 'ReviewBoardPowerPack',
+            'requires_python': '>=3.7',
+            'version': '5.2.2',
+        },
+        'reviewboard_version_info': {
+            'is_latest': True,
+            'is_requested': True,
+            'latest_version': '6.0',
+            'package_name': 'ReviewBoard',
+            'requires_python': '>=3.8',
+            'version': '6.0',
+        },
+        'reviewbot_extension_version_info': {
+            'is_latest': True,
+            'is_requested': True,
+            'latest_version': '4.0',
+            'package_name': 'reviewbot-extension',
+            'requires_python': '>=3.8',
+            'version': '4.0',
+        },
+        'reviewbot_worker_version_info': {
+            'is_latest': True,
+            'is_requested': True,
+            'latest_version': '4.0',
+            'package_name': 'reviewbot-worker',
+            'requires_python': '>=3.8',
+            'version': '4.0',
+        },
+        'sitedir_path': '/var/www/reviewboard',
+        'steps': [],
+        'system_info': {
+            'arch': arch,
+            'bootstrap_python_exe': '/path/to/bootstrap/python',
+            'distro_id': distro_id,
+            'distro_families': distro_families,
+            'paths': {},
+            'system_install_method': install_method,
+            'system': system,
+            'system_python_exe': '/usr/bin/python',
+            'system_python_version': (3, 11, 0, '', 0),
+            'version': version,
+        },
+        'unattended_install': False,
+        'venv_path': '/path/to/venv',
+        'venv_pip_exe': '/path/to/venv/bin/pip',
+        'venv_python_exe': '/path/to/venv/bin/python',
+    }
+
+
+
 class GetInstallSteps(TestCase):
     """Unit tests for get_install_steps().
 
@@ -26,7 +141,7 @@ class GetInstallSteps(TestCase):
 
     maxDiff = None
 
-    VIRTUALENV_STEPS = [
+    VIRTUALENV_STEPS = (
         {
             'install_method': InstallMethodType.SHELL,
             'name': 'Creating Python virtual environment',
@@ -44,20 +159,26 @@ class GetInstallSteps(TestCase):
             'allow_fail': False,
             'install_method': InstallMethodType.PIP,
             'name': 'Installing Python packaging support',
-            'state': ['pip', 'setuptools', 'wheel'],
+            'state': [
+                'pip',
+                'setuptools',
+                'wheel',
+                '--no-binary=lxml',
+                'lxml',
+            ],
         },
-    ]
+    )
 
-    PYSVN_STEPS = [
+    PYSVN_STEPS = (
         {
             'allow_fail': False,
             'install_method': InstallMethodType.REMOTE_PYSCRIPT,
             'name': 'Installing service integrations',
             'state': ['https://pysvn.reviewboard.org'],
         },
-    ]
+    )
 
-    RB_STEPS = [
+    RB_STEPS = (
         {
             'install_method': InstallMethodType.PIP,
             'name': 'Installing Review Board packages',
@@ -80,9 +201,9 @@ class GetInstallSteps(TestCase):
                 'postgres',
             ],
         },
-    ]
+    )
 
-    COMMON_LINUX_X86_STEPS = [
+    COMMON_LINUX_X86_STEPS = (
         *VIRTUALENV_STEPS,
         *RB_STEPS,
         {
@@ -94,15 +215,15 @@ class GetInstallSteps(TestCase):
             ],
         },
         *PYSVN_STEPS,
-    ]
+    )
 
-    COMMON_LINUX_ARM64_STEPS = [
+    COMMON_LINUX_ARM64_STEPS = (
         *VIRTUALENV_STEPS,
         *RB_STEPS,
         *PYSVN_STEPS,
-    ]
+    )
 
-    COMMON_MACOS_X86_STEPS = [
+    COMMON_MACOS_X86_STEPS = (
         *VIRTUALENV_STEPS,
         *RB_STEPS,
         {
@@ -114,63 +235,214 @@ class GetInstallSteps(TestCase):
             ],
         },
         *PYSVN_STEPS,
-    ]
+    )
 
     COMMON_MACOS_ARM64_STEPS = COMMON_MACOS_X86_STEPS
 
-    def test_with_amazon_linux_2_x86_64(self) -> None:
-        """Testing get_install_steps with Amazon Linux 2 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='amzn',
-            distro_families={
-                'amzn',
-                'centos',
-                'fedora',
-                'rhel',
-            },
-            version='2')
+    #: The steps for installing system packages on openSUSE.
+    OPENSUSE_STEPS = (
+        {
+            'install_method': InstallMethodType.SHELL,
+            'name': 'Setting up support for packages',
+            'state': [
+                'zypper', 'install', '-y', '-t', 'pattern',
+                'devel_basis',
+            ],
+        },
+        {
+            'allow_fail': False,
+            'install_method': InstallMethodType.ZYPPER,
+            'name': 'Installing system packages',
+            'state': [
+                'gcc-c++',
+                'libffi-devel',
+                'libopenssl-devel',
+                'libxml2-devel',
+                'libxslt-devel',
+                'python3-devel',
+                'xmlsec1-devel',
+                'xmlsec1-openssl-devel',
+                'git',
+                'memcached',
+                'libmariadb-devel',
+                'subversion',
+                'subversion-devel',
+            ],
+        },
+    )
+
+    #: Build dependencies installed with YUM on all RHEL-based distributions.
+    YUM_BUILD_PACKAGES = (
+        'gcc',
+        'gcc-c++',
+        'libffi-devel',
+        'libxml2-devel',
+        'libxslt-devel',
+        'make',
+        'openssl-devel',
+        'patch',
+        'perl',
+        'python3-devel',
+        'libtool-ltdl-devel',
+    )
+
+    #: Build dependencies installed with APT on Debian and Ubuntu.
+    APT_BUILD_PACKAGES = (
+        'build-essential',
+        'libffi-dev',
+        'libjpeg-dev',
+        'libssl-dev',
+        'libxml2-dev',
+        'libxslt-dev',
+        'libxmlsec1-dev',
+        'libxmlsec1-openssl',
+        'patch',
+        'pkg-config',
+        'python3-dev',
+        'python3-pip',
+    )
+
+    #: The step for setting up DNF plugins on RHEL-compatible distributions.
+    DNF_PLUGINS_SETUP_STEPS = (
+        {
+            'install_method': InstallMethodType.SHELL,
+            'name': 'Setting up support for packages',
+            'state': [
+                'dnf', 'install', '-y', 'dnf-plugins-core',
+            ],
+        },
+    )
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'yum', 'groupinstall', '-y', 'Development Tools',
-                    ],
-                },
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
+    #: The step for enabling the CodeReady Linux Builder repository.
+    CRB_SETUP_STEPS = (
+        {
+            'install_method': InstallMethodType.SHELL,
+            'name': 'Setting up support for packages',
+            'state': [
+                'dnf', 'config-manager', '--set-enabled', 'crb',
+            ],
+        },
+    )
+
+    #: The step for enabling EPEL on CentOS Stream.
+    EPEL_NEXT_SETUP_STEPS = (
+        {
+            'install_method': InstallMethodType.SHELL,
+            'name': 'Setting up support for packages',
+            'state': [
+                'yum', 'install', '-y', 'epel-release',
+                'epel-next-release',
+            ],
+        },
+    )
+
+    #: The step for enabling EPEL on Rocky Linux.
+    EPEL_SETUP_STEPS = (
+        {
+            'install_method': InstallMethodType.SHELL,
+            'name': 'Setting up support for packages',
+            'state': [
+                'yum', 'install', '-y', 'epel-release',
+            ],
+        },
+    )
+
+    #: The steps for installing system packages with YUM.
+    YUM_PACKAGES_STEPS = (
+        {
+            'allow_fail': False,
+            'install_method': InstallMethodType.YUM,
+            'name': 'Installing system packages',
+            'state': [
+                *YUM_BUILD_PACKAGES,
+                'xmlsec1-devel',
+                'xmlsec1-openssl-devel',
+                'cvs',
+                'git',
+                'memcached',
+                'mariadb-connector-c-devel',
+                'subversion',
+                'subversion-devel',
+            ],
+        },
+    )
+
+    #: The steps for installing system packages with YUM, without xmlsec1.
+    YUM_NO_XMLSEC_PACKAGES_STEPS = (
+        {
+            'allow_fail': False,
+            'install_method': InstallMethodType.YUM,
+            'name': 'Installing system packages',
+            'state': [
+                *YUM_BUILD_PACKAGES,
+                'cvs',
+                'git',
+                'memcached',
+                'mariadb-connector-c-devel',
+                'subversion',
+                'subversion-devel',
+            ],
+        },
+    )
+
+    #: The steps for installing system packages with APT on Debian.
+    APT_DEBIAN_PACKAGES_STEPS = (
+        {
+            'allow_fail': False,
+            'install_method': InstallMethodType.APT,
+            'name': 'Installing system packages',
+            'state': [
+                *APT_BUILD_PACKAGES,
+                'cvs',
+                'git',
+                'memcached',
+                'libmariadb-dev',
+                'subversion',
+                'libsvn-dev',
+            ],
+        },
+    )
 
-    def test_with_amazon_linux_2_aarch64(self) -> None:
-        """Testing get_install_steps with Amazon Linux 2 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
+    #: The steps for installing system packages with APT on Ubuntu.
+    APT_UBUNTU_PACKAGES_STEPS = (
+        {
+            'allow_fail': False,
+            'install_method': InstallMethodType.APT,
+            'name': 'Installing system packages',
+            'state': [
+                *APT_BUILD_PACKAGES,
+                'cvs',
+                'git',
+                'memcached',
+                'libmysqlclient-dev',
+                'subversion',
+                'libsvn-dev',
+            ],
+        },
+    )
+
+    #: Linux distribution families shared by several distributions.
+    CENTOS_FAMILIES = frozenset({'centos', 'fedora', 'rhel'})
+    DEBIAN_FAMILIES = frozenset({'debian'})
+    FEDORA_FAMILIES = frozenset({'fedora'})
+    RHEL_FAMILIES = frozenset({'fedora', 'rhel'})
+    ROCKY_FAMILIES = frozenset({'centos', 'fedora', 'rhel', 'rocky'})
+    UBUNTU_FAMILIES = frozenset({'debian', 'ubuntu'})
+
+    #: The architectures checked by default for each system.
+    ARCHS = ('aarch64', 'x86_64')
+
+    #: The steps ending every install, keyed by system and architecture.
+    COMMON_STEPS = {
+        ('Darwin', 'aarch64'): COMMON_MACOS_ARM64_STEPS,
+        ('Darwin', 'x86_64'): COMMON_MACOS_X86_STEPS,
+        ('Linux', 'aarch64'): COMMON_LINUX_ARM64_STEPS,
+        ('Linux', 'x86_64'): COMMON_LINUX_X86_STEPS,
+    }
+
+    def test_with_amazon_linux_2(self) -> None:
+        """Testing get_install_steps with Amazon Linux 2"""
+        self._check_install_steps(
             distro_id='amzn',
             distro_families={
                 'amzn',
@@ -178,11 +450,8 @@ class GetInstallSteps(TestCase):
                 'fedora',
                 'rhel',
             },
-            version='2')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
+            version='2',
+            expected_steps=[
                 {
                     'install_method': InstallMethodType.SHELL,
                     'name': 'Setting up support for packages',
@@ -195,16 +464,7 @@ class GetInstallSteps(TestCase):
                     'install_method': InstallMethodType.YUM,
                     'name': 'Installing system packages',
                     'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
+                        *self.YUM_BUILD_PACKAGES,
                         'cvs',
                         'git',
                         'memcached',
@@ -213,102 +473,30 @@ class GetInstallSteps(TestCase):
                         'subversion-devel',
                     ],
                 },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_amazon_linux_2023_x86_64(self) -> None:
-        """Testing get_install_steps with Amazon Linux 2023 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='amzn',
-            distro_families={
-                'amzn',
-                'fedora',
-            },
-            version='2023')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
             ])
 
-    def test_with_amazon_linux_2023_aarch64(self) -> None:
-        """Testing get_install_steps with Amazon Linux 2023 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
+    def test_with_amazon_linux_2023(self) -> None:
+        """Testing get_install_steps with Amazon Linux 2023"""
+        self._check_install_steps(
             distro_id='amzn',
             distro_families={
                 'amzn',
                 'fedora',
             },
-            version='2023')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
+            version='2023',
+            expected_steps=[
+                *self.YUM_NO_XMLSEC_PACKAGES_STEPS,
             ])
 
-    def test_with_archlinux_2023_x86_64(self) -> None:
-        """Testing get_install_steps with Arch Linux (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
+    def test_with_archlinux_2023(self) -> None:
+        """Testing get_install_steps with Arch Linux"""
+        self._check_install_steps(
             distro_id='arch',
             distro_families={
                 'arch',
             },
-            version='20231112.0.191179')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
+            version='20231112.0.191179',
+            expected_steps=[
                 {
                     'allow_fail': False,
                     'install_method': InstallMethodType.PACMAN,
@@ -317,6 +505,7 @@ class GetInstallSteps(TestCase):
                         'base-devel',
                         'libffi',
                         'libxml2',
+                        'libxslt',
                         'openssl',
                         'perl',
                         'xmlsec',
@@ -327,96 +516,200 @@ class GetInstallSteps(TestCase):
                         'subversion',
                     ],
                 },
-                *self.COMMON_LINUX_X86_STEPS,
             ])
 
-    def test_with_archlinux_2023_aarch64(self) -> None:
-        """Testing get_install_steps with Arch Linux (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='arch',
-            distro_families={
-                'arch',
-            },
-            version='20231112.0.191179')
+    def test_with_centos_stream_8(self) -> None:
+        """Testing get_install_steps with CentOS Stream 8"""
+        self._check_install_steps(
+            distro_id='centos',
+            distro_families=self.CENTOS_FAMILIES,
+            version='8',
+            expected_steps=[
+                *self.DNF_PLUGINS_SETUP_STEPS,
+                *self.CRB_SETUP_STEPS,
+                *self.EPEL_NEXT_SETUP_STEPS,
+                *self.YUM_NO_XMLSEC_PACKAGES_STEPS,
+            ])
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
+    def test_with_centos_stream_9(self) -> None:
+        """Testing get_install_steps with CentOS Stream 9"""
+        self._check_install_steps(
+            distro_id='centos',
+            distro_families=self.CENTOS_FAMILIES,
+            version='9',
+            expected_steps=[
+                *self.DNF_PLUGINS_SETUP_STEPS,
+                *self.CRB_SETUP_STEPS,
+                *self.EPEL_NEXT_SETUP_STEPS,
+                *self.YUM_PACKAGES_STEPS,
+            ])
+
+    def test_with_debian_11(self) -> None:
+        """Testing get_install_steps with Debian 11"""
+        self._check_install_steps(
+            distro_id='debian',
+            distro_families=self.DEBIAN_FAMILIES,
+            version='11 (bullseye)',
+            expected_steps=[
+                *self.APT_DEBIAN_PACKAGES_STEPS,
+            ])
+
+    def test_with_debian_12(self) -> None:
+        """Testing get_install_steps with Debian 12"""
+        self._check_install_steps(
+            distro_id='debian',
+            distro_families=self.DEBIAN_FAMILIES,
+            version='12 (bookworm)',
+            expected_steps=[
+                *self.APT_DEBIAN_PACKAGES_STEPS,
+            ])
+
+    def test_with_fedora_36(self) -> None:
+        """Testing get_install_steps with Fedora 36"""
+        self._check_install_steps(
+            distro_id='fedora',
+            distro_families=self.FEDORA_FAMILIES,
+            version='36',
+            expected_steps=[
+                *self.YUM_PACKAGES_STEPS,
+            ])
+
+    def test_with_fedora_37(self) -> None:
+        """Testing get_install_steps with Fedora 37"""
+        self._check_install_steps(
+            distro_id='fedora',
+            distro_families=self.FEDORA_FAMILIES,
+            version='37',
+            expected_steps=[
+                *self.YUM_PACKAGES_STEPS,
+            ])
+
+    def test_with_fedora_38(self) -> None:
+        """Testing get_install_steps with Fedora 38"""
+        self._check_install_steps(
+            distro_id='fedora',
+            distro_families=self.FEDORA_FAMILIES,
+            version='38',
+            expected_steps=[
+                *self.YUM_PACKAGES_STEPS,
+            ])
+
+    def test_with_fedora_39(self) -> None:
+        """Testing get_install_steps with Fedora 39"""
+        self._check_install_steps(
+            distro_id='fedora',
+            distro_families=self.FEDORA_FAMILIES,
+            version='39',
+            expected_steps=[
+                *self.YUM_PACKAGES_STEPS,
+            ])
+
+    def test_with_fedora_40(self) -> None:
+        """Testing get_install_steps with Fedora 40"""
+        self._check_install_steps(
+            distro_id='fedora',
+            distro_families=self.FEDORA_FAMILIES,
+            version='40',
+            expected_steps=[
+                *self.YUM_PACKAGES_STEPS,
+            ])
+
+    def test_with_install_state_unchanged(self) -> None:
+        """Testing get_install_steps does not modify the install state"""
+        install_state = _create_install_state(
+            arch='x86_64',
+            distro_id='rhel',
+            distro_families=self.RHEL_FAMILIES,
+            version='9.3')
+        expected_install_state = copy.deepcopy(install_state)
+
+        get_install_steps(install_state=install_state)
+
+        self.assertEqual(install_state, expected_install_state)
+
+    def test_with_macos_brew(self) -> None:
+        """Testing get_install_steps with macOS using Brew"""
+        self._check_install_steps(
+            system='Darwin',
+            version='14.1',
+            install_method=InstallMethodType.BREW,
+            expected_steps=[
                 {
                     'allow_fail': False,
-                    'install_method': InstallMethodType.PACMAN,
+                    'install_method': InstallMethodType.BREW,
                     'name': 'Installing system packages',
                     'state': [
-                        'base-devel',
-                        'libffi',
-                        'libxml2',
-                        'openssl',
-                        'perl',
-                        'xmlsec',
                         'cvs',
                         'git',
                         'memcached',
-                        'mariadb-libs',
+                        'mysql',
                         'subversion',
                     ],
                 },
-                *self.COMMON_LINUX_ARM64_STEPS,
             ])
 
-    def test_with_centos_stream_8_x86_64(self) -> None:
-        """Testing get_install_steps with CentOS Stream 8 (x86_64)"""
-        install_state = self.create_install_state(
+    def test_with_modified_results(self) -> None:
+        """Testing get_install_steps does not share results between calls"""
+        install_state = _create_install_state(
             arch='x86_64',
-            distro_id='centos',
+            distro_id='debian',
+            distro_families=self.DEBIAN_FAMILIES,
+            version='12 (bookworm)')
+
+        install_steps = get_install_steps(install_state=install_state)
+        expected_steps = copy.deepcopy(install_steps)
+
+        for install_step in install_steps:
+            install_step['state'].append('modified')
+
+        self.assertNotEqual(install_steps, expected_steps)
+
+        # A later call must not see the changes made above. Package lists
+        # come from a cached index, so they must be copied into the steps.
+        self.assertEqual(get_install_steps(install_state=install_state),
+                         expected_steps)
+
+    def test_with_opensuse_leap_15(self) -> None:
+        """Testing get_install_steps with openSUSE Leap 15"""
+        self._check_install_steps(
+            distro_id='opensuse-leap',
             distro_families={
-                'centos',
-                'fedora',
-                'rhel',
+                'opensuse',
+                'opensuse-leap',
+                'suse',
+            },
+            version='15.5',
+            expected_steps=[
+                *self.OPENSUSE_STEPS,
+            ])
+
+    def test_with_opensuse_tumbleweed(self) -> None:
+        """Testing get_install_steps with openSUSE Tumbleweed"""
+        self._check_install_steps(
+            distro_id='opensuse-tumbleweed',
+            distro_families={
+                'opensuse',
+                'opensuse-tumbleweed',
+                'suse',
             },
-            version='8')
+            version='20231215',
+            expected_steps=[
+                *self.OPENSUSE_STEPS,
+            ])
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'install', '-y', 'dnf-plugins-core',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'config-manager', '--set-enabled', 'crb',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'yum', 'install', '-y', 'epel-release',
-                        'epel-next-release',
-                    ],
-                },
+    def test_with_rhel_8(self) -> None:
+        """Testing get_install_steps with RHEL 8"""
+        self._check_install_steps(
+            distro_id='rhel',
+            distro_families=self.RHEL_FAMILIES,
+            version='8.9',
+            expected_steps=[
                 {
                     'allow_fail': False,
                     'install_method': InstallMethodType.YUM,
                     'name': 'Installing system packages',
                     'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
+                        *self.YUM_BUILD_PACKAGES,
                         'git',
                         'memcached',
                         'mariadb-connector-c-devel',
@@ -424,1811 +717,630 @@ class GetInstallSteps(TestCase):
                         'subversion-devel',
                     ],
                 },
-                *self.COMMON_LINUX_X86_STEPS,
             ])
 
-    def test_with_centos_stream_8_aarch64(self) -> None:
-        """Testing get_install_steps with CentOS Stream 8 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='centos',
-            distro_families={
-                'centos',
-                'fedora',
-                'rhel',
-            },
-            version='8')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'install', '-y', 'dnf-plugins-core',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'config-manager', '--set-enabled', 'crb',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'yum', 'install', '-y', 'epel-release',
-                        'epel-next-release',
-                    ],
-                },
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_centos_stream_9_x86_64(self) -> None:
-        """Testing get_install_steps with CentOS Stream 9 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='centos',
-            distro_families={
-                'centos',
-                'fedora',
-                'rhel',
-            },
-            version='9')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'install', '-y', 'dnf-plugins-core',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'config-manager', '--set-enabled', 'crb',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'yum', 'install', '-y', 'epel-release',
-                        'epel-next-release',
-                    ],
-                },
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
-
-    def test_with_centos_stream_9_aarch64(self) -> None:
-        """Testing get_install_steps with CentOS Stream 9 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='centos',
-            distro_families={
-                'centos',
-                'fedora',
-                'rhel',
-            },
-            version='9')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'install', '-y', 'dnf-plugins-core',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'config-manager', '--set-enabled', 'crb',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'yum', 'install', '-y', 'epel-release',
-                        'epel-next-release',
-                    ],
-                },
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_debian_11_x86_64(self) -> None:
-        """Testing get_install_steps with Debian 11 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='debian',
-            distro_families={
-                'debian',
-            },
-            version='11 (bullseye)')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmariadb-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
-
-    def test_with_debian_11_aarch64(self) -> None:
-        """Testing get_install_steps with Debian 11 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='debian',
-            distro_families={
-                'debian',
-            },
-            version='11 (bullseye)')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmariadb-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_debian_12_x86_64(self) -> None:
-        """Testing get_install_steps with Debian 12 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='debian',
-            distro_families={
-                'debian',
-            },
-            version='12 (bookworm)')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmariadb-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
-
-    def test_with_debian_12_aarch64(self) -> None:
-        """Testing get_install_steps with Debian 12 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='debian',
-            distro_families={
-                'debian',
-            },
-            version='12 (bookworm)')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmariadb-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_fedora_36_x86_64(self) -> None:
-        """Testing get_install_steps with Fedora 36 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='fedora',
-            distro_families={
-                'fedora',
-            },
-            version='36')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
-
-    def test_with_fedora_36_aarch64(self) -> None:
-        """Testing get_install_steps with Fedora 36 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='fedora',
-            distro_families={
-                'fedora',
-            },
-            version='36')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_fedora_37_x86_64(self) -> None:
-        """Testing get_install_steps with Fedora 37 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='fedora',
-            distro_families={
-                'fedora',
-            },
-            version='37')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
-
-    def test_with_fedora_37_aarch64(self) -> None:
-        """Testing get_install_steps with Fedora 37 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='fedora',
-            distro_families={
-                'fedora',
-            },
-            version='37')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_fedora_38_x86_64(self) -> None:
-        """Testing get_install_steps with Fedora 38 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='fedora',
-            distro_families={
-                'fedora',
-            },
-            version='38')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
-
-    def test_with_fedora_38_aarch64(self) -> None:
-        """Testing get_install_steps with Fedora 38 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='fedora',
-            distro_families={
-                'fedora',
-            },
-            version='38')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_fedora_39_x86_64(self) -> None:
-        """Testing get_install_steps with Fedora 39 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='fedora',
-            distro_families={
-                'fedora',
-            },
-            version='39')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
-
-    def test_with_fedora_39_aarch64(self) -> None:
-        """Testing get_install_steps with Fedora 39 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='fedora',
-            distro_families={
-                'fedora',
-            },
-            version='39')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_fedora_40_x86_64(self) -> None:
-        """Testing get_install_steps with Fedora 40 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='fedora',
-            distro_families={
-                'fedora',
-            },
-            version='40')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
-
-    def test_with_fedora_40_aarch64(self) -> None:
-        """Testing get_install_steps with Fedora 40 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='fedora',
-            distro_families={
-                'fedora',
-            },
-            version='40')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_macos_brew_x86_64(self) -> None:
-        """Testing get_install_steps with macOS using Brew (x86_64)"""
-        install_state = self.create_install_state(
-            system='Darwin',
-            arch='x86_64',
-            version='14.1',
-            install_method=InstallMethodType.BREW)
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.BREW,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mysql',
-                        'subversion',
-                    ],
-                },
-                *self.COMMON_MACOS_X86_STEPS,
+    def test_with_rhel_9(self) -> None:
+        """Testing get_install_steps with RHEL 9"""
+        # The CodeReady Builder repository is specific to the architecture.
+        for arch in self.ARCHS:
+            self._check_install_steps(
+                archs=[arch],
+                distro_id='rhel',
+                distro_families=self.RHEL_FAMILIES,
+                version='9.3',
+                expected_steps=[
+                    {
+                        'install_method': InstallMethodType.SHELL,
+                        'name': 'Setting up support for packages',
+                        'state': [
+                            'subscription-manager',
+                            'repos',
+                            '--enable',
+                            f'codeready-builder-for-rhel-9-{arch}-rpms',
+                        ],
+                    },
+                    {
+                        'install_method': InstallMethodType.SHELL,
+                        'name': 'Setting up support for packages',
+                        'state': [
+                            'dnf', 'install', '-y',
+                            ('https://dl.fedoraproject.org/pub/epel/'
+                             'epel-release-latest-9.noarch.rpm'),
+                        ],
+                    },
+                    *self.YUM_PACKAGES_STEPS,
+                ])
+
+    def test_with_rocky_linux_8(self) -> None:
+        """Testing get_install_steps with Rocky Linux 8"""
+        self._check_install_steps(
+            distro_id='rocky',
+            distro_families=self.ROCKY_FAMILIES,
+            version='8.9',
+            expected_steps=[
+                *self.DNF_PLUGINS_SETUP_STEPS,
+                *self.EPEL_SETUP_STEPS,
+                *self.YUM_NO_XMLSEC_PACKAGES_STEPS,
             ])
 
-    def test_with_macos_brew_aarch64(self) -> None:
-        """Testing get_install_steps with macOS using Brew (aarch64)"""
-        install_state = self.create_install_state(
-            system='Darwin',
-            arch='aarch64',
-            version='14.1',
-            install_method=InstallMethodType.BREW)
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.BREW,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mysql',
-                        'subversion',
-                    ],
-                },
-                *self.COMMON_MACOS_ARM64_STEPS,
+    def test_with_rocky_linux_9(self) -> None:
+        """Testing get_install_steps with Rocky Linux 9"""
+        self._check_install_steps(
+            distro_id='rocky',
+            distro_families=self.ROCKY_FAMILIES,
+            version='9.3',
+            expected_steps=[
+                *self.DNF_PLUGINS_SETUP_STEPS,
+                *self.CRB_SETUP_STEPS,
+                *self.EPEL_SETUP_STEPS,
+                *self.YUM_PACKAGES_STEPS,
             ])
 
-    def test_with_opensuse_leap_15_x86_64(self) -> None:
-        """Testing get_install_steps with openSUSE Leap 15 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='opensuse-leap',
-            distro_families={
-                'opensuse',
-                'opensuse-leap',
-                'suse',
-            },
-            version='15.5')
+    def test_with_ubuntu_18_04(self) -> None:
+        """Testing get_install_steps with Ubuntu 18.04"""
+        self._check_install_steps(
+            distro_id='ubuntu',
+            distro_families=self.UBUNTU_FAMILIES,
+            version='18.04',
+            expected_steps=[
+                *self.APT_UBUNTU_PACKAGES_STEPS,
+            ])
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'zypper', 'install', '-y', '-t', 'pattern',
-                        'devel_basis',
-                    ],
-                },
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.ZYPPER,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libopenssl-devel',
-                        'libxml2-devel',
-                        'python3-devel',
-                        'xmlsec1-devel',
-                        'xmlsec1-openssl-devel',
-                        'git',
-                        'memcached',
-                        'libmariadb-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
+    def test_with_ubuntu_20_04(self) -> None:
+        """Testing get_install_steps with Ubuntu 20.04"""
+        self._check_install_steps(
+            distro_id='ubuntu',
+            distro_families=self.UBUNTU_FAMILIES,
+            version='20.04',
+            expected_steps=[
+                *self.APT_UBUNTU_PACKAGES_STEPS,
             ])
 
-    def test_with_opensuse_leap_15_aarch64(self) -> None:
-        """Testing get_install_steps with openSUSE Leap 15 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='opensuse-leap',
-            distro_families={
-                'opensuse',
-                'opensuse-leap',
-                'suse',
-            },
-            version='15.5')
+    def test_with_ubuntu_22_04(self) -> None:
+        """Testing get_install_steps with Ubuntu 22.04"""
+        self._check_install_steps(
+            distro_id='ubuntu',
+            distro_families=self.UBUNTU_FAMILIES,
+            version='22.04',
+            expected_steps=[
+                *self.APT_UBUNTU_PACKAGES_STEPS,
+            ])
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'zypper', 'install', '-y', '-t', 'pattern',
-                        'devel_basis',
-                    ],
-                },
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.ZYPPER,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libopenssl-devel',
-                        'libxml2-devel',
-                        'python3-devel',
-                        'xmlsec1-devel',
-                        'xmlsec1-openssl-devel',
-                        'git',
-                        'memcached',
-                        'libmariadb-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
+    def test_with_ubuntu_23_10(self) -> None:
+        """Testing get_install_steps with Ubuntu 23.10"""
+        self._check_install_steps(
+            distro_id='ubuntu',
+            distro_families=self.UBUNTU_FAMILIES,
+            version='23.10',
+            expected_steps=[
+                *self.APT_UBUNTU_PACKAGES_STEPS,
             ])
 
-    def test_with_opensuse_tumbleweed_x86_64(self) -> None:
-        """Testing get_install_steps with openSUSE Tumbleweed (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='opensuse-tumbleweed',
-            distro_families={
-                'opensuse',
-                'opensuse-tumbleweed',
-                'suse',
-            },
-            version='20231215')
+    def _check_install_steps(
+        self,
+        *,
+        expected_steps: InstallSteps,
+        archs: Sequence[str] = ARCHS,
+        system: str = 'Linux',
+        **kwargs,
+    ) -> None:
+        """Check the install steps generated for a system.
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'zypper', 'install', '-y', '-t', 'pattern',
-                        'devel_basis',
-                    ],
-                },
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.ZYPPER,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libopenssl-devel',
-                        'libxml2-devel',
-                        'python3-devel',
-                        'xmlsec1-devel',
-                        'xmlsec1-openssl-devel',
-                        'git',
-                        'memcached',
-                        'libmariadb-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
+        The install steps are checked on each of the provided architectures.
+        The steps common to all installs on the system and architecture are
+        expected to follow the provided steps.
 
-    def test_with_opensuse_tumbleweed_aarch64(self) -> None:
-        """Testing get_install_steps with openSUSE Tumbleweed (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='opensuse-tumbleweed',
-            distro_families={
-                'opensuse',
-                'opensuse-tumbleweed',
-                'suse',
-            },
-            version='20231215')
+        Version Added:
+            1.3
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'zypper', 'install', '-y', '-t', 'pattern',
-                        'devel_basis',
-                    ],
-                },
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.ZYPPER,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libopenssl-devel',
-                        'libxml2-devel',
-                        'python3-devel',
-                        'xmlsec1-devel',
-                        'xmlsec1-openssl-devel',
-                        'git',
-                        'memcached',
-                        'libmariadb-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
+        Args:
+            expected_steps (list of dict):
+                The system-specific steps expected at the start of the
+                install.
 
-    def test_with_rhel_8_x86_64(self) -> None:
-        """Testing get_install_steps with RHEL 8 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='rhel',
-            distro_families={
-                'fedora',
-                'rhel',
-            },
-            version='8.9')
+            archs (list of str, optional):
+                The architectures to check.
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
+            system (str, optional):
+                The name of the system.
 
-    def test_with_rhel_8_aarch64(self) -> None:
-        """Testing get_install_steps with RHEL 8 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='rhel',
-            distro_families={
-                'fedora',
-                'rhel',
-            },
-            version='8.9')
+            **kwargs (dict):
+                Additional keyword arguments for
+                :py:func:`_create_install_state`.
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
+        Raises:
+            AssertionError:
+                The install steps did not match.
+        """
+        for arch in archs:
+            with self.subTest(arch=arch):
+                install_state = _create_install_state(arch=arch,
+                                                      system=system,
+                                                      **kwargs)
 
-    def test_with_rhel_9_x86_64(self) -> None:
-        """Testing get_install_steps with RHEL 9 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='rhel',
-            distro_families={
-                'fedora',
-                'rhel',
-            },
-            version='9.3')
+                self.assertEqual(
+                    get_install_steps(install_state=install_state),
+                    [
+                        *expected_steps,
+                        *self.COMMON_STEPS[(system, arch)],
+                    ])
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'subscription-manager',
-                        'repos',
-                        '--enable',
-                        'codeready-builder-for-rhel-9-x86_64-rpms',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'install', '-y',
-                        ('https://dl.fedoraproject.org/pub/epel/'
-                         'epel-release-latest-9.noarch.rpm'),
-                    ],
-                },
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
 
-    def test_with_rhel_9_aarch64(self) -> None:
-        """Testing get_install_steps with RHEL 9 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='rhel',
-            distro_families={
-                'fedora',
-                'rhel',
-            },
-            version='9.3')
+class GetInstallPackageStepsTests(TestCase):
+    """Unit tests for get_install_package_steps().
 
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'subscription-manager',
-                        'repos',
-                        '--enable',
-                        'codeready-builder-for-rhel-9-aarch64-rpms',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'install', '-y',
-                        ('https://dl.fedoraproject.org/pub/epel/'
-                         'epel-release-latest-9.noarch.rpm'),
-                    ],
-                },
-                {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
-                },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
+    Version Added:
+        1.3
+    """
 
-    def test_with_rocky_linux_8_x86_64(self) -> None:
-        """Testing get_install_steps with Rocky Linux 8 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='rocky',
-            distro_families={
-                'centos',
-                'fedora',
-                'rhel',
-                'rocky',
+    maxDiff = None
+
+    def test_with_duplicate_and_skipped_packages(self) -> None:
+        """Testing get_install_package_steps with duplicate and skipped
+        packages
+        """
+        self._set_packages({
+            'test': {
+                'system': [
+                    {
+                        'install_method': InstallMethodType.YUM,
+                        'packages': ['a', 'b', 'c'],
+                    },
+                    {
+                        'install_method': InstallMethodType.YUM,
+                        'packages': ['b', 'd'],
+                    },
+                    {
+                        'install_method': InstallMethodType.YUM,
+                        'packages': ['e'],
+                        'skip_packages': ['a'],
+                    },
+                ],
             },
-            version='8.9')
+        })
+
+        install_state = _create_install_state(
+            distro_id='rocky',
+            distro_families={'centos', 'fedora', 'rhel'},
+            version='9')
 
         self.assertEqual(
-            get_install_steps(install_state=install_state),
+            get_install_package_steps(install_state,
+                                      categories=['test'],
+                                      package_type='system'),
             [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'install', '-y', 'dnf-plugins-core',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'yum', 'install', '-y', 'epel-release',
-                    ],
-                },
                 {
                     'allow_fail': False,
                     'install_method': InstallMethodType.YUM,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
+                    'name': 'Installing packages',
+                    'state': ['b', 'c', 'd', 'e'],
                 },
-                *self.COMMON_LINUX_X86_STEPS,
             ])
 
-    def test_with_rocky_linux_8_aarch64(self) -> None:
-        """Testing get_install_steps with Rocky Linux 8 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='rocky',
-            distro_families={
-                'centos',
-                'fedora',
-                'rhel',
-                'rocky',
+    def _set_packages(
+        self,
+        packages: _Packages,
+    ) -> None:
+        """Set the package candidates for the duration of the test.
+
+        Args:
+            packages (dict):
+                The package candidates to look up.
+        """
+        old_packages = distro_info.PACKAGES
+
+        def _restore_packages() -> None:
+            distro_info.PACKAGES = old_packages
+            distro_info._get_package_index.cache_clear()
+
+        distro_info.PACKAGES = packages
+        distro_info._get_package_index.cache_clear()
+        self.addCleanup(_restore_packages)
+
+class MergeInstallStepsTests(TestCase):
+    """Unit tests for _merge_install_steps().
+
+    Version Added:
+        1.3
+    """
+
+    maxDiff = None
+
+    def test_with_same_install_method(self) -> None:
+        """Testing _merge_install_steps with steps using the same install
+        method across phases
+        """
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.YUM,
+                'name': 'Installing system packages',
+                'state': ['a', 'b'],
+            },
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Python packages',
+                'state': ['c'],
             },
-            version='8.9')
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.YUM,
+                'name': 'Installing service integrations',
+                'state': ['b', 'd'],
+            },
+        ]
 
         self.assertEqual(
-            get_install_steps(install_state=install_state),
+            _merge_install_steps(install_steps),
             [
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'install', '-y', 'dnf-plugins-core',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'yum', 'install', '-y', 'epel-release',
-                    ],
-                },
                 {
                     'allow_fail': False,
                     'install_method': InstallMethodType.YUM,
                     'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
+                    'state': ['a', 'b', 'd'],
+                },
+                {
+                    'allow_fail': False,
+                    'install_method': InstallMethodType.PIP,
+                    'name': 'Installing Python packages',
+                    'state': ['c'],
                 },
-                *self.COMMON_LINUX_ARM64_STEPS,
             ])
 
-    def test_with_rocky_linux_9_x86_64(self) -> None:
-        """Testing get_install_steps with Rocky Linux 9 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='rocky',
-            distro_families={
-                'centos',
-                'fedora',
-                'rhel',
-                'rocky',
+        # The provided steps must not be modified.
+        self.assertEqual(install_steps[0]['state'], ['a', 'b'])
+
+    def test_with_different_install_methods(self) -> None:
+        """Testing _merge_install_steps with steps using different install
+        methods
+        """
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.YUM,
+                'name': 'Installing system packages',
+                'state': ['a'],
             },
-            version='9.3')
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.BREW,
+                'name': 'Installing system packages',
+                'state': ['b'],
+            },
+        ]
+
+        self.assertEqual(_merge_install_steps(install_steps),
+                         install_steps)
+
+    def test_with_shell_step(self) -> None:
+        """Testing _merge_install_steps does not merge across shell steps"""
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.YUM,
+                'name': 'Installing system packages',
+                'state': ['a'],
+            },
+            {
+                'install_method': InstallMethodType.SHELL,
+                'name': 'Setting up support for packages',
+                'state': ['yum', 'install', '-y', 'epel-release'],
+            },
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.YUM,
+                'name': 'Installing system packages',
+                'state': ['b'],
+            },
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.YUM,
+                'name': 'Installing service integrations',
+                'state': ['c'],
+            },
+        ]
 
         self.assertEqual(
-            get_install_steps(install_state=install_state),
+            _merge_install_steps(install_steps),
             [
                 {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'install', '-y', 'dnf-plugins-core',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'config-manager', '--set-enabled', 'crb',
-                    ],
+                    'allow_fail': False,
+                    'install_method': InstallMethodType.YUM,
+                    'name': 'Installing system packages',
+                    'state': ['a'],
                 },
                 {
                     'install_method': InstallMethodType.SHELL,
                     'name': 'Setting up support for packages',
-                    'state': [
-                        'yum', 'install', '-y', 'epel-release',
-                    ],
+                    'state': ['yum', 'install', '-y', 'epel-release'],
                 },
                 {
                     'allow_fail': False,
                     'install_method': InstallMethodType.YUM,
                     'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
+                    'state': ['b', 'c'],
                 },
-                *self.COMMON_LINUX_X86_STEPS,
             ])
 
-    def test_with_rocky_linux_9_aarch64(self) -> None:
-        """Testing get_install_steps with Rocky Linux 9 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='rocky',
-            distro_families={
-                'centos',
-                'fedora',
-                'rhel',
-                'rocky',
+    def test_with_allow_fail(self) -> None:
+        """Testing _merge_install_steps keeps steps allowed to fail
+        separate
+        """
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': True,
+                'install_method': InstallMethodType.YUM,
+                'name': 'Installing system packages',
+                'state': ['a'],
             },
-            version='9.3')
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.YUM,
+                'name': 'Installing system packages',
+                'state': ['b'],
+            },
+            {
+                'allow_fail': True,
+                'install_method': InstallMethodType.YUM,
+                'name': 'Installing system packages',
+                'state': ['c'],
+            },
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.YUM,
+                'name': 'Installing system packages',
+                'state': ['d'],
+            },
+        ]
 
         self.assertEqual(
-            get_install_steps(install_state=install_state),
+            _merge_install_steps(install_steps),
             [
                 {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'install', '-y', 'dnf-plugins-core',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'dnf', 'config-manager', '--set-enabled', 'crb',
-                    ],
-                },
-                {
-                    'install_method': InstallMethodType.SHELL,
-                    'name': 'Setting up support for packages',
-                    'state': [
-                        'yum', 'install', '-y', 'epel-release',
-                    ],
+                    'allow_fail': True,
+                    'install_method': InstallMethodType.YUM,
+                    'name': 'Installing system packages',
+                    'state': ['a'],
                 },
                 {
                     'allow_fail': False,
                     'install_method': InstallMethodType.YUM,
                     'name': 'Installing system packages',
-                    'state': [
-                        'gcc',
-                        'gcc-c++',
-                        'libffi-devel',
-                        'libxml2-devel',
-                        'make',
-                        'openssl-devel',
-                        'patch',
-                        'perl',
-                        'python3-devel',
-                        'libtool-ltdl-devel',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'mariadb-connector-c-devel',
-                        'subversion',
-                        'subversion-devel',
-                    ],
+                    'state': ['b', 'd'],
                 },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_ubuntu_18_04_x86_64(self) -> None:
-        """Testing get_install_steps with Ubuntu 18.04 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='ubuntu',
-            distro_families={
-                'debian',
-                'ubuntu',
-            },
-            version='18.04')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
                 {
-                    'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
+                    'allow_fail': True,
+                    'install_method': InstallMethodType.YUM,
                     'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmysqlclient-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
+                    'state': ['c'],
                 },
-                *self.COMMON_LINUX_X86_STEPS,
             ])
 
-    def test_with_ubuntu_18_04_aarch64(self) -> None:
-        """Testing get_install_steps with Ubuntu 18.04 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='ubuntu',
-            distro_families={
-                'debian',
-                'ubuntu',
+    def test_with_reviewboard_extra(self) -> None:
+        """Testing _merge_install_steps with Review Board extras"""
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.REVIEWBOARD_EXTRA,
+                'name': 'Installing extra Review Board integrations',
+                'state': ['s3', 'swift'],
             },
-            version='18.04')
+            {
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Review Board packages',
+                'state': ['ReviewBoard==6.0'],
+            },
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.REVIEWBOARD_EXTRA,
+                'name': 'Installing service integrations',
+                'state': ['mysql', 's3'],
+            },
+        ]
 
         self.assertEqual(
-            get_install_steps(install_state=install_state),
+            _merge_install_steps(install_steps),
             [
                 {
                     'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmysqlclient-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
+                    'install_method': InstallMethodType.REVIEWBOARD_EXTRA,
+                    'name': 'Installing extra Review Board integrations',
+                    'state': ['s3', 'swift', 'mysql'],
+                },
+                {
+                    'install_method': InstallMethodType.PIP,
+                    'name': 'Installing Review Board packages',
+                    'state': ['ReviewBoard==6.0'],
                 },
-                *self.COMMON_LINUX_ARM64_STEPS,
             ])
 
-    def test_with_ubuntu_20_04_x86_64(self) -> None:
-        """Testing get_install_steps with Ubuntu 20.04 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='ubuntu',
-            distro_families={
-                'debian',
-                'ubuntu',
+    def test_with_pip_steps(self) -> None:
+        """Testing _merge_install_steps does not merge pip steps"""
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Python packaging support',
+                'state': ['pip', 'setuptools'],
+            },
+            {
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Review Board packages',
+                'state': ['ReviewBoard==6.0'],
+            },
+        ]
+
+        self.assertEqual(_merge_install_steps(install_steps),
+                         install_steps)
+
+    def test_with_pip_duplicate_requirements(self) -> None:
+        """Testing _merge_install_steps with pip requirements installed by
+        an earlier step
+        """
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Python packaging support',
+                'state': ['pip', 'lxml'],
             },
-            version='20.04')
+            {
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Review Board packages',
+                'state': ['lxml', 'lxml==4.9', 'ReviewBoard==6.0'],
+            },
+        ]
 
+        # Requirements are compared as exact strings.
         self.assertEqual(
-            get_install_steps(install_state=install_state),
+            _merge_install_steps(install_steps),
             [
                 {
                     'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmysqlclient-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
+                    'install_method': InstallMethodType.PIP,
+                    'name': 'Installing Python packaging support',
+                    'state': ['pip', 'lxml'],
+                },
+                {
+                    'install_method': InstallMethodType.PIP,
+                    'name': 'Installing Review Board packages',
+                    'state': ['lxml==4.9', 'ReviewBoard==6.0'],
                 },
-                *self.COMMON_LINUX_X86_STEPS,
             ])
 
-    def test_with_ubuntu_20_04_aarch64(self) -> None:
-        """Testing get_install_steps with Ubuntu 20.04 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='ubuntu',
-            distro_families={
-                'debian',
-                'ubuntu',
+        # The provided steps must not be modified.
+        self.assertEqual(install_steps[1]['state'],
+                         ['lxml', 'lxml==4.9', 'ReviewBoard==6.0'])
+
+    def test_with_pip_options(self) -> None:
+        """Testing _merge_install_steps keeps pip options when removing
+        requirements
+        """
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Python packaging support',
+                'state': ['lxml'],
             },
-            version='20.04')
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Review Board packages',
+                'state': ['--no-binary=lxml', 'lxml', 'ReviewBoard==6.0'],
+            },
+        ]
 
         self.assertEqual(
-            get_install_steps(install_state=install_state),
+            _merge_install_steps(install_steps),
             [
                 {
                     'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmysqlclient-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
+                    'install_method': InstallMethodType.PIP,
+                    'name': 'Installing Python packaging support',
+                    'state': ['lxml'],
                 },
-                *self.COMMON_LINUX_ARM64_STEPS,
-            ])
-
-    def test_with_ubuntu_22_04_x86_64(self) -> None:
-        """Testing get_install_steps with Ubuntu 22.04 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='ubuntu',
-            distro_families={
-                'debian',
-                'ubuntu',
-            },
-            version='22.04')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
                 {
                     'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmysqlclient-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
+                    'install_method': InstallMethodType.PIP,
+                    'name': 'Installing Review Board packages',
+                    'state': ['--no-binary=lxml', 'ReviewBoard==6.0'],
                 },
-                *self.COMMON_LINUX_X86_STEPS,
             ])
 
-    def test_with_ubuntu_22_04_aarch64(self) -> None:
-        """Testing get_install_steps with Ubuntu 22.04 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='ubuntu',
-            distro_families={
-                'debian',
-                'ubuntu',
+    def test_with_pip_only_options_left(self) -> None:
+        """Testing _merge_install_steps drops pip steps with only options
+        left
+        """
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Python packaging support',
+                'state': ['lxml'],
             },
-            version='22.04')
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Python packaging support',
+                'state': ['--no-binary=lxml', 'lxml'],
+            },
+        ]
 
         self.assertEqual(
-            get_install_steps(install_state=install_state),
+            _merge_install_steps(install_steps),
             [
                 {
                     'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmysqlclient-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
+                    'install_method': InstallMethodType.PIP,
+                    'name': 'Installing Python packaging support',
+                    'state': ['lxml'],
                 },
-                *self.COMMON_LINUX_ARM64_STEPS,
             ])
 
-    def test_with_ubuntu_23_10_x86_64(self) -> None:
-        """Testing get_install_steps with Ubuntu 23.10 (x86_64)"""
-        install_state = self.create_install_state(
-            arch='x86_64',
-            distro_id='ubuntu',
-            distro_families={
-                'debian',
-                'ubuntu',
+    def test_with_pip_allow_fail(self) -> None:
+        """Testing _merge_install_steps does not remove pip requirements
+        from a step allowed to fail
+        """
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': True,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing service integrations',
+                'state': ['p4python'],
+            },
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing service integrations',
+                'state': ['p4python'],
+            },
+        ]
+
+        # The first step may fail, so the second must still install the
+        # package.
+        self.assertEqual(_merge_install_steps(install_steps),
+                         install_steps)
+
+    def test_with_pip_option_values(self) -> None:
+        """Testing _merge_install_steps keeps values for pip options"""
+        install_steps: InstallSteps = [
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Python packaging support',
+                'state': ['lxml'],
+            },
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing Review Board packages',
+                'state': ['--no-binary', 'lxml', 'lxml', 'ReviewBoard==6.0'],
             },
-            version='23.10')
+            {
+                'allow_fail': False,
+                'install_method': InstallMethodType.PIP,
+                'name': 'Installing service integrations',
+                'state': ['--no-binary', 'lxml', 'lxml'],
+            },
+        ]
 
+        # An argument following an option without "=" may be the option's
+        # value, so it's always kept.
         self.assertEqual(
-            get_install_steps(install_state=install_state),
+            _merge_install_steps(install_steps),
             [
                 {
                     'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmysqlclient-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
+                    'install_method': InstallMethodType.PIP,
+                    'name': 'Installing Python packaging support',
+                    'state': ['lxml'],
                 },
-                *self.COMMON_LINUX_X86_STEPS,
-            ])
-
-    def test_with_ubuntu_23_10_aarch64(self) -> None:
-        """Testing get_install_steps with Ubuntu 23.10 (aarch64)"""
-        install_state = self.create_install_state(
-            arch='aarch64',
-            distro_id='ubuntu',
-            distro_families={
-                'debian',
-                'ubuntu',
-            },
-            version='23.10')
-
-        self.assertEqual(
-            get_install_steps(install_state=install_state),
-            [
                 {
                     'allow_fail': False,
-                    'install_method': InstallMethodType.APT,
-                    'name': 'Installing system packages',
-                    'state': [
-                        'build-essential',
-                        'libffi-dev',
-                        'libjpeg-dev',
-                        'libssl-dev',
-                        'libxml2-dev',
-                        'libxmlsec1-dev',
-                        'libxmlsec1-openssl',
-                        'patch',
-                        'pkg-config',
-                        'python3-dev',
-                        'python3-pip',
-                        'cvs',
-                        'git',
-                        'memcached',
-                        'libmysqlclient-dev',
-                        'subversion',
-                        'libsvn-dev',
-                    ],
+                    'install_method': InstallMethodType.PIP,
+                    'name': 'Installing Review Board packages',
+                    'state': ['--no-binary', 'lxml', 'ReviewBoard==6.0'],
                 },
-                *self.COMMON_LINUX_ARM64_STEPS,
             ])
-
-    def create_install_state(
-        self,
-        *,
-        arch: str = 'x86_64',
-        system: str = 'Linux',
-        version: str = '',
-        distro_id: str = '',
-        distro_families: Set[str] = set(),
-        install_method: Optional[InstallMethodType] = None
-    ) -> InstallState:
-        if install_method is None:
-            install_method = get_default_linux_install_method(
-                families=distro_families)
-            assert install_method
-
-        return {
-            'create_sitedir': False,
-            'dry_run': False,
-            'install_reviewbot_extension': True,
-            'install_reviewbot_worker': True,
-            'install_powerpack': True,
-            'powerpack_version_info': {
-                'is_latest': True,
-                'is_requested': True,
-                'latest_version': '5.2.2',
-                'package_name': 'ReviewBoardPowerPack',
-                'requires_python': '>=3.7',
-                'version': '5.2.2',
-            },
-            'reviewboard_version_info': {
-                'is_latest': True,
-                'is_requested': True,
-                'latest_version': '6.0',
-                'package_name': 'ReviewBoard',
-                'requires_python': '>=3.8',
-                'version': '6.0',
-            },
-            'reviewbot_extension_version_info': {
-                'is_latest': True,
-                'is_requested': True,
-                'latest_version': '4.0',
-                'package_name': 'reviewbot-extension',
-                'requires_python': '>=3.8',
-                'version': '4.0',
-            },
-            'reviewbot_worker_version_info': {
-                'is_latest': True,
-                'is_requested': True,
-                'latest_version': '4.0',
-                'package_name': 'reviewbot-worker',
-                'requires_python': '>=3.8',
-                'version': '4.0',
-            },
-            'sitedir_path': '/var/www/reviewboard',
-            'steps': [],
-            'system_info': {
-                'arch': arch,
-                'bootstrap_python_exe': '/path/to/bootstrap/python',
-                'distro_id': distro_id,
-                'distro_families': distro_families,
-                'paths': {},
-                'system_install_method': install_method,
-                'system': system,
-                'system_python_exe': '/usr/bin/python',
-                'system_python_version': (3, 11, 0, '', 0),
-                'version': version,
-            },
-            'unattended_install': False,
-            'venv_path': '/path/to/venv',
-            'venv_pip_exe': '/path/to/venv/bin/pip',
-            'venv_python_exe': '/path/to/venv/bin/python',
-        }
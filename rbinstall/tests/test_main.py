@@ -0,0 +1,278 @@
+"""Unit tests for rbinstall.main.
+
+Version Added:
+    1.3
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, Optional, Set, TYPE_CHECKING
+from unittest import TestCase
+
+import kgb
+
+from rbinstall.errors import InstallerError
+from rbinstall.install_methods import InstallMethodType
+from rbinstall.main import get_package_versions, main, parse_options
+from rbinstall.pypi import fetch_package_info, find_package_version_info
+from rbinstall.state import get_system_info
+from rbinstall.ui import get_console, init_console
+from rbinstall.wizard import start_wizard
+
+if TYPE_CHECKING:
+    from rbinstall.state import SystemInfo
+
+
+_SYSTEM_INFO: SystemInfo = {
+    'arch': 'x86_64',
+    'bootstrap_python_exe': '/path/to/bootstrap/python',
+    'distro_families': {'debian'},
+    'distro_id': 'debian',
+    'paths': {},
+    'system': 'Linux',
+    'system_install_method': InstallMethodType.APT,
+    'system_python_exe': '/usr/bin/python',
+    'system_python_version': (3, 11, 0, '', 0),
+    'version': '12 (bookworm)',
+}
+
+
+def _setup_packages(
+    spy_agency: kgb.SpyAgency,
+    *,
+    fetch_errors: Set[str] = set(),
+    incompatible: Set[str] = set(),
+) -> None:
+    """Set up fake package information for a test.
+
+    Version Added:
+        1.3
+
+    Args:
+        spy_agency (kgb.SpyAgency):
+            The spy agency for the test.
+
+        fetch_errors (set of str, optional):
+            The packages that fail to be fetched.
+
+        incompatible (set of str, optional):
+            The packages without a compatible version.
+    """
+    @spy_agency.spy_for(fetch_package_info)
+    def _fetch_package_info(package_name, **kwargs):
+        if package_name in fetch_errors:
+            raise InstallerError(f'Error fetching {package_name}')
+
+        return {
+            'info': {
+                'name': package_name,
+            },
+        }
+
+    @spy_agency.spy_for(find_package_version_info)
+    def _find_package_version_info(package_name, **kwargs):
+        if package_name in incompatible:
+            return None
+
+        return {
+            'is_latest': True,
+            'is_requested': True,
+            'latest_version': '1.0',
+            'package_name': package_name,
+            'requires_python': '>=3.7',
+            'version': '1.0',
+        }
+
+
+class GetPackageVersionsTests(kgb.SpyAgency, TestCase):
+    """Unit tests for get_package_versions().
+
+    Version Added:
+        1.3
+    """
+
+    def test_with_compatible_versions(self) -> None:
+        """Testing get_package_versions with compatible versions"""
+        _setup_packages(self)
+
+        package_versions = get_package_versions(
+            system_info=_SYSTEM_INFO,
+            options=parse_options([
+                '--reviewboard-version=~=6.0',
+                '--no-install-powerpack',
+            ]))
+
+        self.assertEqual(
+            package_versions,
+            {
+                'ReviewBoard': {
+                    'is_latest': True,
+                    'is_requested': True,
+                    'latest_version': '1.0',
+                    'package_name': 'ReviewBoard',
+                    'requires_python': '>=3.7',
+                    'version': '1.0',
+                },
+                'ReviewBoardPowerPack': None,
+                'reviewbot-extension': {
+                    'is_latest': True,
+                    'is_requested': True,
+                    'latest_version': '1.0',
+                    'package_name': 'reviewbot-extension',
+                    'requires_python': '>=3.7',
+                    'version': '1.0',
+                },
+                'reviewbot-worker': {
+                    'is_latest': True,
+                    'is_requested': True,
+                    'latest_version': '1.0',
+                    'package_name': 'reviewbot-worker',
+                    'requires_python': '>=3.7',
+                    'version': '1.0',
+                },
+            })
+
+        self.assertSpyCallCount(fetch_package_info, 3)
+        self.assertSpyCalledWith(find_package_version_info,
+                                 package_name='ReviewBoard',
+                                 system_info=_SYSTEM_INFO,
+                                 target_version='~=6.0')
+
+    def test_with_one_error(self) -> None:
+        """Testing get_package_versions with one package error"""
+        _setup_packages(self, fetch_errors={'reviewbot-worker'})
+
+        with self.assertRaises(InstallerError) as ctx:
+            get_package_versions(system_info=_SYSTEM_INFO,
+                                 options=parse_options([]))
+
+        self.assertEqual(str(ctx.exception),
+                         'Error fetching reviewbot-worker')
+
+    def test_with_multiple_errors(self) -> None:
+        """Testing get_package_versions with multiple package errors"""
+        _setup_packages(self,
+                        fetch_errors={'ReviewBoardPowerPack'},
+                        incompatible={'reviewbot-extension'})
+
+        with self.assertRaises(InstallerError) as ctx:
+            get_package_versions(system_info=_SYSTEM_INFO,
+                                 options=parse_options([]))
+
+        self.assertEqual(
+            str(ctx.exception),
+            'There were problems finding the packages to install:\n'
+            '\n'
+            '* Error fetching ReviewBoardPowerPack\n'
+            '\n'
+            '* No compatible version of reviewbot-extension could be found '
+            'on this system. You may need to install on a newer system '
+            'with a newer version of Python.')
+
+    def test_with_package_infos(self) -> None:
+        """Testing get_package_versions with package information already
+        being fetched
+        """
+        _setup_packages(self)
+
+        package_infos: Dict[str, Future[Optional[Dict[str, Any]]]] = {}
+
+        for package_name in ('ReviewBoard', 'reviewbot-extension',
+                             'reviewbot-worker'):
+            future: Future[Optional[Dict[str, Any]]] = Future()
+            future.set_result({
+                'info': {
+                    'name': package_name,
+                },
+            })
+            package_infos[package_name] = future
+
+        package_versions = get_package_versions(
+            system_info=_SYSTEM_INFO,
+            options=parse_options(['--no-install-powerpack']),
+            package_infos=package_infos)
+
+        self.assertEqual(
+            set(package_versions),
+            {
+                'ReviewBoard',
+                'ReviewBoardPowerPack',
+                'reviewbot-extension',
+                'reviewbot-worker',
+            })
+        self.assertIsNone(package_versions['ReviewBoardPowerPack'])
+        self.assertSpyNotCalled(fetch_package_info)
+        self.assertSpyCallCount(find_package_version_info, 3)
+
+
+class MainTests(kgb.SpyAgency, TestCase):
+    """Unit tests for main().
+
+    Version Added:
+        1.3
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.spy_on(init_console, call_original=False)
+        self.spy_on(start_wizard, call_original=False)
+
+    def test_with_packages(self) -> None:
+        """Testing main starts the wizard with system and package
+        information
+        """
+        _setup_packages(self)
+        self.spy_on(get_system_info,
+                    op=kgb.SpyOpReturn(_SYSTEM_INFO))
+
+        main(['rbinstall', '--noinput', '--no-install-powerpack'])
+
+        self.assertSpyCallCount(fetch_package_info, 3)
+        self.assertSpyCalledOnce(start_wizard)
+
+        install_state = start_wizard.last_call.kwargs['install_state']
+        self.assertIs(install_state['system_info'], _SYSTEM_INFO)
+        self.assertIsNone(install_state['powerpack_version_info'])
+        self.assertEqual(
+            install_state['reviewboard_version_info'],
+            {
+                'is_latest': True,
+                'is_requested': True,
+                'latest_version': '1.0',
+                'package_name': 'ReviewBoard',
+                'requires_python': '>=3.7',
+                'version': '1.0',
+            })
+
+    def test_with_system_info_error(self) -> None:
+        """Testing main with an error gathering system information"""
+        fetch_started = threading.Event()
+
+        @self.spy_for(fetch_package_info)
+        def _fetch_package_info(package_name, **kwargs):
+            fetch_started.set()
+
+            return None
+
+        @self.spy_for(get_system_info)
+        def _get_system_info():
+            # The packages are downloaded while the system is checked.
+            self.assertTrue(fetch_started.wait(5))
+
+            raise InstallerError('This system is not supported')
+
+        console = get_console()
+        self.spy_on(console.print, call_original=False)
+        self.spy_on(get_package_versions)
+
+        with self.assertRaises(SystemExit) as ctx:
+            main(['rbinstall', '--noinput'])
+
+        self.assertEqual(ctx.exception.code, 1)
+        self.assertSpyNotCalled(get_package_versions)
+        self.assertSpyNotCalled(start_wizard)
+        self.assertEqual(str(console.print.last_call.args[0]),
+                         'This system is not supported')
@@ -0,0 +1,166 @@
+"""Unit tests for rbinstall.process.
+
+Version Added:
+    1.3
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Dict, List, Optional
+from unittest import TestCase
+
+from rbinstall.errors import RunCommandError
+from rbinstall.process import join_cmdline, run
+from rbinstall.ui import get_console
+
+
+class JoinCmdlineTests(TestCase):
+    """Unit tests for join_cmdline().
+
+    Version Added:
+        1.3
+    """
+
+    def test_with_safe_parts(self) -> None:
+        """Testing join_cmdline with parts that don't need quoting"""
+        self.assertEqual(
+            join_cmdline(['pip', 'install', '--user', 'ReviewBoard==7.0',
+                          'CFLAGS=-O2', '/usr/bin/python3.11']),
+            'pip install --user ReviewBoard==7.0 CFLAGS=-O2 '
+            '/usr/bin/python3.11')
+
+    def test_with_unsafe_parts(self) -> None:
+        """Testing join_cmdline with parts that need quoting"""
+        self.assertEqual(
+            join_cmdline(['echo', '', 'a b', "it's", 'ReviewBoard[ldap]',
+                          '$HOME']),
+            "echo '' 'a b' 'it'\"'\"'s' 'ReviewBoard[ldap]' '$HOME'")
+
+    def test_with_pipe(self) -> None:
+        """Testing join_cmdline with pipe"""
+        self.assertEqual(
+            join_cmdline(['curl', 'https://example.com', '|', 'sh']),
+            'curl https://example.com | sh')
+
+
+class RunTests(TestCase):
+    """Unit tests for run().
+
+    Version Added:
+        1.3
+    """
+
+    def test_with_output(self) -> None:
+        """Testing run with streamed output"""
+        output = self._run_python(
+            'import sys, time\n'
+            'sys.stdout.write("line 1\\n")\n'
+            'sys.stdout.flush()\n'
+            'time.sleep(0.05)\n'
+            'sys.stdout.write("line 2\\n")\n')
+
+        self.assertEqual(output, 'line 1\nline 2\n')
+
+    def test_with_large_output_before_exit(self) -> None:
+        """Testing run with large output written immediately before exit"""
+        output = self._run_python(
+            'import sys\n'
+            'sys.stdout.write("x" * 200000)\n')
+
+        self.assertEqual(output, 'x' * 200000)
+
+    def test_with_output_after_closing_stdout(self) -> None:
+        """Testing run with command still running after closing stdout"""
+        output = self._run_python(
+            'import os, sys, time\n'
+            'sys.stdout.write("done\\n")\n'
+            'sys.stdout.flush()\n'
+            'os.close(1)\n'
+            'time.sleep(0.1)\n')
+
+        self.assertEqual(output, 'done\n')
+
+    def test_with_split_multibyte_output(self) -> None:
+        """Testing run with a multi-byte character split across writes"""
+        output = self._run_python(
+            'import sys, time\n'
+            'sys.stdout.buffer.write(b"caf\\xc3")\n'
+            'sys.stdout.flush()\n'
+            'time.sleep(0.05)\n'
+            'sys.stdout.buffer.write(b"\\xa9\\n")\n')
+
+        self.assertEqual(output, 'café\n')
+
+    def test_with_truncated_multibyte_output(self) -> None:
+        """Testing run with a truncated multi-byte character at EOF"""
+        output = self._run_python(
+            'import sys\n'
+            'sys.stdout.buffer.write(b"caf\\xc3")\n')
+
+        self.assertEqual(output, 'caf')
+
+    def test_with_env(self) -> None:
+        """Testing run with extra environment variables"""
+        os.environ['RBINSTALL_TEST_INHERITED'] = 'inherited'
+        self.addCleanup(os.environ.pop, 'RBINSTALL_TEST_INHERITED')
+
+        output = self._run_python(
+            'import os\n'
+            'print(os.environ["RBINSTALL_TEST_INHERITED"])\n'
+            'print(os.environ["RBINSTALL_TEST_EXTRA"])\n',
+            env={
+                'RBINSTALL_TEST_EXTRA': 'extra',
+            })
+
+        self.assertEqual(output, 'inherited\nextra\n')
+        self.assertNotIn('RBINSTALL_TEST_EXTRA', os.environ)
+
+    def test_without_env(self) -> None:
+        """Testing run without extra environment variables inherits the
+        environment
+        """
+        os.environ['RBINSTALL_TEST_INHERITED'] = 'inherited'
+        self.addCleanup(os.environ.pop, 'RBINSTALL_TEST_INHERITED')
+
+        output = self._run_python(
+            'import os\n'
+            'print(os.environ["RBINSTALL_TEST_INHERITED"])\n')
+
+        self.assertEqual(output, 'inherited\n')
+
+    def test_with_exit_code(self) -> None:
+        """Testing run with non-zero exit code"""
+        with self.assertRaises(RunCommandError) as ctx:
+            self._run_python('import sys; sys.exit(3)')
+
+        self.assertEqual(ctx.exception.exit_code, 3)
+
+    def _run_python(
+        self,
+        script: str,
+        *,
+        env: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Run a Python script and return its captured output.
+
+        Args:
+            script (str):
+                The Python script to run.
+
+            env (dict, optional):
+                Extra environment variables for the script.
+
+        Returns:
+            str:
+            The output written to the console.
+        """
+        capture_command: List[List[str]] = []
+
+        with get_console().capture() as capture:
+            run([sys.executable, '-c', script],
+                capture_command=capture_command,
+                env=env)
+
+        return capture.get()
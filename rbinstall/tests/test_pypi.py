@@ -7,24 +7,87 @@ Version Added:
 from __future__ import annotations
 
 import json
+import os
 import re
+import shutil
+import tempfile
 from contextlib import contextmanager
 from io import StringIO
-from typing import Any, Dict, TYPE_CHECKING, Tuple
+from typing import Any, Dict, Optional, TYPE_CHECKING, Tuple
 from unittest import TestCase
 from urllib.error import HTTPError
 from urllib.request import urlopen
 
 import kgb
+from packaging.specifiers import SpecifierSet
 
 from rbinstall.errors import InstallerError
 from rbinstall.install_methods import InstallMethodType
-from rbinstall.pypi import get_package_version_info
+from rbinstall.pypi import (_get_cache_dir,
+                            _get_cache_path,
+                            _wait_for_retry,
+                            get_package_version_info)
 
 if TYPE_CHECKING:
     from rbinstall.state import SystemInfo
 
 
+class GetCacheDirTests(TestCase):
+    """Unit tests for _get_cache_dir().
+
+    Version Added:
+        1.3
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+
+        old_environ = os.environ.copy()
+
+        def _restore_environ() -> None:
+            os.environ.clear()
+            os.environ.update(old_environ)
+
+        self.addCleanup(_restore_environ)
+        os.environ.pop('XDG_CACHE_HOME', None)
+
+    def test_with_home(self) -> None:
+        """Testing _get_cache_dir with the user's home directory"""
+        home = tempfile.mkdtemp(prefix='rbinstall-tests-')
+        self.addCleanup(shutil.rmtree, home)
+        os.environ['HOME'] = home
+
+        self.assertEqual(_get_cache_dir(),
+                         os.path.join(home, '.cache', 'rbinstall', 'pypi'))
+
+    def test_with_xdg_cache_home(self) -> None:
+        """Testing _get_cache_dir with $XDG_CACHE_HOME"""
+        cache_home = tempfile.mkdtemp(prefix='rbinstall-tests-')
+        self.addCleanup(shutil.rmtree, cache_home)
+        os.environ['XDG_CACHE_HOME'] = cache_home
+
+        self.assertEqual(_get_cache_dir(),
+                         os.path.join(cache_home, 'rbinstall', 'pypi'))
+
+    def test_with_home_owned_by_other_user(self) -> None:
+        """Testing _get_cache_dir with a home directory owned by another
+        user
+        """
+        if os.geteuid() == 0:
+            # This is running as root, as it would through sudo. Give the
+            # home directory to another user.
+            home = tempfile.mkdtemp(prefix='rbinstall-tests-')
+            self.addCleanup(shutil.rmtree, home)
+            os.chown(home, 65534, -1)
+        else:
+            # The root directory belongs to root.
+            home = '/'
+
+        os.environ['HOME'] = home
+
+        self.assertIsNone(_get_cache_dir())
+
+
 class GetPackageVersionInfoTests(kgb.SpyAgency, TestCase):
     """Unit tests for get_package_version_info().
 
@@ -32,6 +95,16 @@ class GetPackageVersionInfoTests(kgb.SpyAgency, TestCase):
         1.0
     """
 
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.cache_dir = tempfile.mkdtemp(prefix='rbinstall-tests-')
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.spy_on(_get_cache_dir,
+                    op=kgb.SpyOpReturn(self.cache_dir))
+        self.spy_on(_wait_for_retry,
+                    call_original=False)
+
     def test_with_latest_match(self) -> None:
         """Testing get_package_version_info with latest version match"""
         self._setup_response({
@@ -99,6 +172,94 @@ class GetPackageVersionInfoTests(kgb.SpyAgency, TestCase):
                 'version': '6.0.1',
             })
 
+    def test_with_specific_older_match(self) -> None:
+        """Testing get_package_version_info with specific older version match
+        """
+        self._setup_response({
+            'info': {
+                'name': 'ReviewBoard',
+                'version': '6.0.1',
+            },
+            'releases': {
+                '5.0': [
+                    {
+                        'requires_python': '>=3.7',
+                    },
+                ],
+                '5.0.1': [
+                    {
+                        'requires_python': '>=3.7',
+                    },
+                ],
+                '6.0.1': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+            },
+        })
+
+        info = get_package_version_info(
+            system_info=self.create_system_info(),
+            package_name='ReviewBoard',
+            target_version='5.0')
+
+        self.assertEqual(
+            info,
+            {
+                'is_latest': False,
+                'is_requested': True,
+                'latest_version': '6.0.1',
+                'package_name': 'ReviewBoard',
+                'requires_python': '>=3.7',
+                'version': '5.0',
+            })
+
+    def test_with_specific_yanked_match(self) -> None:
+        """Testing get_package_version_info with specific version match that
+        was yanked
+        """
+        self._setup_response({
+            'info': {
+                'name': 'ReviewBoard',
+                'version': '6.0.1',
+            },
+            'releases': {
+                '5.0': [
+                    {
+                        'requires_python': '>=3.7',
+                    },
+                ],
+                '5.0.1': [
+                    {
+                        'requires_python': '>=3.7',
+                        'yanked': True,
+                    },
+                ],
+                '6.0.1': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+            },
+        })
+
+        info = get_package_version_info(
+            system_info=self.create_system_info(),
+            package_name='ReviewBoard',
+            target_version='5.0.1')
+
+        self.assertEqual(
+            info,
+            {
+                'is_latest': False,
+                'is_requested': False,
+                'latest_version': '6.0.1',
+                'package_name': 'ReviewBoard',
+                'requires_python': '>=3.7',
+                'version': '5.0',
+            })
+
     def test_with_below_latest_match(self) -> None:
         """Testing get_package_version_info with below latest version match"""
         self._setup_response({
@@ -137,6 +298,175 @@ class GetPackageVersionInfoTests(kgb.SpyAgency, TestCase):
                 'version': '5.0',
             })
 
+    def test_with_unordered_releases(self) -> None:
+        """Testing get_package_version_info with unordered and yanked
+        releases
+        """
+        self._setup_response({
+            'info': {
+                'name': 'ReviewBoard',
+                'version': '6.0.1',
+            },
+            'releases': {
+                '5.0.7': [
+                    {
+                        'requires_python': '>=3.7',
+                        'yanked': True,
+                    },
+                ],
+                '6.0.1': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+                '5.0.5': [
+                    {
+                        'requires_python': '>=3.7',
+                    },
+                ],
+                '5.0.6': [
+                    {
+                        'requires_python': '>=3.7',
+                    },
+                ],
+                '4.0': [
+                    {
+                        'requires_python': '>=3.6',
+                    },
+                ],
+            },
+        })
+
+        info = get_package_version_info(
+            system_info=self.create_system_info(python_version=(3, 7, 0)),
+            package_name='ReviewBoard',
+            target_version='latest')
+
+        self.assertEqual(
+            info,
+            {
+                'is_latest': False,
+                'is_requested': False,
+                'latest_version': '6.0.1',
+                'package_name': 'ReviewBoard',
+                'requires_python': '>=3.7',
+                'version': '5.0.6',
+            })
+
+    def test_with_invalid_release_versions(self) -> None:
+        """Testing get_package_version_info with empty and unparseable
+        release versions
+        """
+        self._setup_response({
+            'info': {
+                'name': 'ReviewBoard',
+                'version': '6.0.1',
+            },
+            'releases': {
+                '0.8 final': [
+                    {
+                        'requires_python': '',
+                    },
+                ],
+                'not-a-version': [],
+                '5.0': [
+                    {
+                        'requires_python': '>=3.7',
+                    },
+                ],
+                '6.0.1': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+            },
+        })
+
+        info = get_package_version_info(
+            system_info=self.create_system_info(python_version=(3, 7, 0)),
+            package_name='ReviewBoard',
+            target_version='latest')
+
+        assert info is not None
+        self.assertEqual(info['version'], '5.0')
+
+    def test_with_shared_requires_python(self) -> None:
+        """Testing get_package_version_info checks each requires_python
+        specifier once
+        """
+        self.spy_on(SpecifierSet.__contains__,
+                    owner=SpecifierSet)
+
+        self._setup_response({
+            'info': {
+                'name': 'ReviewBoard',
+                'version': '7.0',
+            },
+            'releases': {
+                '7.0': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+                '6.0': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+                '5.0': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+                '4.0': [
+                    {
+                        'requires_python': '>=3.6',
+                    },
+                ],
+            },
+        })
+
+        info = get_package_version_info(
+            system_info=self.create_system_info(python_version=(3, 7, 0)),
+            package_name='ReviewBoard',
+            target_version='latest')
+
+        assert info is not None
+        self.assertEqual(info['version'], '4.0')
+        self.assertSpyCallCount(SpecifierSet.__contains__, 2)
+
+    def test_with_null_requires_python(self) -> None:
+        """Testing get_package_version_info with a null requires_python"""
+        self._setup_response({
+            'info': {
+                'name': 'ReviewBoard',
+                'version': '6.0.1',
+            },
+            'releases': {
+                '6.0.1': [
+                    {
+                        'requires_python': None,
+                    },
+                ],
+            },
+        })
+
+        info = get_package_version_info(
+            system_info=self.create_system_info(),
+            package_name='ReviewBoard',
+            target_version='latest')
+
+        self.assertEqual(
+            info,
+            {
+                'is_latest': True,
+                'is_requested': True,
+                'latest_version': '6.0.1',
+                'package_name': 'ReviewBoard',
+                'requires_python': '',
+                'version': '6.0.1',
+            })
+
     def test_with_no_match(self) -> None:
         """Testing get_package_version_info with no match"""
         self._setup_response({
@@ -190,6 +520,49 @@ class GetPackageVersionInfoTests(kgb.SpyAgency, TestCase):
                 package_name='ReviewBoard',
                 target_version='latest')
 
+        self.assertSpyCallCount(urlopen, 3)
+        self.assertSpyCallCount(_wait_for_retry, 2)
+
+    def test_with_http_error_429_retry(self) -> None:
+        """Testing get_package_version_info with HTTP error 429 and retry"""
+        rsp = {
+            'info': {
+                'name': 'ReviewBoard',
+                'version': '6.0.1',
+            },
+            'releases': {
+                '6.0.1': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+            },
+        }
+
+        @self.spy_for(urlopen)
+        def _urlopen(request, *args, **kwargs):
+            if len(urlopen.calls) == 1:  # type: ignore
+                raise HTTPError(url=request.get_full_url(),
+                                code=429,
+                                msg='Too Many Requests',
+                                hdrs={},  # type: ignore
+                                fp=None)
+
+            fp = StringIO(json.dumps(rsp))
+            fp.headers = {}  # type: ignore
+
+            return fp
+
+        info = get_package_version_info(
+            system_info=self.create_system_info(),
+            package_name='ReviewBoard',
+            target_version='latest')
+
+        assert info is not None
+        self.assertEqual(info['version'], '6.0.1')
+        self.assertSpyCallCount(urlopen, 2)
+        self.assertSpyCalledWith(_wait_for_retry, 1)
+
     def test_with_http_error_404(self) -> None:
         """Testing get_package_version_info with HTTP error 404"""
         self.spy_on(
@@ -207,6 +580,8 @@ class GetPackageVersionInfoTests(kgb.SpyAgency, TestCase):
             target_version='latest')
 
         self.assertIsNone(info)
+        self.assertSpyCallCount(urlopen, 1)
+        self.assertSpyNotCalled(_wait_for_retry)
 
     def test_with_parse_error(self) -> None:
         """Testing get_package_version_info with parse error"""
@@ -225,6 +600,160 @@ class GetPackageVersionInfoTests(kgb.SpyAgency, TestCase):
                 package_name='ReviewBoard',
                 target_version='latest')
 
+    def test_with_cache_not_modified(self) -> None:
+        """Testing get_package_version_info with cached response and HTTP 304
+        """
+        self._setup_response(
+            {
+                'info': {
+                    'name': 'ReviewBoard',
+                    'version': '6.0.1',
+                },
+                'releases': {
+                    '6.0.1': [
+                        {
+                            'requires_python': '>=3.8',
+                        },
+                    ],
+                },
+            },
+            rsp_headers={
+                'ETag': '"abc123"',
+                'Last-Modified': 'Tue, 01 Oct 2024 00:00:00 GMT',
+            })
+
+        info1 = get_package_version_info(
+            system_info=self.create_system_info(),
+            package_name='ReviewBoard',
+            target_version='latest')
+
+        urlopen.unspy()  # type: ignore
+
+        @self.spy_for(urlopen)
+        def _urlopen(request, *args, **kwargs):
+            self.assertEqual(request.headers['If-none-match'], '"abc123"')
+            self.assertEqual(request.headers['If-modified-since'],
+                             'Tue, 01 Oct 2024 00:00:00 GMT')
+
+            raise HTTPError(url=request.get_full_url(),
+                            code=304,
+                            msg='Not Modified',
+                            hdrs={},  # type: ignore
+                            fp=None)
+
+        info2 = get_package_version_info(
+            system_info=self.create_system_info(),
+            package_name='ReviewBoard',
+            target_version='latest')
+
+        self.assertSpyCalled(urlopen)
+        self.assertIsNotNone(info1)
+        self.assertEqual(info1, info2)
+
+    def test_with_cache_without_validators(self) -> None:
+        """Testing get_package_version_info with recently-cached response
+        without validators
+        """
+        self._setup_response({
+            'info': {
+                'name': 'ReviewBoard',
+                'version': '6.0.1',
+            },
+            'releases': {
+                '6.0.1': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+            },
+        })
+
+        info1 = get_package_version_info(
+            system_info=self.create_system_info(),
+            package_name='ReviewBoard',
+            target_version='latest')
+        info2 = get_package_version_info(
+            system_info=self.create_system_info(),
+            package_name='ReviewBoard',
+            target_version='latest')
+
+        self.assertSpyCallCount(urlopen, 1)
+        self.assertIsNotNone(info1)
+        self.assertEqual(info1, info2)
+
+    def test_with_cache_invalid_body(self) -> None:
+        """Testing get_package_version_info with a cached response without
+        a valid body
+        """
+        cache_path = _get_cache_path('https://pypi.org/pypi/ReviewBoard/json')
+        assert cache_path
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+        with open(cache_path, 'w', encoding='utf-8') as fp:
+            json.dump(
+                {
+                    'body': None,
+                    'etag': '"abc123"',
+                    'fetched': 0,
+                    'last_modified': None,
+                },
+                fp)
+
+        self._setup_response({
+            'info': {
+                'name': 'ReviewBoard',
+                'version': '6.0.1',
+            },
+            'releases': {
+                '6.0.1': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+            },
+        })
+
+        info = get_package_version_info(
+            system_info=self.create_system_info(),
+            package_name='ReviewBoard',
+            target_version='latest')
+
+        # The cached entry isn't revalidated, so the full response is used.
+        self.assertNotIn(
+            'If-none-match',
+            urlopen.last_call.args[0].headers)  # type: ignore
+        self.assertIsNotNone(info)
+
+    def test_with_cache_write_error(self) -> None:
+        """Testing get_package_version_info with an error writing the cache"""
+        self._setup_response({
+            'info': {
+                'name': 'ReviewBoard',
+                'version': '6.0.1',
+            },
+            'releases': {
+                '6.0.1': [
+                    {
+                        'requires_python': '>=3.8',
+                    },
+                ],
+            },
+        })
+        self.spy_on(json.dump,
+                    op=kgb.SpyOpRaise(ValueError('Unable to write')))
+
+        info = get_package_version_info(
+            system_info=self.create_system_info(),
+            package_name='ReviewBoard',
+            target_version='latest')
+
+        self.assertIsNotNone(info)
+        self.assertSpyCalled(json.dump)
+
+        # The temporary file for the cache entry must be cleaned up.
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
     def create_system_info(
         self,
         *,
@@ -254,12 +783,17 @@ class GetPackageVersionInfoTests(kgb.SpyAgency, TestCase):
     def _setup_response(
         self,
         rsp: Dict[str, Any],
+        *,
+        rsp_headers: Optional[Dict[str, str]] = None,
     ) -> None:
         """Set up an HTTP response for a test.
 
         Args:
             rsp (dict):
                 The payload to return in the response.
+
+            rsp_headers (dict, optional):
+                Headers to include in the response.
         """
         @self.spy_for(urlopen)
         @contextmanager
@@ -271,4 +805,7 @@ class GetPackageVersionInfoTests(kgb.SpyAgency, TestCase):
             self.assertEqual(headers['Accept'], 'application/json')
             self.assertTrue(headers['User-agent'].startswith('rbinstall/'))
 
-            yield StringIO(json.dumps(rsp))
+            fp = StringIO(json.dumps(rsp))
+            fp.headers = rsp_headers or {}  # type: ignore
+
+            yield fp
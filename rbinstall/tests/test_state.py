@@ -9,16 +9,19 @@ from __future__ import annotations
 import os
 import platform
 import re
+import shutil
 import subprocess
 import sys
 import tempfile
-from unittest import TestCase
+from typing import List
+from unittest import TestCase, skipUnless
 
 import kgb
 
 from rbinstall.errors import InstallerError
 from rbinstall.install_methods import InstallMethodType
 from rbinstall.state import (get_default_linux_install_method,
+                             get_linux_distro_info,
                              get_system_info)
 
 
@@ -30,6 +33,7 @@ class GetSystemInfoTests(kgb.SpyAgency, TestCase):
     """
 
     EMPTY_ENVIRON = {
+        'HOMEBREW_PREFIX': '',
         'RBINSTALL_FORCE_ARCH': '',
         'RBINSTALL_FORCE_SYSTEM': '',
         'RBINSTALL_FORCE_SYSTEM_PYTHON_EXE': '',
@@ -153,6 +157,32 @@ class GetSystemInfoTests(kgb.SpyAgency, TestCase):
         finally:
             os.unlink(os_release_path)
 
+    def test_with_linux_and_missing_os_release(self) -> None:
+        """Testing get_system_info with Linux and missing os-release file"""
+        tmpdir = tempfile.mkdtemp()
+
+        message = re.escape(
+            'Could not determine the distribution of Linux being used. This '
+            'indicates you may be missing /etc/os-release and '
+            '/usr/lib/os-release files. You may need to install through '
+            'another method. See https://www.reviewboard.org/docs/manual/'
+            'latest/admin/installation/ for instructions.'
+        )
+
+        try:
+            os.environ.update({
+                'RBINSTALL_FORCE_ARCH': 'amd64',
+                'RBINSTALL_FORCE_SYSTEM': 'Linux',
+                'RBINSTALL_FORCE_SYSTEM_PYTHON_EXE': '/path/to/python',
+                'RBINSTALL_OS_RELEASE_FILE':
+                    os.path.join(tmpdir, 'os-release'),
+            })
+
+            with self.assertRaisesRegex(InstallerError, message):
+                get_system_info()
+        finally:
+            os.rmdir(tmpdir)
+
     def test_with_linux_and_incompatible_family(self) -> None:
         """Testing get_system_info with Linux and incompatible family"""
         fd, os_release_path = tempfile.mkstemp()
@@ -184,10 +214,14 @@ class GetSystemInfoTests(kgb.SpyAgency, TestCase):
 
     def test_with_darwin_and_brew(self) -> None:
         """Testing get_system_info with Darwin and brew"""
+        self._setup_brew_paths([])
         self.spy_on(platform.mac_ver,
                     op=kgb.SpyOpReturn(('13.5.2', ('', '', ''), 'arm64')))
+        self.spy_on(shutil.which,
+                    op=kgb.SpyOpReturn('/opt/homebrew/bin/brew'))
         self.spy_on(subprocess.check_output,
                     op=kgb.SpyOpReturn(b'/opt/homebrew\n'))
+        self.spy_on(get_linux_distro_info)
 
         os.environ.update({
             'RBINSTALL_FORCE_ARCH': 'arm64',
@@ -212,10 +246,88 @@ class GetSystemInfoTests(kgb.SpyAgency, TestCase):
                 'version': '13.5.2',
             })
 
+        # Linux distribution detection should never be performed on macOS.
+        self.assertSpyNotCalled(get_linux_distro_info)
+
+    def test_with_darwin_and_brew_default_prefix(self) -> None:
+        """Testing get_system_info with Darwin and brew in a standard prefix
+        """
+        self._setup_brew_paths(['/usr/local/bin/brew'])
+        self.spy_on(platform.mac_ver,
+                    op=kgb.SpyOpReturn(('13.5.2', ('', '', ''), 'x86_64')))
+        self.spy_on(subprocess.check_output)
+
+        os.environ.update({
+            'RBINSTALL_FORCE_ARCH': 'x86_64',
+            'RBINSTALL_FORCE_SYSTEM': 'Darwin',
+            'RBINSTALL_FORCE_SYSTEM_PYTHON_EXE': '/path/to/python',
+        })
+
+        system_info = get_system_info()
+
+        self.assertEqual(system_info['paths'], {
+            'brew': '/usr/local',
+        })
+        self.assertSpyNotCalled(subprocess.check_output)
+
+    def test_with_darwin_and_homebrew_prefix_env(self) -> None:
+        """Testing get_system_info with Darwin and $HOMEBREW_PREFIX"""
+        self._setup_brew_paths([
+            '/opt/homebrew/bin/brew',
+            '/custom/brew/bin/brew',
+        ])
+        self.spy_on(platform.mac_ver,
+                    op=kgb.SpyOpReturn(('13.5.2', ('', '', ''), 'arm64')))
+        self.spy_on(subprocess.check_output)
+
+        os.environ.update({
+            'HOMEBREW_PREFIX': '/custom/brew',
+            'RBINSTALL_FORCE_ARCH': 'arm64',
+            'RBINSTALL_FORCE_SYSTEM': 'Darwin',
+            'RBINSTALL_FORCE_SYSTEM_PYTHON_EXE': '/path/to/python',
+        })
+
+        system_info = get_system_info()
+
+        self.assertEqual(system_info['paths'], {
+            'brew': '/custom/brew',
+        })
+        self.assertSpyNotCalled(subprocess.check_output)
+
     def test_with_darwin_and_no_brew(self) -> None:
         """Testing get_system_info with Darwin and no brew"""
+        self._setup_brew_paths([])
         self.spy_on(platform.mac_ver,
                     op=kgb.SpyOpReturn(('13.5.2', ('', '', ''), 'arm64')))
+        self.spy_on(shutil.which,
+                    op=kgb.SpyOpReturn(None))
+        self.spy_on(subprocess.check_output)
+
+        os.environ.update({
+            'RBINSTALL_FORCE_ARCH': 'arm64',
+            'RBINSTALL_FORCE_SYSTEM': 'Darwin',
+            'RBINSTALL_FORCE_SYSTEM_PYTHON_EXE': '/path/to/python',
+        })
+
+        message = re.escape(
+            'The Review Board installer cannot install on macOS without '
+            'Brew (https://brew.sh). You may need to install through another '
+            'method. See https://www.reviewboard.org/docs/manual/latest/'
+            'admin/installation/ for instructions.'
+        )
+
+        with self.assertRaisesRegex(InstallerError, message):
+            get_system_info()
+
+        self.assertSpyNotCalled(subprocess.check_output)
+
+    def test_with_darwin_and_broken_brew(self) -> None:
+        """Testing get_system_info with Darwin and brew --prefix failing"""
+        self._setup_brew_paths([])
+        self.spy_on(platform.mac_ver,
+                    op=kgb.SpyOpReturn(('13.5.2', ('', '', ''), 'arm64')))
+        self.spy_on(shutil.which,
+                    op=kgb.SpyOpReturn('/custom/bin/brew'))
         self.spy_on(subprocess.check_output,
                     op=kgb.SpyOpRaise(subprocess.CalledProcessError(
                         returncode=1,
@@ -237,6 +349,35 @@ class GetSystemInfoTests(kgb.SpyAgency, TestCase):
         with self.assertRaisesRegex(InstallerError, message):
             get_system_info()
 
+        self.assertSpyCalledWith(subprocess.check_output,
+                                 ['/custom/bin/brew', '--prefix'])
+
+    @skipUnless(sys.platform.startswith('linux'),
+                'This test requires a Linux system.')
+    def test_with_detected_system_and_arch(self) -> None:
+        """Testing get_system_info detects the system and architecture
+        without the platform module
+        """
+        fd, os_release_path = tempfile.mkstemp()
+
+        with os.fdopen(fd, 'w') as fp:
+            fp.write('ID="debian"\n')
+
+        self.spy_on(platform.system)
+        self.spy_on(platform.machine)
+
+        try:
+            os.environ['RBINSTALL_OS_RELEASE_FILE'] = os_release_path
+            system_info = get_system_info()
+        finally:
+            os.unlink(os_release_path)
+
+        self.assertEqual(system_info['system'], 'Linux')
+        self.assertEqual(system_info['arch'], os.uname().machine)
+
+        self.assertSpyNotCalled(platform.system)
+        self.assertSpyNotCalled(platform.machine)
+
     def test_with_unsupported_platform(self) -> None:
         """Testing get_system_info with unsupported platform"""
         os.environ.update({
@@ -255,6 +396,92 @@ class GetSystemInfoTests(kgb.SpyAgency, TestCase):
             get_system_info()
 
 
+    def _setup_brew_paths(
+        self,
+        brew_paths: List[str],
+    ) -> None:
+        """Set up the paths where the brew executable appears to exist.
+
+        Args:
+            brew_paths (list of str):
+                The full paths to brew executables to simulate.
+        """
+        @self.spy_for(os.path.isfile)
+        def _isfile(path):
+            if path.endswith('/bin/brew'):
+                return path in brew_paths
+
+            return os.path.isfile.spy.call_original(path)  # type: ignore
+
+
+class GetLinuxDistroInfoTests(TestCase):
+    """Unit tests for get_linux_distro_info().
+
+    Version Added:
+        1.3
+    """
+
+    def test_with_quoting_and_escapes(self) -> None:
+        """Testing get_linux_distro_info with quoting and escapes"""
+        fd, os_release_path = tempfile.mkstemp()
+
+        with os.fdopen(fd, 'w') as fp:
+            fp.write('# A comment\n')
+            fp.write('\n')
+            fp.write('ID=mydistro\n')
+            fp.write('ID_LIKE="centos rhel"\n')
+            fp.write("NAME='My Distro'\n")
+            fp.write('PRETTY_NAME="My \\"Distro\\" \\$1"\n')
+            fp.write('VARIANT="a\\\\\\$b\\\\c"\n')
+            fp.write('VERSION="1.2\n')
+            fp.write('invalid line\n')
+            fp.write(' INDENTED=1\n')
+
+        old_environ = os.environ.get('RBINSTALL_OS_RELEASE_FILE', '')
+
+        try:
+            os.environ['RBINSTALL_OS_RELEASE_FILE'] = os_release_path
+
+            self.assertEqual(
+                get_linux_distro_info(),
+                {
+                    'ID': 'mydistro',
+                    'ID_LIKE': 'centos rhel',
+                    'NAME': 'My Distro',
+                    'PRETTY_NAME': 'My "Distro" $1',
+                    'VARIANT': 'a\\$b\\c',
+                    'VERSION': '"1.2',
+                })
+        finally:
+            os.environ['RBINSTALL_OS_RELEASE_FILE'] = old_environ
+            os.unlink(os_release_path)
+
+    def test_with_changed_file(self) -> None:
+        """Testing get_linux_distro_info reads the current os-release file
+        on each call
+        """
+        fd, os_release_path = tempfile.mkstemp()
+        os.close(fd)
+
+        old_environ = os.environ.get('RBINSTALL_OS_RELEASE_FILE', '')
+
+        try:
+            os.environ['RBINSTALL_OS_RELEASE_FILE'] = os_release_path
+
+            with open(os_release_path, 'w') as fp:
+                fp.write('ID=debian\n')
+
+            self.assertEqual(get_linux_distro_info(), {'ID': 'debian'})
+
+            with open(os_release_path, 'w') as fp:
+                fp.write('ID=fedora\n')
+
+            self.assertEqual(get_linux_distro_info(), {'ID': 'fedora'})
+        finally:
+            os.environ['RBINSTALL_OS_RELEASE_FILE'] = old_environ
+            os.unlink(os_release_path)
+
+
 class GetDefaultLinuxInstallMethodTests(TestCase):
     """Unit tests for get_default_linux_install_method()."""
 
@@ -8,7 +8,7 @@ Version Added:
 from __future__ import annotations
 
 import operator
-from functools import partialmethod
+from functools import lru_cache, partialmethod
 from typing import Any, Callable, List, Tuple, TypeVar, Union
 
 from typing_extensions import TypeAlias
@@ -93,6 +93,7 @@ class _ComparedVersionPart:
     __eq__ = partialmethod(_compare, op=operator.eq)  # type: ignore
 
 
+@lru_cache(maxsize=256)
 def parse_version(
     version: str,
 ) -> ParsedVersion:
@@ -101,6 +102,9 @@ def parse_version(
     The string is expected to be ``.``-delimited. It will be converted to
     a tuple, with any numbers converted to integers.
 
+    Results are cached, as the same versions are parsed repeatedly when
+    building install steps.
+
     Version Added:
         1.0
 
@@ -127,6 +131,7 @@ def parse_version(
     return tuple(info)
 
 
+@lru_cache(maxsize=None)
 def match_version(
     *matched_version_info: _ParsedVersionPart,
     op: Callable[[Tuple[_ComparedVersionPart, ...],
@@ -137,6 +142,8 @@ def match_version(
     This will check for equality by default, but can take an operator to
     perform other comparisons.
 
+    Comparators are cached, so identical calls will share the same function.
+
     Version Added:
         1.0
 
@@ -301,10 +301,12 @@ def _show_ask_install_location(
 
                 venv_path = ''
 
+    venv_bin_path = os.path.join(venv_path, 'bin')
+
     install_state.update({
         'venv_path': venv_path,
-        'venv_pip_exe': os.path.join(venv_path, 'bin', 'pip'),
-        'venv_python_exe': os.path.join(venv_path, 'bin', 'python'),
+        'venv_pip_exe': os.path.join(venv_bin_path, 'pip'),
+        'venv_python_exe': os.path.join(venv_bin_path, 'python'),
     })
 
 
@@ -394,6 +396,9 @@ def _perform_install(
             for install_step in install_steps
         )
 
+        # Steps must run one at a time, in order. Later steps depend on
+        # earlier ones, package managers lock their databases, and pip
+        # steps all install into the same virtual environment.
         for install_step in install_steps:
             step_name = install_step['name']
             name_len = len(step_name)
@@ -585,6 +585,7 @@ def main() -> None:
         '-c',
         '--max-parallel',
         metavar='NUM',
+        type=int,
         default=max(int((os.cpu_count() or 1) * 0.75), 1),
         help=(
             "Maximum number of tests to run in parallel when using -p. If "